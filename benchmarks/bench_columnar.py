@@ -0,0 +1,69 @@
+"""Compares columnar row encoding with the `to_dict("records")` path.
+
+Run with `python benchmarks/bench_columnar.py [rows]`. Needs the
+`dataframes` extra.
+"""
+
+import datetime
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from powerbi.columnar import encode_columnar_body
+from powerbi.columnar import encode_default
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Builds a sales-like frame with text, numbers, flags and timestamps."""
+
+    rng = np.random.default_rng(seed=0)
+    start = datetime.datetime(2024, 1, 1)
+
+    return pd.DataFrame(
+        {
+            "order_id": np.arange(rows, dtype=np.int64),
+            "product": rng.choice(["widget", "gadget", "gizmo"], size=rows),
+            "quantity": rng.integers(1, 100, size=rows),
+            "amount": rng.random(size=rows) * 1000,
+            "shipped": rng.random(size=rows) > 0.5,
+            "ordered_at": pd.date_range(start, periods=rows, freq="s"),
+        }
+    )
+
+
+def encode_records(frame: pd.DataFrame) -> bytes:
+    """The baseline: per-row dictionaries through `json.dumps`."""
+
+    rows = frame.to_dict("records")
+    return json.dumps(
+        {"rows": rows}, separators=(",", ":"), default=encode_default
+    ).encode("utf-8")
+
+
+def timed(label: str, function, data, rows: int) -> float:
+    started = time.perf_counter()
+    body = function(data)
+    elapsed = time.perf_counter() - started
+
+    print(f"{label:<24}{elapsed:>8.3f} s{rows / elapsed:>14,.0f} rows/s{len(body):>14,} bytes")
+    return elapsed
+
+
+def main(rows: int) -> None:
+    frame = make_frame(rows)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    array = frame.to_records(index=False)
+
+    print(f"Encoding {rows:,} rows\n")
+    baseline = timed("to_dict + json", encode_records, frame, rows)
+    for label, data in (("DataFrame", frame), ("Arrow table", table), ("Structured array", array)):
+        elapsed = timed(label, encode_columnar_body, data, rows)
+        print(f"{'':<24}{baseline / elapsed:>8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -2,75 +2,172 @@
 
 from __future__ import annotations
 
-from powerbi.client import PowerBiClient
-from powerbi.enums import (
-    ColumnAggregationMethods,
-    ColumnDataTypes,
-    ComputeEngineBehavior,
-    CredentialTypes,
-    DatasetModes,
-    DataSourceType,
-    EncryptedConnections,
-    EncryptionAlgorithm,
-    ExportFileFormats,
-    GatewayDataSourceAccessRights,
-    GatewayPrincipalType,
-    GatewayServicePrincipalProfile,
-    GroupUserAccessRights,
-    ImportConflictHandlerMode,
-    NotifyOption,
-    PrincipalType,
-    PrivacyLevels,
-    WorkloadStates,
-)
-from powerbi.utils import (
-    Column,
-    Columns,
-    CredentialDetails,
-    DataSource,
-    DataSources,
-    Dataset,
-    Measure,
-    Measures,
-    Relationship,
-    Relationships,
-    Table,
-    Tables,
-)
+import importlib
 
-__all__ = [
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from powerbi.async_client import AsyncPowerBiClient
+    from powerbi.auth import ServicePrincipalAuth
+    from powerbi.cache import (
+        ResponseCache,
+        SQLiteCacheBackend,
+    )
+    from powerbi.client import PowerBiClient
+    from powerbi.enums import (
+        ColumnAggregationMethods,
+        ColumnDataTypes,
+        ComputeEngineBehavior,
+        CredentialTypes,
+        DatasetModes,
+        DataSourceType,
+        EncryptedConnections,
+        EncryptionAlgorithm,
+        ExportFileFormats,
+        GatewayDataSourceAccessRights,
+        GatewayPrincipalType,
+        GatewayServicePrincipalProfile,
+        GroupUserAccessRights,
+        ImportConflictHandlerMode,
+        NotifyOption,
+        PrincipalType,
+        PrivacyLevels,
+        WorkloadStates,
+    )
+    from powerbi.query_results import QueryBatch, iter_query_batches, read_query_result
+    from powerbi.rate_limit import (
+        RateLimiter,
+        RateLimitRule,
+        SQLiteBucketStore,
+    )
+    from powerbi.refresh_dag import RefreshGraph, RefreshNode, RefreshScheduler
+    from powerbi.refresh_history import RefreshHistoryHarvester, SQLiteRefreshHistoryStore
+    from powerbi.refresh_orchestrator import (
+        RefreshOrchestrator,
+        RefreshReport,
+        RefreshResult,
+        RefreshTarget,
+    )
+    from powerbi.refresh_planner import PartitionRefreshPlanner, PartitionSpec, RefreshPlan
+    from powerbi.retry import RetryPolicy, use_retry_policy
+    from powerbi.row_buffer import TypedRowBuffer
+    from powerbi.row_pusher import RowPusher
+    from powerbi.row_stream import StreamingRowBuffer
+    from powerbi.scanner import SQLiteScanStore, TenantScanner
+    from powerbi.schema_sync import SchemaPlan, SchemaSync
+    from powerbi.serialization import get_serializer, set_serializer
+    from powerbi.token_cache import FileTokenCacheBackend
+    from powerbi.utils import (
+        Column,
+        Columns,
+        CredentialDetails,
+        DataSource,
+        DataSources,
+        Dataset,
+        Measure,
+        Measures,
+        Relationship,
+        Relationships,
+        Table,
+        Tables,
+        to_plain_object,
+    )
+
+# Public names are imported on first access, so `import powerbi` stays
+# cheap and only the modules a program uses are ever loaded.
+_LAZY_IMPORTS = {
     # Client
-    "PowerBiClient",
+    "AsyncPowerBiClient": "powerbi.async_client",
+    "PowerBiClient": "powerbi.client",
+    # Authentication
+    "ServicePrincipalAuth": "powerbi.auth",
+    "FileTokenCacheBackend": "powerbi.token_cache",
+    # Session
+    "ResponseCache": "powerbi.cache",
+    "SQLiteCacheBackend": "powerbi.cache",
+    "RateLimiter": "powerbi.rate_limit",
+    "RateLimitRule": "powerbi.rate_limit",
+    "SQLiteBucketStore": "powerbi.rate_limit",
+    "RetryPolicy": "powerbi.retry",
+    "use_retry_policy": "powerbi.retry",
+    "get_serializer": "powerbi.serialization",
+    "set_serializer": "powerbi.serialization",
+    # Row ingestion
+    "RowPusher": "powerbi.row_pusher",
+    "TypedRowBuffer": "powerbi.row_buffer",
+    "StreamingRowBuffer": "powerbi.row_stream",
+    # Schema sync
+    "SchemaPlan": "powerbi.schema_sync",
+    "SchemaSync": "powerbi.schema_sync",
+    # Refresh orchestration
+    "RefreshOrchestrator": "powerbi.refresh_orchestrator",
+    "RefreshReport": "powerbi.refresh_orchestrator",
+    "RefreshResult": "powerbi.refresh_orchestrator",
+    "RefreshTarget": "powerbi.refresh_orchestrator",
+    "RefreshGraph": "powerbi.refresh_dag",
+    "RefreshNode": "powerbi.refresh_dag",
+    "RefreshScheduler": "powerbi.refresh_dag",
+    "PartitionRefreshPlanner": "powerbi.refresh_planner",
+    "PartitionSpec": "powerbi.refresh_planner",
+    "RefreshPlan": "powerbi.refresh_planner",
+    # Refresh history
+    "RefreshHistoryHarvester": "powerbi.refresh_history",
+    "SQLiteRefreshHistoryStore": "powerbi.refresh_history",
+    # Query results
+    "QueryBatch": "powerbi.query_results",
+    "iter_query_batches": "powerbi.query_results",
+    "read_query_result": "powerbi.query_results",
+    # Scanner
+    "SQLiteScanStore": "powerbi.scanner",
+    "TenantScanner": "powerbi.scanner",
     # Enums
-    "ColumnAggregationMethods",
-    "ColumnDataTypes",
-    "ComputeEngineBehavior",
-    "CredentialTypes",
-    "DatasetModes",
-    "DataSourceType",
-    "EncryptedConnections",
-    "EncryptionAlgorithm",
-    "ExportFileFormats",
-    "GatewayDataSourceAccessRights",
-    "GatewayPrincipalType",
-    "GatewayServicePrincipalProfile",
-    "GroupUserAccessRights",
-    "ImportConflictHandlerMode",
-    "NotifyOption",
-    "PrincipalType",
-    "PrivacyLevels",
-    "WorkloadStates",
+    "ColumnAggregationMethods": "powerbi.enums",
+    "ColumnDataTypes": "powerbi.enums",
+    "ComputeEngineBehavior": "powerbi.enums",
+    "CredentialTypes": "powerbi.enums",
+    "DatasetModes": "powerbi.enums",
+    "DataSourceType": "powerbi.enums",
+    "EncryptedConnections": "powerbi.enums",
+    "EncryptionAlgorithm": "powerbi.enums",
+    "ExportFileFormats": "powerbi.enums",
+    "GatewayDataSourceAccessRights": "powerbi.enums",
+    "GatewayPrincipalType": "powerbi.enums",
+    "GatewayServicePrincipalProfile": "powerbi.enums",
+    "GroupUserAccessRights": "powerbi.enums",
+    "ImportConflictHandlerMode": "powerbi.enums",
+    "NotifyOption": "powerbi.enums",
+    "PrincipalType": "powerbi.enums",
+    "PrivacyLevels": "powerbi.enums",
+    "WorkloadStates": "powerbi.enums",
     # Utility classes
-    "Column",
-    "Columns",
-    "CredentialDetails",
-    "DataSource",
-    "DataSources",
-    "Dataset",
-    "Measure",
-    "Measures",
-    "Relationship",
-    "Relationships",
-    "Table",
-    "Tables",
-]
+    "Column": "powerbi.utils",
+    "Columns": "powerbi.utils",
+    "CredentialDetails": "powerbi.utils",
+    "DataSource": "powerbi.utils",
+    "DataSources": "powerbi.utils",
+    "Dataset": "powerbi.utils",
+    "Measure": "powerbi.utils",
+    "Measures": "powerbi.utils",
+    "Relationship": "powerbi.utils",
+    "Relationships": "powerbi.utils",
+    "Table": "powerbi.utils",
+    "Tables": "powerbi.utils",
+    "to_plain_object": "powerbi.utils",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
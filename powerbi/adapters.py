@@ -0,0 +1,169 @@
+"""Transport adapters used by the `PowerBiSession`."""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def keepalive_socket_options(
+    idle: int = 60, interval: int = 10, count: int = 5
+) -> List[Tuple[int, int, int]]:
+    """Builds socket options that enable TCP keep-alive probes.
+
+    Idle connections sitting in the pool are otherwise silently
+    dropped by NATs and load balancers, which forces a new TCP and
+    TLS handshake on the next request.
+
+    ### Parameters
+    ----
+    idle : int (optional, Default=60)
+        Seconds a connection stays idle before the first probe.
+
+    interval : int (optional, Default=10)
+        Seconds between probes.
+
+    count : int (optional, Default=5)
+        Failed probes before the connection is dropped.
+
+    ### Returns
+    ----
+    List[Tuple[int, int, int]]
+        The default urllib3 socket options plus the keep-alive
+        options supported by the current platform.
+    """
+
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+    # Linux calls it TCP_KEEPIDLE, macOS calls it TCP_KEEPALIVE.
+    idle_option = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+
+    return options
+
+
+class PowerBiHTTPAdapter(HTTPAdapter):
+    """An `HTTPAdapter` with configurable pooling, socket options
+    and connection pool statistics."""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        socket_options: List[Tuple[int, int, int]] = None,
+    ) -> None:
+        """Initializes the `PowerBiHTTPAdapter` object.
+
+        ### Parameters
+        ----
+        pool_connections : int (optional, Default=10)
+            The number of host pools to cache.
+
+        pool_maxsize : int (optional, Default=10)
+            The maximum number of connections kept per host.
+
+        pool_block : bool (optional, Default=False)
+            If `True`, threads wait for a free connection instead
+            of opening throwaway connections beyond `pool_maxsize`.
+
+        socket_options : List[Tuple[int, int, int]] (optional, Default=None)
+            Socket options applied to every new connection, see
+            `keepalive_socket_options`.
+        """
+
+        self.socket_options = socket_options
+
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if getattr(self, "socket_options", None) is not None:
+            pool_kwargs["socket_options"] = self.socket_options
+
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def __setstate__(self, state):
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        super().__setstate__(state)
+
+    def send(self, request, **kwargs):
+        with self._stats_lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+
+    def pool_stats(self) -> Dict:
+        """Returns statistics about the connection pools.
+
+        ### Returns
+        ----
+        Dict
+            A dictionary with `pools`, `connections_created`,
+            `requests`, `connections_reused`, `idle_connections`,
+            `in_flight`, `peak_in_flight` and `waiting`. `waiting`
+            counts requests beyond the combined pool capacity, which
+            is how many threads are queued when `pool_block` is set.
+        """
+
+        pools = self.poolmanager.pools
+        connections_created = 0
+        requests_sent = 0
+        idle_connections = 0
+
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_created += pool.num_connections
+            requests_sent += pool.num_requests
+            if pool.pool is not None:
+                idle_connections += sum(
+                    1 for conn in list(pool.pool.queue) if conn is not None
+                )
+
+        with self._stats_lock:
+            in_flight = self._in_flight
+            peak_in_flight = self._peak_in_flight
+
+        capacity = self._pool_maxsize * max(len(pools), 1)
+
+        return {
+            "pools": len(pools),
+            "connections_created": connections_created,
+            "requests": requests_sent,
+            "connections_reused": max(requests_sent - connections_created, 0),
+            "idle_connections": idle_connections,
+            "in_flight": in_flight,
+            "peak_in_flight": peak_in_flight,
+            "waiting": max(in_flight - capacity, 0),
+        }
@@ -2,9 +2,86 @@
 
 from __future__ import annotations
 
+import functools
+import json
+
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from powerbi.concurrency import iter_concurrently
 from powerbi.session import PowerBiSession
 
 
+def _to_utc_datetime(value: Union[str, date, datetime]) -> datetime:
+    """Converts an ISO 8601 string, date or datetime to an aware UTC datetime."""
+
+    if isinstance(value, str):
+        value = value.strip("'").replace("Z", "+00:00")
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+def _format_activity_time(value: datetime) -> str:
+    """Formats a datetime the way the activity events API expects it."""
+
+    return "'" + value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z'"
+
+
+def utc_day_windows(
+    start: Union[str, date, datetime], end: Union[str, date, datetime]
+) -> List[Tuple[str, str]]:
+    """Splits a time range into windows that each fit in one UTC day.
+
+    ### Parameters
+    ----
+    start : Union[str, date, datetime]
+        The start of the range. Naive values are treated as UTC.
+
+    end : Union[str, date, datetime]
+        The end of the range, inclusive. A `date` means the end of
+        that day.
+
+    ### Returns
+    ----
+    List[Tuple[str, str]]
+        Quoted ``(startDateTime, endDateTime)`` pairs, ready to pass
+        to `Admin.get_activity_events`.
+    """
+
+    start_utc = _to_utc_datetime(start)
+    end_utc = _to_utc_datetime(end)
+
+    if isinstance(end, date) and not isinstance(end, datetime):
+        end_utc += timedelta(days=1, milliseconds=-1)
+
+    windows = []
+    window_start = start_utc
+
+    while window_start <= end_utc:
+        next_day = datetime(
+            window_start.year, window_start.month, window_start.day, tzinfo=timezone.utc
+        ) + timedelta(days=1)
+        window_end = min(end_utc, next_day - timedelta(milliseconds=1))
+        windows.append(
+            (_format_activity_time(window_start), _format_activity_time(window_end))
+        )
+        window_start = next_day
+
+    return windows
+
+
 class Admin:
     """Class for the `Admin` service."""
 
@@ -86,6 +163,127 @@ class Admin:
 
         return content
 
+    def iter_activity_day(
+        self,
+        start_date_time: str,
+        end_date_time: str,
+        filter_by: str | None = None,
+    ) -> Iterator[dict]:
+        """Streams the audit events of a single UTC day window.
+
+        Follows ``continuationToken`` until the API reports
+        ``lastResultSet``, yielding each event as its chunk arrives.
+
+        ### Parameters
+        ----
+        start_date_time : str
+            Start date and time in ISO 8601 compliant UTC format,
+            wrapped in single quotes.
+
+        end_date_time : str
+            End date and time in the same UTC day, wrapped in single
+            quotes.
+
+        filter_by : str (optional)
+            Filters the results based on 'Activity', 'UserId', or both.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``ActivityEventEntity`` resources, one at a time.
+        """
+
+        content = self.get_activity_events(
+            start_date_time=start_date_time,
+            end_date_time=end_date_time,
+            filter_by=filter_by,
+        )
+
+        while True:
+            yield from content.get("activityEventEntities", [])
+
+            token = content.get("continuationToken")
+            if content.get("lastResultSet", True) or not token:
+                return
+
+            token = token.strip("'")
+            content = self.get_activity_events(continuation_token=f"'{token}'")
+
+    def iter_activity_events(
+        self,
+        start: Union[str, date, datetime],
+        end: Union[str, date, datetime],
+        filter_by: str | None = None,
+        max_workers: int = 4,
+        ndjson_path: str | None = None,
+    ) -> Iterator[dict]:
+        """Streams the audit events of an arbitrary time range.
+
+        The API only accepts windows inside a single UTC day, so the
+        range is split into per-day windows that are fetched
+        concurrently. Events within a day keep their order, days are
+        interleaved as their chunks arrive. Memory stays bounded
+        however long the range is.
+
+        ### Parameters
+        ----
+        start : Union[str, date, datetime]
+            The start of the range, within the last 28 days. Naive
+            values are treated as UTC.
+
+        end : Union[str, date, datetime]
+            The end of the range, inclusive. A `date` means the end
+            of that day.
+
+        filter_by : str (optional)
+            Filters the results based on 'Activity', 'UserId', or both.
+
+        max_workers : int (optional, Default=4)
+            The number of days fetched at the same time.
+
+        ndjson_path : str (optional)
+            If provided, every event is also appended to this file as
+            one JSON document per line.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``ActivityEventEntity`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> events = admin_service.iter_activity_events(
+                    start=date(2024, 1, 1),
+                    end=date(2024, 1, 28),
+                    max_workers=8,
+                    ndjson_path="activity.ndjson"
+                )
+            >>> for event in events:
+                    print(event["Activity"])
+        """
+
+        days = [
+            functools.partial(
+                self.iter_activity_day,
+                start_date_time=window_start,
+                end_date_time=window_end,
+                filter_by=filter_by,
+            )
+            for window_start, window_end in utc_day_windows(start=start, end=end)
+        ]
+
+        events = iter_concurrently(producers=days, max_workers=max_workers)
+
+        if ndjson_path is None:
+            yield from events
+            return
+
+        with open(file=ndjson_path, mode="a", encoding="utf-8") as ndjson_file:
+            for event in events:
+                ndjson_file.write(json.dumps(event) + "\n")
+                yield event
+
     # ------------------------------------------------------------------ #
     #                       Encryption Keys                               #
     # ------------------------------------------------------------------ #
@@ -488,6 +686,43 @@ class Admin:
 
         return content
 
+    def iter_apps(
+        self,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every app in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_apps``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminApp`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_apps(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=self.get_apps,
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_app_users(self, app_id: str) -> dict:
         """Returns a list of users that have access to the specified app.
 
@@ -557,6 +792,51 @@ class Admin:
 
         return content
 
+    def iter_dashboards(
+        self,
+        expand: str | None = None,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every dashboard in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_dashboards``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        expand : str (optional)
+            Expands related entities inline, as in ``get_dashboards``.
+
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminDashboard`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_dashboards(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_dashboards, expand=expand, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_dashboards_in_group(
         self,
         group_id: str,
@@ -699,6 +979,47 @@ class Admin:
 
         return content
 
+    def iter_dataflows(
+        self,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every dataflow in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_dataflows``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminDataflow`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_dataflows(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_dataflows, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_dataflows_in_group(
         self,
         group_id: str,
@@ -866,6 +1187,47 @@ class Admin:
 
         return content
 
+    def iter_datasets(
+        self,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every dataset in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_datasets``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminDataset`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_datasets(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_datasets, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_datasets_in_group(
         self,
         group_id: str,
@@ -1019,6 +1381,51 @@ class Admin:
 
         return content
 
+    def iter_groups(
+        self,
+        expand: str | None = None,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every workspace in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_groups``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        expand : str (optional)
+            Expands related entities inline, as in ``get_groups``.
+
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminGroup`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_groups(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_groups, expand=expand, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_group(
         self, group_id: str, expand: str | None = None
     ) -> dict:
@@ -1276,6 +1683,51 @@ class Admin:
 
         return content
 
+    def iter_imports(
+        self,
+        expand: str | None = None,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every import in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_imports``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        expand : str (optional)
+            Expands related entities inline, as in ``get_imports``.
+
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``Import`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_imports(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_imports, expand=expand, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     # ------------------------------------------------------------------ #
     #                     Information Protection                          #
     # ------------------------------------------------------------------ #
@@ -1376,6 +1828,51 @@ class Admin:
 
         return content
 
+    def iter_pipelines(
+        self,
+        expand: str | None = None,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every deployment pipeline in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_pipelines``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        expand : str (optional)
+            Expands related entities inline, as in ``get_pipelines``.
+
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminPipeline`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_pipelines(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_pipelines, expand=expand, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_pipeline_users(self, pipeline_id: str) -> dict:
         """Returns a list of users that have access to a specified
         deployment pipeline.
@@ -1492,6 +1989,47 @@ class Admin:
 
         return content
 
+    def iter_profiles(
+        self,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every service principal profile, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_profiles``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminServicePrincipalProfile`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_profiles(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_profiles, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def delete_profile(self, profile_id: str) -> dict:
         """Deletes the specified service principal profile.
 
@@ -1552,6 +2090,47 @@ class Admin:
 
         return content
 
+    def iter_reports(
+        self,
+        filter_by: str | None = None,
+        page_size: int = 5000,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Streams every report in the organization, page by page.
+
+        Lazily follows ``$top``/``$skip`` through ``get_reports``, so the
+        whole collection is never held in memory.
+
+        ### Parameters
+        ----
+        filter_by : str (optional)
+            OData filter query parameter condition.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        prefetch : bool (optional, Default=False)
+            Fetch the next page on a background thread while the
+            current one is consumed.
+
+        ### Returns
+        ----
+        Iterator[dict]
+            ``AdminReport`` resources, one at a time.
+
+        ### Usage
+        ----
+            >>> admin_service = power_bi_client.admin()
+            >>> for item in admin_service.iter_reports(prefetch=True):
+                    print(item["id"])
+        """
+
+        return self.power_bi_session.paginate(
+            fetch_page=functools.partial(self.get_reports, filter_by=filter_by),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
     def get_reports_in_group(
         self,
         group_id: str,
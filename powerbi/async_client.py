@@ -0,0 +1,173 @@
+"""Module for the `AsyncPowerBiClient` class."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from powerbi.async_session import AsyncPowerBiSession
+from powerbi.auth import PowerBiAuth
+from powerbi.client import PowerBiClient
+from powerbi.cache import ResponseCache
+from powerbi.rate_limit import RateLimiter
+from powerbi.retry import RetryPolicy
+
+
+class AsyncPowerBiClient(PowerBiClient):
+    """
+    ### Overview
+    ----
+    Asynchronous entry point to the other Power BI
+    REST Services.
+
+    Exposes the same service accessors as `PowerBiClient`
+    (`admin()`, `datasets()`, `reports()`, ...), but every
+    service method returns an awaitable, so many requests
+    can be in flight from a single event loop.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        scope: list[str],
+        account_type: str = "common",
+        credentials: str = None,
+        max_connections: int = 100,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        cache: ResponseCache = None,
+        background_token_refresh: bool = False,
+        auth_client: PowerBiAuth = None,
+        lazy: bool = False,
+        serializer: Union[str, object] = None,
+    ):
+        """Initializes the Async Client.
+
+        ### Parameters
+        ----
+        client_id : str
+            The application Client ID assigned when
+            creating a new Microsoft App.
+
+        client_secret : str
+            The application Client Secret assigned when
+            creating a new Microsoft App.
+
+        redirect_uri : str
+            The application Redirect URI assigned when
+            creating a new Microsoft App.
+
+        scope : List[str]
+            The list of scopes you want the application
+            to have access to.
+
+        account_type : str (optional, Default='common')
+            The account type you're application wants to
+            authenticate as.
+
+        credentials : str (optional, Default=None)
+            The file path to your local credential file.
+
+        max_connections : int (optional, Default=100)
+            The maximum number of concurrent connections
+            kept open to the API.
+
+        retry_policy : RetryPolicy (optional, Default=None)
+            The policy used to retry throttled (`429`) and unavailable
+            (`503`) responses. Defaults to `RetryPolicy()`.
+
+        rate_limiter : RateLimiter (optional, Default=None)
+            Paces requests to stay within the per-endpoint quotas,
+            for example the admin and scanner API limits.
+
+        cache : ResponseCache (optional, Default=None)
+            Serves repeated `GET` requests from a cache, and drops
+            cached reads when the same client changes the resource.
+
+        background_token_refresh : bool (optional, Default=False)
+            If `True`, a background thread renews the access token
+            ahead of expiry, so requests never wait on a refresh.
+
+        auth_client : PowerBiAuth (optional, Default=None)
+            A pre-configured authentication client, for example a
+            `ServicePrincipalAuth`. Defaults to a `PowerBiAuth` built
+            from the other arguments.
+
+        lazy : bool (optional, Default=False)
+            If `True`, the client logs in on its first request instead
+            of in the constructor.
+
+        serializer : Union[str, object] (optional, Default=None)
+            The JSON serializer for request bodies and responses, or
+            its name: `orjson`, `ujson` or `json`. Defaults to the
+            fastest one installed.
+
+        ### Usage
+        ----
+            >>> async with AsyncPowerBiClient(
+                client_id=client_id,
+                client_secret=client_secret,
+                scope=['https://analysis.windows.net/powerbi/api/.default'],
+                redirect_uri=redirect_uri,
+                credentials='config/power_bi_state.jsonc'
+            ) as power_bi_client:
+                groups = await power_bi_client.groups().get_groups()
+        """
+
+        self.max_connections = max_connections
+
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=redirect_uri,
+            scope=scope,
+            account_type=account_type,
+            credentials=credentials,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            background_token_refresh=background_token_refresh,
+            auth_client=auth_client,
+            lazy=lazy,
+            serializer=serializer,
+        )
+
+    def _create_session(self) -> AsyncPowerBiSession:
+        """Creates the asynchronous session used by every service.
+
+        ### Returns
+        ----
+        AsyncPowerBiSession :
+            A session bound to the authentication client.
+        """
+
+        return AsyncPowerBiSession(
+            client=self.power_bi_auth_client,
+            max_connections=self.max_connections,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter,
+            cache=self.cache,
+            serializer=self.serializer,
+        )
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session and stop the token refresher."""
+
+        self.power_bi_auth_client.stop_token_refresher()
+        await self.power_bi_session.close()
+
+    def __enter__(self) -> "AsyncPowerBiClient":
+        raise TypeError(
+            "AsyncPowerBiClient must be used with `async with`, its `close()` is a coroutine."
+        )
+
+    def __exit__(self, *args) -> None:
+        # Never reached, `__enter__` raises.
+        raise TypeError("AsyncPowerBiClient must be used with `async with`.")
+
+    async def __aenter__(self) -> "AsyncPowerBiClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,387 @@
+"""Handles all the asynchronous requests made to the Microsoft Power Bi API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+
+from powerbi.cache import ResponseCache
+from powerbi.rate_limit import RateLimiter
+from powerbi.retry import RetryPolicy
+from powerbi.retry import RetryStats
+from powerbi.serialization import get_serializer
+from powerbi.session import PowerBiSession
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPowerBiSession(PowerBiSession):
+    """Serves as the asynchronous Session for the Current
+    Microsoft Power Bi API."""
+
+    def __init__(
+        self,
+        client: object,
+        max_connections: int = 100,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        cache: ResponseCache = None,
+        serializer: object = None,
+    ) -> None:
+        """Initializes the `AsyncPowerBiSession` client.
+
+        ### Overview:
+        ----
+        The `AsyncPowerBiSession` object sends requests through an
+        `httpx.AsyncClient`, so `make_request` returns an awaitable
+        instead of blocking on the socket. URL building, header
+        building, endpoint validation and error mapping are shared
+        with `PowerBiSession`.
+
+        ### Arguments:
+        ----
+        client (str): The Microsoft Power BI API Python Client.
+
+        max_connections (int): The maximum number of concurrent
+            connections kept open to the API, by default 100.
+
+        retry_policy (RetryPolicy): The policy used to retry throttled
+            (`429`) and unavailable (`503`) responses, by default
+            `RetryPolicy()`.
+
+        rate_limiter (RateLimiter): Paces requests to stay within the
+            per-endpoint quotas, by default `None` (no limiting).
+
+        cache (ResponseCache): Serves repeated `GET` requests from a
+            cache, by default `None` (no caching).
+
+        serializer (object): Encodes request bodies and decodes
+            responses, by default the fastest serializer installed,
+            see `get_serializer`.
+
+        ### Usage:
+        ----
+            >>> power_bi_session = AsyncPowerBiSession(client=auth_client)
+        """
+
+        try:
+            import httpx  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "AsyncPowerBiSession requires httpx, install it with "
+                "`pip install python-power-bi[async]`."
+            ) from error
+
+        from powerbi.auth import (  # pylint: disable=import-outside-toplevel
+            PowerBiAuth,
+        )
+
+        self.client: PowerBiAuth = client
+        self.resource_url = "https://api.powerbi.com/"
+        self.version = "v1.0/"
+
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.serializer = serializer or get_serializer()
+        self._cache_identity = None
+
+        self.max_connections = max_connections
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+        self._session = httpx.AsyncClient(
+            verify=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict = None,
+        data: dict = None,
+        json_payload: dict = None,
+        files: dict = None,
+        retry_policy: RetryPolicy = None,
+        stream: bool = False,
+    ) -> Awaitable[Dict]:
+        """Handles all the asynchronous requests in the library.
+
+        ### Overview:
+        ---
+        Validates the endpoint and reads any file payloads right away,
+        then returns a coroutine that sends the request. Reading files
+        eagerly lets service methods close their file handles before
+        the request is awaited.
+
+        ### Arguments:
+        ----
+        method : str
+            The Request method, can be one of the following:
+            ['get','post','put','delete','patch']
+
+        endpoint : str
+            The API URL endpoint, example is 'quotes'
+
+        params : dict
+            The URL params for the request.
+
+        data : dict
+            A data payload for a request.
+
+        json_payload : dict
+            A json data payload for a request
+
+        files : dict
+            A files payload for multipart/form-data uploads.
+
+        retry_policy : RetryPolicy
+            Overrides the session retry policy for this request.
+
+        stream : bool (optional, Default=False)
+            Leaves the body of a successful response unread and
+            resolves to the `httpx.Response` itself, to be read with
+            `aiter_bytes()`. Streamed requests bypass the response
+            cache, and the caller must `aclose()` the response.
+
+        ### Returns:
+        ----
+        Awaitable[Dict]:
+            A coroutine resolving to the JSON values.
+
+        ### Usage:
+        ----
+            >>> await power_bi_session.make_request(
+                    method="get", endpoint="myorg/datasets"
+                )
+        """
+
+        self.validate_endpoint(endpoint=endpoint)
+
+        if files:
+            files = {
+                key: (value[0], value[1].read(), *value[2:])
+                if hasattr(value[1], "read")
+                else value
+                for key, value in files.items()
+            }
+
+        # Unlike requests, httpx sends `None` params as empty strings.
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+
+        return self._send(
+            method=method,
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            json_payload=json_payload,
+            files=files,
+            retry_policy=self.resolve_retry_policy(retry_policy=retry_policy),
+            stream=stream,
+        )
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict = None,
+        data: dict = None,
+        json_payload: dict = None,
+        files: dict = None,
+        retry_policy: RetryPolicy = None,
+        stream: bool = False,
+    ) -> Dict:
+        """Sends a validated request and maps the response.
+
+        ### Returns:
+        ----
+            A Dictionary object containing the
+            JSON values.
+        """
+
+        if stream:
+            cache_key, cached = None, None
+        else:
+            cache_key, cached = self.cache_lookup(method=method, endpoint=endpoint, params=params)
+        if cached is not None and cached.fresh:
+            return cached.value
+
+        url = self.build_url(endpoint=endpoint)
+        headers = self.build_headers()
+
+        # For multipart file uploads, remove Content-Type so httpx
+        # can set the multipart boundary automatically.
+        if files:
+            headers.pop("Content-Type", None)
+
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
+        logger.info("URL: %s", url)
+
+        data, json_payload = self.encode_payload(
+            data=data, json_payload=json_payload, files=files
+        )
+
+        attempt = 0
+        waited = 0.0
+
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(method=method, endpoint=endpoint)
+
+            request = self._session.build_request(
+                method=method.upper(),
+                url=url,
+                headers=headers,
+                params=params,
+                data=data,
+                json=json_payload,
+                files=files,
+            )
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                response = await self._session.send(request, stream=stream)
+            finally:
+                self._in_flight -= 1
+
+            delay = self.next_retry_delay(
+                policy=retry_policy,
+                method=method,
+                response=response,
+                attempt=attempt,
+                waited=waited,
+            )
+            if delay is None:
+                break
+
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+            attempt += 1
+            waited += delay
+
+            # The token may have been refreshed while we were waiting.
+            headers["Authorization"] = self.build_headers()["Authorization"]
+
+        if stream:
+            if response.is_success:
+                return response
+            # Errors are mapped from the body, so it is read first.
+            await response.aread()
+
+        return self.cache_response(
+            method=method,
+            endpoint=endpoint,
+            response=response,
+            ok=response.is_success,
+            cache_key=cache_key,
+            cached=cached,
+        )
+
+    async def paginate(
+        self,
+        fetch_page: Callable[..., Awaitable[Dict]],
+        page_size: int = 5000,
+        items_key: str = "value",
+        prefetch: bool = False,
+        max_items: int = None,
+    ) -> AsyncIterator[Dict]:
+        """Streams the items of a `$top`/`$skip` paged endpoint.
+
+        The asynchronous counterpart of `PowerBiSession.paginate`;
+        with `prefetch` the next page is requested as a task while
+        the current page is being consumed.
+
+        ### Returns:
+        ----
+        AsyncIterator[Dict]:
+            The items of every page, in order.
+
+        ### Usage:
+        ----
+            >>> async for group in admin_service.iter_groups():
+                    print(group["name"])
+        """
+
+        skip = 0
+        yielded = 0
+        pending = None
+
+        try:
+            if prefetch:
+                pending = asyncio.ensure_future(fetch_page(top=page_size, skip=skip))
+
+            while True:
+                if prefetch:
+                    page = await pending
+                    pending = None
+                else:
+                    page = await fetch_page(top=page_size, skip=skip)
+
+                items = page.get(items_key, []) if isinstance(page, dict) else []
+                last_page = len(items) < page_size
+                skip += len(items)
+
+                if prefetch and not last_page:
+                    pending = asyncio.ensure_future(fetch_page(top=page_size, skip=skip))
+
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if max_items is not None and yielded >= max_items:
+                        return
+
+                if last_page:
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def pool_stats(self) -> Dict:
+        """Returns statistics about the httpx connection pool.
+
+        ### Returns
+        ----
+        Dict
+            A dictionary with `max_connections`, `connections`,
+            `idle_connections`, `in_flight`, `peak_in_flight` and
+            `waiting`. httpx does not count the connections it has
+            created or reused, so unlike `PowerBiSession.pool_stats`
+            those are left out. `waiting` counts requests beyond
+            `max_connections`, which httpx queues until one is free.
+
+        ### Usage
+        ----
+            >>> power_bi_client.power_bi_session.pool_stats()
+        """
+
+        # A custom transport, such as `httpx.MockTransport`, has no pool.
+        pool = getattr(getattr(self._session, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+
+        return {
+            "max_connections": self.max_connections,
+            "connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "waiting": max(self._in_flight - self.max_connections, 0),
+        }
+
+    async def close(self) -> None:
+        """Close the underlying httpx client."""
+
+        await self._session.aclose()
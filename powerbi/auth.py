@@ -8,9 +8,12 @@ import time
 import urllib
 import secrets
 import pathlib
+import threading
 
 import msal
 
+from powerbi.token_cache import MemoryTokenCacheBackend
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,8 +75,24 @@ class PowerBiAuth:
 
         self._redirect_code = None
 
+        # Serializes refreshes, so only one thread renews an expiring token.
+        self._token_lock = threading.RLock()
+        self._refresher: threading.Thread | None = None
+        self._stop_refresher = threading.Event()
+
         # Initialize the Credential App.
-        self.client_app = msal.ConfidentialClientApplication(
+        self.client_app = self._create_client_app()
+
+    def _create_client_app(self) -> msal.ConfidentialClientApplication:
+        """Creates the MSAL application used to acquire tokens.
+
+        ### Returns
+        ----
+        msal.ConfidentialClientApplication :
+            The application for the configured authority.
+        """
+
+        return msal.ConfidentialClientApplication(
             client_id=self.client_id,
             authority=self.AUTHORITY_URL + self.account_type,
             client_credential=self.client_secret,
@@ -194,17 +213,108 @@ class PowerBiAuth:
         """Checks if a token is valid.
 
         Verify the current access token is valid for at least N seconds, and
-        if not then attempt to refresh it. Can be used to assure a valid token
-        before making a call to the TD Ameritrade API.
+        if not then attempt to refresh it. The check itself takes no lock, so
+        request threads holding a valid token never wait. When the token is
+        expiring, only one thread refreshes it; the others wait for that
+        refresh and reuse its result.
 
         ### Parameters
         ----
         nseconds {int} -- The minimum number of seconds the token has to be
-            valid for before attempting to get a refresh token. (default: {5})
+            valid for before attempting to get a refresh token. (default: {60})
+        """
+
+        if self._token_seconds(token_type="access_token") >= nseconds:
+            return
+
+        with self._token_lock:
+            # Another thread may have refreshed while we waited for the lock.
+            if self._token_seconds(token_type="access_token") < nseconds:
+                self.grab_refresh_token()
+
+    def authorization_header(self, nseconds: int = 60) -> str:
+        """Returns the `Authorization` header for a request.
+
+        ### Parameters
+        ----
+        nseconds : int (optional, Default=60)
+            The minimum number of seconds the token has to be valid for,
+            see `_token_validation`.
+
+        ### Returns
+        ----
+        str :
+            The bearer token header value.
         """
 
-        if self._token_seconds(token_type="access_token") < nseconds:
-            self.grab_refresh_token()
+        # Clients created with `lazy=True` log in on their first request.
+        if self.token_dict is None:
+            with self._token_lock:
+                if self.token_dict is None:
+                    self.login()
+
+        self._token_validation(nseconds=nseconds)
+
+        return f"Bearer {self.access_token}"
+
+    def start_token_refresher(
+        self, refresh_margin: int = 300, check_interval: float = 30.0
+    ) -> None:
+        """Starts a background thread that renews the token ahead of expiry.
+
+        ### Overview
+        ----
+        With the refresher running, request threads always find a token
+        that is valid for a while, so they never block on a refresh. A
+        failed background refresh is logged and retried on the next check;
+        requests fall back to refreshing themselves if the token expires.
+
+        ### Parameters
+        ----
+        refresh_margin : int (optional, Default=300)
+            Renew the token once fewer than this many seconds remain.
+
+        check_interval : float (optional, Default=30.0)
+            Seconds between two checks of the token lifetime.
+
+        ### Usage
+        ----
+            >>> power_bi_auth.start_token_refresher(refresh_margin=600)
+        """
+
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+
+        def refresh_loop() -> None:
+            while not self._stop_refresher.wait(timeout=check_interval):
+                # Nothing to renew until the first login.
+                if self.token_dict is None:
+                    continue
+                try:
+                    self._token_validation(nseconds=refresh_margin)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Background token refresh failed.")
+
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(
+            target=refresh_loop, name="powerbi-token-refresher", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_token_refresher(self, timeout: float = None) -> None:
+        """Stops the background token refresher, if it is running.
+
+        ### Parameters
+        ----
+        timeout : float (optional, Default=None)
+            Seconds to wait for the thread to exit.
+        """
+
+        self._stop_refresher.set()
+
+        if self._refresher is not None:
+            self._refresher.join(timeout=timeout)
+            self._refresher = None
 
     def _silent_sso(self) -> bool:
         """Attempts a Silent Authentication using the Access Token and Refresh Token.
@@ -308,7 +418,10 @@ class PowerBiAuth:
         )
 
         if "error" in token_dict:
-            logger.error("Token refresh failed: %s", token_dict.get("error_description", token_dict.get("error")))
+            logger.error(
+                "Token refresh failed: %s",
+                token_dict.get("error_description", token_dict.get("error")),
+            )
             raise PermissionError(
                 "Permissions not authorized, delete json file and run again."
             )
@@ -317,3 +430,145 @@ class PowerBiAuth:
         self._load_or_save_credentials(action="save", token_dict=token_dict)
 
         return token_dict
+
+
+class ServicePrincipalAuth(PowerBiAuth):
+    """Authenticates as an application (service principal) with the
+    client-credentials flow, for headless workers."""
+
+    DEFAULT_SCOPE = ["https://analysis.windows.net/powerbi/api/.default"]
+
+    def __init__(
+        self,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str = None,
+        client_certificate: dict = None,
+        scope: list[str] = None,
+        token_cache: object = None,
+    ):
+        """Initializes the `ServicePrincipalAuth` Client.
+
+        ### Overview
+        ----
+        Tokens are acquired with MSAL's `acquire_token_for_client`,
+        which serves them from a `SerializableTokenCache` until they
+        expire. The cache is loaded from and saved to `token_cache`
+        under its lock, so workers sharing a backend reuse one token
+        instead of each doing a full Azure AD round trip on startup.
+        Nothing is ever read from `input()`.
+
+        ### Parameters
+        ----
+        client_id : str
+            The application Client ID of the service principal.
+
+        tenant_id : str
+            The Azure AD tenant ID or domain.
+
+        client_secret : str (optional, Default=None)
+            The application Client Secret. Pass either this or
+            `client_certificate`.
+
+        client_certificate : dict (optional, Default=None)
+            An MSAL certificate credential, for example
+            `{"private_key": pem, "thumbprint": thumbprint}`.
+
+        scope : List[str] (optional, Default=None)
+            The scopes to request, by default the Power BI
+            `.default` scope.
+
+        token_cache : object (optional, Default=None)
+            Where the serialized token cache is kept, by default a
+            `MemoryTokenCacheBackend`. Use a `FileTokenCacheBackend`
+            to share it across processes.
+
+        ### Usage
+        ----
+            >>> power_bi_auth = ServicePrincipalAuth(
+                    client_id=client_id,
+                    tenant_id=tenant_id,
+                    client_secret=client_secret,
+                    token_cache=FileTokenCacheBackend("config/token_cache.bin")
+                )
+        """
+
+        if (client_secret is None) == (client_certificate is None):
+            raise ValueError("Pass exactly one of `client_secret` or `client_certificate`.")
+
+        self.client_certificate = client_certificate
+        self.token_cache_backend = token_cache or MemoryTokenCacheBackend()
+        self.token_cache = msal.SerializableTokenCache()
+
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=None,
+            scope=scope or self.DEFAULT_SCOPE,
+            account_type=tenant_id,
+        )
+
+    def _create_client_app(self) -> msal.ConfidentialClientApplication:
+        """Creates the MSAL application bound to the shared token cache.
+
+        ### Returns
+        ----
+        msal.ConfidentialClientApplication :
+            The application for the tenant authority.
+        """
+
+        return msal.ConfidentialClientApplication(
+            client_id=self.client_id,
+            authority=self.AUTHORITY_URL + self.account_type,
+            client_credential=self.client_certificate or self.client_secret,
+            token_cache=self.token_cache,
+        )
+
+    def login(self) -> None:
+        """Acquires the first token, from the shared cache when possible."""
+
+        self.grab_refresh_token()
+
+    def grab_refresh_token(self) -> dict:
+        """Acquires an app-only access token.
+
+        Service principals have no refresh token, so this replaces
+        the refresh with a client-credentials request, which MSAL
+        answers from the token cache while the cached token is valid.
+
+        ### Returns
+        ----
+        Dict :
+            The MSAL token response.
+        """
+
+        with self.token_cache_backend.lock():
+            data = self.token_cache_backend.load()
+            if data:
+                self.token_cache.deserialize(data)
+
+            token_dict = self.client_app.acquire_token_for_client(scopes=self.scope)
+
+            if self.token_cache.has_state_changed:
+                self.token_cache_backend.save(self.token_cache.serialize())
+
+        if "error" in token_dict:
+            logger.error(
+                "Token request failed: %s",
+                token_dict.get("error_description", token_dict.get("error")),
+            )
+            raise PermissionError(
+                "Service principal not authorized, check the client credentials."
+            )
+
+        logger.debug("Token acquired from %s.", token_dict.get("token_source", "idp"))
+
+        expires_at = time.time() + int(token_dict["expires_in"])
+        self.access_token = token_dict["access_token"]
+        self.token_dict = {
+            "token_type": token_dict.get("token_type", "Bearer"),
+            "expires_in": expires_at,
+            "ext_expires_in": expires_at,
+        }
+
+        return token_dict
@@ -0,0 +1,448 @@
+"""Response caching for idempotent `GET` requests."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlencode
+
+from powerbi.serialization import get_serializer
+
+# Methods that change a resource and invalidate cached reads of it.
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body.
+
+    ### Parameters
+    ----
+    value : object
+        The decoded JSON body.
+
+    expires : float
+        The `time.time()` after which the entry is stale.
+
+    etag : str (optional, Default=None)
+        The `ETag` header of the response, used to revalidate a
+        stale entry with `If-None-Match`.
+    """
+
+    value: object
+    expires: float
+    etag: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry may be served without asking the API."""
+
+        return time.time() < self.expires
+
+
+def _key_path(key: str) -> str:
+    """Returns the endpoint path of a cache key, without params or identity."""
+
+    return key.split("#")[0].split("?")[0]
+
+
+def _paths_overlap(cached_path: str, mutated_path: str) -> bool:
+    """Returns whether a mutation of one path may change a read of another."""
+
+    return (
+        cached_path == mutated_path
+        or cached_path.startswith(mutated_path + "/")
+        or mutated_path.startswith(cached_path + "/")
+    )
+
+
+class MemoryCacheBackend:
+    """Keeps cached responses in memory, evicting the least recently
+    used entry once `max_entries` is reached."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[str, float, Optional[str]]]:
+        """Returns the `(body, expires, etag)` of an entry, if any."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, body: str, expires: float, etag: Optional[str]) -> int:
+        """Stores an entry and returns the number of entries evicted."""
+
+        with self._lock:
+            self._entries[key] = (body, expires, etag)
+            self._entries.move_to_end(key)
+
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+
+        return evicted
+
+    def keys(self) -> Iterable[str]:
+        """Returns the keys of every entry."""
+
+        with self._lock:
+            return list(self._entries)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Removes entries."""
+
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """Keeps cached responses in a SQLite database, so they survive
+    between runs, evicting the least recently used entry once
+    `max_entries` is reached."""
+
+    def __init__(self, path: str, max_entries: int = 10000, timeout: float = 30.0) -> None:
+        """Initializes the `SQLiteCacheBackend` object.
+
+        ### Parameters
+        ----
+        path : str
+            The path to the SQLite database file.
+
+        max_entries : int (optional, Default=10000)
+            The maximum number of cached responses.
+
+        timeout : float (optional, Default=30.0)
+            Seconds to wait for another process to release the
+            database lock.
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, expires REAL NOT NULL, "
+            "etag TEXT, accessed REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple[str, float, Optional[str]]]:
+        """Returns the `(body, expires, etag)` of an entry, if any."""
+
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT body, expires, etag FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is not None:
+            connection.execute(
+                "UPDATE response_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+        return row
+
+    def set(self, key: str, body: str, expires: float, etag: Optional[str]) -> int:
+        """Stores an entry and returns the number of entries evicted."""
+
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO response_cache (key, body, expires, etag, accessed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, body, expires, etag, time.time()),
+        )
+
+        overflow = len(self) - self.max_entries
+        if overflow <= 0:
+            return 0
+
+        connection.execute(
+            "DELETE FROM response_cache WHERE key IN ("
+            "SELECT key FROM response_cache ORDER BY accessed LIMIT ?)",
+            (overflow,),
+        )
+
+        return overflow
+
+    def keys(self) -> Iterable[str]:
+        """Returns the keys of every entry."""
+
+        rows = self._connection().execute("SELECT key FROM response_cache").fetchall()
+        return [row[0] for row in rows]
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Removes entries."""
+
+        self._connection().executemany(
+            "DELETE FROM response_cache WHERE key = ?", ((key,) for key in keys)
+        )
+
+    def clear(self) -> None:
+        """Removes every entry."""
+
+        self._connection().execute("DELETE FROM response_cache")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the current thread's database connection."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class ResponseCache:
+    """Caches the JSON bodies of `GET` responses for a session.
+
+    ### Overview
+    ----
+    Entries expire after a per-endpoint TTL. A `POST`, `PUT`, `PATCH`
+    or `DELETE` sent through the same session drops every entry whose
+    path contains, or is contained in, the path it changed, so
+    `post_dataset` invalidates `get_datasets`. Stale entries that
+    carried an `ETag` are revalidated with `If-None-Match`.
+
+    Sessions key every entry by the identity of the caller, the tenant
+    and object ID of the access token, so a backend shared between
+    service principals or users never serves one identity's responses
+    to another.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 300.0,
+        ttls: Dict[str, float] = None,
+        backend: object = None,
+        serializer: object = None,
+    ) -> None:
+        """Initializes the `ResponseCache` object.
+
+        ### Parameters
+        ----
+        default_ttl : float (optional, Default=300.0)
+            Seconds a response is served from the cache.
+
+        ttls : Dict[str, float] (optional, Default=None)
+            Per-endpoint TTLs, keyed by a regular expression matched
+            against the endpoint path. The first match wins, and a
+            TTL of `0` disables caching for the endpoint.
+
+        backend : object (optional, Default=None)
+            Where entries are kept. Defaults to a `MemoryCacheBackend`;
+            use a `SQLiteCacheBackend` to keep them between runs.
+
+        serializer : object (optional, Default=None)
+            Encodes the cached bodies. Defaults to `get_serializer()`.
+
+        ### Usage
+        ----
+            >>> power_bi_client = PowerBiClient(
+                    ...,
+                    cache=ResponseCache(
+                        default_ttl=600,
+                        ttls={r"/refreshes$": 0, r"^myorg/groups$": 3600},
+                    )
+                )
+        """
+
+        self.default_ttl = default_ttl
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or {}).items()]
+        self.backend = MemoryCacheBackend() if backend is None else backend
+        self.serializer = serializer or get_serializer()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "invalidated": 0,
+            "evicted": 0,
+        }
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Returns the TTL, in seconds, of an endpoint."""
+
+        path = _key_path(endpoint).lstrip("/")
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+
+        return self.default_ttl
+
+    def make_key(self, endpoint: str, params: dict = None, identity: str = None) -> str:
+        """Builds the cache key of a request from its path, params and caller."""
+
+        key = endpoint.lstrip("/")
+        params = sorted(
+            (name, value) for name, value in (params or {}).items() if value is not None
+        )
+        if params:
+            key += ("&" if "?" in key else "?") + urlencode(params)
+
+        if identity:
+            key += "#" + identity
+
+        return key
+
+    def lookup(
+        self, endpoint: str, params: dict = None, identity: str = None
+    ) -> Tuple[Optional[str], Optional[CacheEntry]]:
+        """Finds the cached response of a `GET` request.
+
+        ### Parameters
+        ----
+        endpoint : str
+            The API URL endpoint, example is 'myorg/groups'.
+
+        params : dict (optional, Default=None)
+            The URL params of the request.
+
+        identity : str (optional, Default=None)
+            The caller, entries cached for other callers are never
+            returned.
+
+        ### Returns
+        ----
+        Tuple[Optional[str], Optional[CacheEntry]]
+            The cache key, `None` if the endpoint is not cached, and
+            the entry, `None` on a miss. The entry may be stale.
+        """
+
+        if self.ttl_for(endpoint) <= 0:
+            return None, None
+
+        key = self.make_key(endpoint=endpoint, params=params, identity=identity)
+        row = self.backend.get(key)
+
+        if row is None:
+            self._count("misses")
+            return key, None
+
+        body, expires, etag = row
+        entry = CacheEntry(value=self.serializer.loads(body), expires=expires, etag=etag)
+        self._count("hits" if entry.fresh else "misses")
+
+        return key, entry
+
+    def store(self, key: str, value: object, etag: Optional[str] = None) -> None:
+        """Caches a decoded response body.
+
+        Only JSON objects and arrays are cached, so status
+        messages and binary exports are never served again.
+        """
+
+        if not isinstance(value, (dict, list)):
+            return
+
+        expires = time.time() + self.ttl_for(key)
+        body = self.serializer.dumps(value).decode("utf-8")
+        evicted = self.backend.set(key, body, expires, etag)
+        if evicted:
+            self._count("evicted", evicted)
+
+    def revalidate(self, key: str, entry: CacheEntry) -> object:
+        """Marks a stale entry fresh after a `304 Not Modified`.
+
+        ### Returns
+        ----
+        object
+            The cached value.
+        """
+
+        self._count("revalidated")
+        self.store(key=key, value=entry.value, etag=entry.etag)
+
+        return entry.value
+
+    def invalidate(self, endpoint: str) -> int:
+        """Drops every entry whose path overlaps with `endpoint`.
+
+        ### Parameters
+        ----
+        endpoint : str
+            The endpoint changed by a mutating request.
+
+        ### Returns
+        ----
+        int
+            The number of entries dropped.
+        """
+
+        mutated_path = endpoint.split("?")[0].strip("/")
+        keys = [
+            key
+            for key in self.backend.keys()
+            if _paths_overlap(_key_path(key), mutated_path)
+        ]
+
+        if keys:
+            self.backend.delete(keys)
+            self._count("invalidated", len(keys))
+
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drops every entry."""
+
+        self.backend.clear()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the cache counters.
+
+        ### Returns
+        ----
+        Dict[str, float]
+            The `hits`, `misses`, `revalidated`, `invalidated` and
+            `evicted` counters, the `hit_rate` and the number of
+            `entries`.
+        """
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self.backend)
+
+        return stats
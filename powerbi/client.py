@@ -2,25 +2,36 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+from typing import Union
+
 from powerbi.session import PowerBiSession
+from powerbi.serialization import make_serializer
+from powerbi.cache import ResponseCache
+from powerbi.rate_limit import RateLimiter
+from powerbi.retry import RetryPolicy
 from powerbi.auth import PowerBiAuth
-from powerbi.dashboards import Dashboards
-from powerbi.groups import Groups
-from powerbi.users import Users
-from powerbi.template_apps import TemplateApps
-from powerbi.dataflow_storage_account import DataflowStorageAccount
-from powerbi.push_datasets import PushDatasets
-from powerbi.dataflows import Dataflows
-from powerbi.datasets import Datasets
-from powerbi.imports import Imports
-from powerbi.reports import Reports
-from powerbi.available_features import AvailableFeatures
-from powerbi.capacities import Capacities
-from powerbi.pipelines import Pipelines
-from powerbi.admin import Admin
-from powerbi.apps import Apps
-from powerbi.embed_token import EmbedTokens
-from powerbi.gateways import Gateways
+from powerbi.auth import ServicePrincipalAuth
+
+# Service modules are imported by their accessors on first use.
+if TYPE_CHECKING:
+    from powerbi.dashboards import Dashboards
+    from powerbi.groups import Groups
+    from powerbi.users import Users
+    from powerbi.template_apps import TemplateApps
+    from powerbi.dataflow_storage_account import DataflowStorageAccount
+    from powerbi.push_datasets import PushDatasets
+    from powerbi.dataflows import Dataflows
+    from powerbi.datasets import Datasets
+    from powerbi.imports import Imports
+    from powerbi.reports import Reports
+    from powerbi.available_features import AvailableFeatures
+    from powerbi.capacities import Capacities
+    from powerbi.pipelines import Pipelines
+    from powerbi.admin import Admin
+    from powerbi.apps import Apps
+    from powerbi.embed_token import EmbedTokens
+    from powerbi.gateways import Gateways
 
 
 class PowerBiClient:
@@ -39,6 +50,17 @@ class PowerBiClient:
         scope: list[str],
         account_type: str = "common",
         credentials: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = False,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        cache: ResponseCache = None,
+        background_token_refresh: bool = False,
+        auth_client: PowerBiAuth = None,
+        lazy: bool = False,
+        serializer: Union[str, object] = None,
     ):
         """Initializes the Graph Client.
 
@@ -67,6 +89,51 @@ class PowerBiClient:
         credentials : str (optional, Default=None)
             The file path to your local credential file.
 
+        pool_connections : int (optional, Default=10)
+            The number of host connection pools to cache.
+
+        pool_maxsize : int (optional, Default=10)
+            The maximum number of connections kept open per host.
+            Size it to the number of threads sharing the client.
+
+        pool_block : bool (optional, Default=False)
+            If `True`, threads wait for a pooled connection instead
+            of opening throwaway ones once `pool_maxsize` is reached.
+
+        tcp_keepalive : bool (optional, Default=False)
+            If `True`, enables TCP keep-alive probes on pooled
+            connections.
+
+        retry_policy : RetryPolicy (optional, Default=None)
+            The policy used to retry throttled (`429`) and unavailable
+            (`503`) responses. Defaults to `RetryPolicy()`.
+
+        rate_limiter : RateLimiter (optional, Default=None)
+            Paces requests to stay within the per-endpoint quotas,
+            for example the admin and scanner API limits.
+
+        cache : ResponseCache (optional, Default=None)
+            Serves repeated `GET` requests from a cache, and drops
+            cached reads when the same client changes the resource.
+
+        background_token_refresh : bool (optional, Default=False)
+            If `True`, a background thread renews the access token
+            ahead of expiry, so requests never wait on a refresh.
+
+        auth_client : PowerBiAuth (optional, Default=None)
+            A pre-configured authentication client, for example a
+            `ServicePrincipalAuth`. Defaults to a `PowerBiAuth` built
+            from the other arguments.
+
+        lazy : bool (optional, Default=False)
+            If `True`, the client logs in on its first request instead
+            of in the constructor.
+
+        serializer : Union[str, object] (optional, Default=None)
+            The JSON serializer for request bodies and responses, or
+            its name: `orjson`, `ujson` or `json`. Defaults to the
+            fastest one installed.
+
         ### Usage
         ----
             >>> power_bi_client = PowerBiClient(
@@ -85,7 +152,18 @@ class PowerBiClient:
         self.redirect_uri = redirect_uri
         self.scope = scope
 
-        self.power_bi_auth_client = PowerBiAuth(
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.tcp_keepalive = tcp_keepalive
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.serializer = (
+            make_serializer(serializer) if isinstance(serializer, str) else serializer
+        )
+
+        self.power_bi_auth_client = auth_client or PowerBiAuth(
             client_id=self.client_id,
             client_secret=self.client_secret,
             redirect_uri=self.redirect_uri,
@@ -94,9 +172,13 @@ class PowerBiClient:
             credentials=self.credentials,
         )
 
-        self.power_bi_auth_client.login()
+        if not lazy:
+            self.power_bi_auth_client.login()
 
-        self.power_bi_session = PowerBiSession(client=self.power_bi_auth_client)
+        if background_token_refresh:
+            self.power_bi_auth_client.start_token_refresher()
+
+        self.power_bi_session = self._create_session()
         self._admin: Admin | None = None
         self._apps: Apps | None = None
         self._dashboards: Dashboards | None = None
@@ -115,9 +197,97 @@ class PowerBiClient:
         self._gateways: Gateways | None = None
         self._embed_tokens: EmbedTokens | None = None
 
+    @classmethod
+    def from_service_principal(
+        cls,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str = None,
+        client_certificate: dict = None,
+        token_cache: object = None,
+        **kwargs,
+    ) -> "PowerBiClient":
+        """Creates a client that authenticates as a service principal.
+
+        ### Parameters
+        ----
+        client_id : str
+            The application Client ID of the service principal.
+
+        tenant_id : str
+            The Azure AD tenant ID or domain.
+
+        client_secret : str (optional, Default=None)
+            The application Client Secret.
+
+        client_certificate : dict (optional, Default=None)
+            An MSAL certificate credential, used instead of
+            `client_secret`.
+
+        token_cache : object (optional, Default=None)
+            Where the MSAL token cache is kept, see `ServicePrincipalAuth`.
+
+        **kwargs :
+            Any other `PowerBiClient` argument, such as `retry_policy`.
+
+        ### Returns
+        ----
+        PowerBiClient :
+            A logged-in client.
+
+        ### Usage
+        ----
+            >>> power_bi_client = PowerBiClient.from_service_principal(
+                    client_id=client_id,
+                    tenant_id=tenant_id,
+                    client_secret=client_secret,
+                    token_cache=FileTokenCacheBackend("config/token_cache.bin")
+                )
+        """
+
+        auth_client = ServicePrincipalAuth(
+            client_id=client_id,
+            tenant_id=tenant_id,
+            client_secret=client_secret,
+            client_certificate=client_certificate,
+            token_cache=token_cache,
+        )
+
+        return cls(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=None,
+            scope=auth_client.scope,
+            account_type=tenant_id,
+            auth_client=auth_client,
+            **kwargs,
+        )
+
+    def _create_session(self) -> PowerBiSession:
+        """Creates the session used by every service.
+
+        ### Returns
+        ----
+        PowerBiSession :
+            A session bound to the authentication client.
+        """
+
+        return PowerBiSession(
+            client=self.power_bi_auth_client,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            tcp_keepalive=self.tcp_keepalive,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter,
+            cache=self.cache,
+            serializer=self.serializer,
+        )
+
     def close(self) -> None:
-        """Close the underlying HTTP session."""
+        """Close the underlying HTTP session and stop the token refresher."""
 
+        self.power_bi_auth_client.stop_token_refresher()
         self.power_bi_session.close()
 
     def __enter__(self) -> "PowerBiClient":
@@ -147,6 +317,8 @@ class PowerBiClient:
         """
 
         if self._admin is None:
+            from powerbi.admin import Admin  # pylint: disable=import-outside-toplevel
+
             self._admin = Admin(session=self.power_bi_session)
         return self._admin
 
@@ -171,6 +343,8 @@ class PowerBiClient:
         """
 
         if self._apps is None:
+            from powerbi.apps import Apps  # pylint: disable=import-outside-toplevel
+
             self._apps = Apps(session=self.power_bi_session)
         return self._apps
 
@@ -195,6 +369,8 @@ class PowerBiClient:
         """
 
         if self._dashboards is None:
+            from powerbi.dashboards import Dashboards  # pylint: disable=import-outside-toplevel
+
             self._dashboards = Dashboards(session=self.power_bi_session)
         return self._dashboards
 
@@ -219,6 +395,8 @@ class PowerBiClient:
         """
 
         if self._groups is None:
+            from powerbi.groups import Groups  # pylint: disable=import-outside-toplevel
+
             self._groups = Groups(session=self.power_bi_session)
         return self._groups
 
@@ -243,6 +421,8 @@ class PowerBiClient:
         """
 
         if self._users is None:
+            from powerbi.users import Users  # pylint: disable=import-outside-toplevel
+
             self._users = Users(session=self.power_bi_session)
         return self._users
 
@@ -267,6 +447,8 @@ class PowerBiClient:
         """
 
         if self._template_apps is None:
+            from powerbi.template_apps import TemplateApps  # pylint: disable=import-outside-toplevel
+
             self._template_apps = TemplateApps(session=self.power_bi_session)
         return self._template_apps
 
@@ -291,6 +473,8 @@ class PowerBiClient:
         """
 
         if self._dataflow_storage_account is None:
+            from powerbi.dataflow_storage_account import DataflowStorageAccount  # pylint: disable=import-outside-toplevel
+
             self._dataflow_storage_account = DataflowStorageAccount(session=self.power_bi_session)
         return self._dataflow_storage_account
 
@@ -315,6 +499,8 @@ class PowerBiClient:
         """
 
         if self._push_datasets is None:
+            from powerbi.push_datasets import PushDatasets  # pylint: disable=import-outside-toplevel
+
             self._push_datasets = PushDatasets(session=self.power_bi_session)
         return self._push_datasets
 
@@ -339,6 +525,8 @@ class PowerBiClient:
         """
 
         if self._imports is None:
+            from powerbi.imports import Imports  # pylint: disable=import-outside-toplevel
+
             self._imports = Imports(session=self.power_bi_session)
         return self._imports
 
@@ -363,6 +551,8 @@ class PowerBiClient:
         """
 
         if self._reports is None:
+            from powerbi.reports import Reports  # pylint: disable=import-outside-toplevel
+
             self._reports = Reports(session=self.power_bi_session)
         return self._reports
 
@@ -387,6 +577,8 @@ class PowerBiClient:
         """
 
         if self._available_features is None:
+            from powerbi.available_features import AvailableFeatures  # pylint: disable=import-outside-toplevel
+
             self._available_features = AvailableFeatures(session=self.power_bi_session)
         return self._available_features
 
@@ -411,6 +603,8 @@ class PowerBiClient:
         """
 
         if self._capacities is None:
+            from powerbi.capacities import Capacities  # pylint: disable=import-outside-toplevel
+
             self._capacities = Capacities(session=self.power_bi_session)
         return self._capacities
 
@@ -435,6 +629,8 @@ class PowerBiClient:
         """
 
         if self._pipelines is None:
+            from powerbi.pipelines import Pipelines  # pylint: disable=import-outside-toplevel
+
             self._pipelines = Pipelines(session=self.power_bi_session)
         return self._pipelines
 
@@ -459,6 +655,8 @@ class PowerBiClient:
         """
 
         if self._dataflows is None:
+            from powerbi.dataflows import Dataflows  # pylint: disable=import-outside-toplevel
+
             self._dataflows = Dataflows(session=self.power_bi_session)
         return self._dataflows
 
@@ -483,6 +681,8 @@ class PowerBiClient:
         """
 
         if self._datasets is None:
+            from powerbi.datasets import Datasets  # pylint: disable=import-outside-toplevel
+
             self._datasets = Datasets(session=self.power_bi_session)
         return self._datasets
 
@@ -507,6 +707,8 @@ class PowerBiClient:
         """
 
         if self._gateways is None:
+            from powerbi.gateways import Gateways  # pylint: disable=import-outside-toplevel
+
             self._gateways = Gateways(session=self.power_bi_session)
         return self._gateways
 
@@ -531,5 +733,7 @@ class PowerBiClient:
         """
 
         if self._embed_tokens is None:
+            from powerbi.embed_token import EmbedTokens  # pylint: disable=import-outside-toplevel
+
             self._embed_tokens = EmbedTokens(session=self.power_bi_session)
         return self._embed_tokens
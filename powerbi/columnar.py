@@ -0,0 +1,333 @@
+"""Encodes columnar data (pandas, Arrow, NumPy) straight into push rows JSON."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import json
+
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from powerbi.enums import ColumnDataTypes
+
+ColumnTypes = Dict[str, Union[ColumnDataTypes, str]]
+
+_NULL = "null"
+
+
+def encode_default(value: object) -> object:
+    """Converts the values `json` cannot encode on its own.
+
+    Dates and times are written in ISO 8601, `Decimal` values as
+    numbers and bytes as UTF-8 text.
+    """
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def is_columnar(data: object) -> bool:
+    """Returns whether `data` is a DataFrame, Arrow table or structured array.
+
+    The check only looks at the object's type, so it never imports
+    pandas, pyarrow or NumPy.
+    """
+
+    module = type(data).__module__.split(".")[0]
+
+    if module == "pandas":
+        return hasattr(data, "columns")
+    if module == "pyarrow":
+        return hasattr(data, "schema") and hasattr(data, "slice")
+    if module == "numpy":
+        return getattr(getattr(data, "dtype", None), "names", None) is not None
+
+    return False
+
+
+def _numpy():
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            "Encoding columnar data requires numpy, install it with "
+            "`pip install python-power-bi[dataframes]`."
+        ) from error
+
+    return numpy
+
+
+def _length(data: object) -> int:
+    return data.num_rows if hasattr(data, "num_rows") else len(data)
+
+
+def _slice(data: object, start: int, stop: int) -> object:
+    if hasattr(data, "iloc"):
+        return data.iloc[start:stop]
+    if hasattr(data, "num_rows"):
+        return data.slice(start, stop - start)
+    return data[start:stop]
+
+
+def _columns(data: object) -> List[Tuple[str, object, Optional[object]]]:
+    """Splits columnar data into `(name, values, null mask)` NumPy columns."""
+
+    np = _numpy()
+    columns = []
+
+    if hasattr(data, "iloc"):
+        for name in data.columns:
+            series = data[name]
+            mask = series.isna().to_numpy()
+            dtype = series.dtype
+
+            if getattr(dtype, "tz", None) is not None:
+                values = series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+            elif getattr(dtype, "kind", "O") in "iub" and not isinstance(dtype, np.dtype):
+                # Nullable extension dtypes, such as `Int64` and `boolean`.
+                values = series.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+            else:
+                values = series.to_numpy()
+
+            columns.append((str(name), values, mask))
+
+    elif hasattr(data, "schema"):
+        import pyarrow  # pylint: disable=import-outside-toplevel
+
+        for name, column in zip(data.schema.names, data.columns):
+            mask = None
+            if column.null_count:
+                mask = column.is_null().to_numpy(zero_copy_only=False)
+                # Filled so integers and booleans keep their dtype.
+                if pyarrow.types.is_integer(column.type):
+                    column = column.fill_null(0)
+                elif pyarrow.types.is_boolean(column.type):
+                    column = column.fill_null(False)
+
+            columns.append((name, column.to_numpy(zero_copy_only=False), mask))
+
+    else:
+        for name in data.dtype.names:
+            columns.append((name, data[name], None))
+
+    return columns
+
+
+def _encode_generic(value: object) -> str:
+    """Encodes a single Python value, used for object columns."""
+
+    if value is None:
+        return _NULL
+
+    try:
+        if value != value:  # NaN and NaT.
+            return _NULL
+    except TypeError:
+        # pandas.NA outside a DataFrame, which has no null mask.
+        return _NULL
+
+    return json.dumps(value, default=encode_default)
+
+
+def _encode_column(
+    values: object, mask: Optional[object], data_type: Optional[ColumnDataTypes]
+) -> List[str]:
+    """Encodes one column into JSON value fragments, vectorized where possible.
+
+    ### Parameters
+    ----
+    values : numpy.ndarray
+        The column values.
+
+    mask : numpy.ndarray (optional)
+        `True` where the value is null.
+
+    data_type : ColumnDataTypes (optional)
+        The target column type. Inferred from the array dtype if omitted.
+
+    ### Returns
+    ----
+    List[str]
+        One JSON fragment per row.
+    """
+
+    np = _numpy()
+
+    # Fixed-width byte strings are decoded like any other text.
+    if values.dtype.kind == "S":
+        values = np.char.decode(values, "utf-8")
+
+    kind = values.dtype.kind
+
+    if kind == "b":
+        encoded = np.where(values, "true", "false").astype(object)
+
+    elif kind in "iu":
+        if data_type is ColumnDataTypes.BOOLEAN:
+            encoded = np.where(values != 0, "true", "false").astype(object)
+        else:
+            encoded = values.astype(str).astype(object)
+
+    elif kind == "f":
+        invalid = ~np.isfinite(values)
+        mask = invalid if mask is None else (mask | invalid)
+        if data_type is ColumnDataTypes.INT64:
+            encoded = np.where(invalid, 0, values).astype(np.int64)
+            encoded = encoded.astype(str).astype(object)
+        else:
+            encoded = values.astype(str).astype(object)
+
+    elif kind == "M":
+        invalid = np.isnat(values)
+        mask = invalid if mask is None else (mask | invalid)
+        strings = np.datetime_as_string(values, unit="ms")
+        encoded = np.array(['"' + value + '"' for value in strings.tolist()], dtype=object)
+
+    else:
+        # Masked values are never encoded, pandas.NA has no truth value.
+        missing = mask.tolist() if mask is not None else [False] * len(values)
+        encoded = np.array(
+            [
+                _NULL if null else _encode_generic(value)
+                for value, null in zip(values.tolist(), missing)
+            ],
+            dtype=object,
+        )
+
+    if mask is not None:
+        encoded[mask] = _NULL
+
+    return encoded.tolist()
+
+
+def row_template(names: List[str]) -> str:
+    """Builds a `%`-format template that encodes one row as a JSON object.
+
+    ### Parameters
+    ----
+    names : List[str]
+        The column names, in order.
+
+    ### Returns
+    ----
+    str
+        A template such as `{"a":%s,"b":%s}`, filled with a tuple of
+        encoded values.
+    """
+
+    return "{" + ",".join(json.dumps(name).replace("%", "%%") + ":%s" for name in names) + "}"
+
+
+def _resolve_type(
+    name: str, column_types: Optional[ColumnTypes]
+) -> Optional[ColumnDataTypes]:
+    if not column_types or name not in column_types:
+        return None
+
+    data_type = column_types[name]
+    return data_type if isinstance(data_type, ColumnDataTypes) else ColumnDataTypes(data_type)
+
+
+def encode_columnar_rows(data: object, column_types: ColumnTypes = None) -> List[str]:
+    """Encodes every row of columnar data as a JSON object.
+
+    ### Overview
+    ----
+    Each column is converted to JSON fragments in one vectorized pass,
+    and the rows are assembled from a precompiled template, so no
+    per-row dictionaries are created.
+
+    ### Parameters
+    ----
+    data : object
+        A pandas `DataFrame`, a pyarrow `Table` or `RecordBatch`, or a
+        NumPy structured array.
+
+    column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+        The Power BI type of each column. Missing columns are inferred
+        from their dtype.
+
+    ### Returns
+    ----
+    List[str]
+        One encoded JSON object per row.
+    """
+
+    columns = _columns(data)
+    if not columns:
+        return []
+
+    template = row_template([name for name, _, _ in columns])
+
+    encoded = [
+        _encode_column(
+            values=values, mask=mask, data_type=_resolve_type(name, column_types)
+        )
+        for name, values, mask in columns
+    ]
+
+    return [template % row for row in zip(*encoded)]
+
+
+def iter_columnar_rows(
+    data: object, column_types: ColumnTypes = None, chunk_size: int = 10000
+) -> Iterator[bytes]:
+    """Streams the encoded rows of columnar data, one chunk at a time.
+
+    ### Parameters
+    ----
+    data : object
+        A pandas `DataFrame`, a pyarrow `Table` or `RecordBatch`, or a
+        NumPy structured array.
+
+    column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+        The Power BI type of each column.
+
+    chunk_size : int (optional, Default=10000)
+        Rows encoded per pass, which bounds the extra memory used.
+
+    ### Returns
+    ----
+    Iterator[bytes]
+        One UTF-8 encoded JSON object per row.
+    """
+
+    total = _length(data)
+    for start in range(0, total, chunk_size):
+        chunk = _slice(data, start, min(start + chunk_size, total))
+        for row in encode_columnar_rows(chunk, column_types=column_types):
+            yield row.encode("utf-8")
+
+
+def encode_columnar_body(data: object, column_types: ColumnTypes = None) -> bytes:
+    """Encodes columnar data as a complete `{"rows": [...]}` request body.
+
+    ### Parameters
+    ----
+    data : object
+        A pandas `DataFrame`, a pyarrow `Table` or `RecordBatch`, or a
+        NumPy structured array.
+
+    column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+        The Power BI type of each column.
+
+    ### Returns
+    ----
+    bytes
+        The UTF-8 encoded request body.
+    """
+
+    rows = encode_columnar_rows(data, column_types=column_types)
+
+    return ('{"rows":[' + ",".join(rows) + "]}").encode("utf-8")
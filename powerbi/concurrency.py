@@ -0,0 +1,105 @@
+"""Helpers for running blocking API calls concurrently."""
+
+from __future__ import annotations
+
+import queue
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception raised by a producer to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def iter_concurrently(
+    producers: Iterable[Callable[[], Iterable[T]]],
+    max_workers: int = 4,
+    buffer_size: int = 16,
+) -> Iterator[T]:
+    """Runs several producers on a thread pool and streams their items.
+
+    Items from one producer keep their order, items from different
+    producers are interleaved in the order they arrive. The queue
+    between the threads and the consumer is bounded, so producers
+    pause when the consumer falls behind and memory stays flat.
+
+    ### Parameters
+    ----
+    producers : Iterable[Callable[[], Iterable[T]]]
+        Zero-argument callables, each returning an iterable of items.
+
+    max_workers : int (optional, Default=4)
+        The number of producers run at the same time.
+
+    buffer_size : int (optional, Default=16)
+        The maximum number of items waiting to be consumed.
+
+    ### Returns
+    ----
+    Iterator[T]
+        The items of every producer. The first exception raised by
+        a producer is re-raised here.
+
+    ### Usage
+    ----
+        >>> days = [functools.partial(fetch_day, day) for day in days]
+        >>> for event in iter_concurrently(days, max_workers=8):
+                print(event)
+    """
+
+    producers = list(producers)
+    if not producers:
+        return
+
+    items: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(producer: Callable[[], Iterable[T]]) -> None:
+        try:
+            for item in producer():
+                if not put(item):
+                    return
+        except BaseException as error:  # pylint: disable=broad-except
+            put(_Failure(error))
+        finally:
+            put(_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    remaining = len(producers)
+
+    try:
+        for producer in producers:
+            executor.submit(run, producer)
+
+        while remaining:
+            item = items.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, _Failure):
+                raise item.error
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import inspect
+
 from typing import Dict
+from typing import Iterator
+from powerbi.query_results import QueryBatch
+from powerbi.query_results import iter_query_batches
 from powerbi.session import PowerBiSession
 
 
@@ -674,7 +679,7 @@ class Datasets:
         retry_count: int = None,
         timeout: str = None,
         group_id: str = None,
-    ) -> None:
+    ) -> Dict:
         """Triggers a refresh for the specified dataset.
 
         For a basic refresh, provide `notify_option`. For an enhanced
@@ -723,7 +728,9 @@ class Datasets:
 
         ### Returns
         -------
-        None
+        Dict
+            The response status, with the refresh ID in `request_id`,
+            which `get_refresh_execution_details` accepts.
 
         ### Usage
         ----
@@ -831,6 +838,99 @@ class Datasets:
 
         return content
 
+    def execute_queries_stream(
+        self,
+        dataset_id: str,
+        query: str,
+        batch_size: int = 10000,
+        impersonated_user_name: str = None,
+        include_nulls: bool = None,
+        chunk_size: int = 65536,
+        group_id: str = None,
+    ) -> Iterator[QueryBatch]:
+        """Executes a DAX query and streams the result in row batches.
+
+        ### Overview
+        ----
+        Unlike `execute_queries`, the response is decoded while it is
+        downloaded, so memory follows `batch_size` and not the size of
+        the result. The request is sent when iteration starts. Only the
+        synchronous client can stream responses.
+
+        ### Parameters
+        ----
+        dataset_id : str
+            The dataset ID.
+
+        query : str
+            The DAX query to execute.
+
+        batch_size : int (optional, Default=10000)
+            The most rows per batch.
+
+        impersonated_user_name : str (optional, Default=None)
+            The UPN of a user to impersonate. Ignored if the model
+            is not RLS enabled.
+
+        include_nulls : bool (optional, Default=None)
+            Whether null (blank) values should be included in the
+            result set. Defaults to false if unspecified.
+
+        chunk_size : int (optional, Default=65536)
+            The number of bytes read from the response at a time.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        ### Returns
+        -------
+        Iterator[QueryBatch]
+            The rows of each result table, see `QueryBatch` for the
+            conversions to columns, pandas and Arrow.
+
+        ### Usage
+        ----
+            >>> datasets_service = power_bi_client.datasets()
+            >>> for batch in datasets_service.execute_queries_stream(
+                    dataset_id='cfafbeb1-8037-4d0c-896e-a46fb27ff229',
+                    query='EVALUATE Sales'
+                ):
+                    frame = batch.to_pandas()
+        """
+
+        body = {"queries": [{"query": query}]}
+
+        if impersonated_user_name:
+            body["impersonatedUserName"] = impersonated_user_name
+
+        if include_nulls is not None:
+            body["serializerSettings"] = {"includeNulls": include_nulls}
+
+        response = self.power_bi_session.make_request(
+            method="post",
+            endpoint=self._build_endpoint(
+                f"datasets/{dataset_id}/executeQueries", group_id
+            ),
+            json_payload=body,
+            stream=True,
+        )
+
+        if inspect.isawaitable(response):
+            response.close()
+            raise TypeError(
+                "execute_queries_stream needs the synchronous client, with "
+                "AsyncPowerBiClient call `make_request(..., stream=True)` directly."
+            )
+
+        try:
+            yield from iter_query_batches(
+                response.iter_content(chunk_size=chunk_size),
+                batch_size=batch_size,
+                serializer=self.power_bi_session.serializer,
+            )
+        finally:
+            response.close()
+
     def post_dataset_user(
         self,
         dataset_id: str,
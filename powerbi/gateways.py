@@ -365,12 +365,14 @@ class Gateways:
                 profile = profile.value
             payload["profile"] = profile
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="post",
             endpoint=f"myorg/gateways/{gateway_id}/datasources/{datasource_id}/users",
             json_payload=payload,
         )
 
+        return content
+
     # ------------------------------------------------------------------
     # PATCH operations
     # ------------------------------------------------------------------
@@ -417,12 +419,14 @@ class Gateways:
 
         payload = {"credentialDetails": credential_details}
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="patch",
             endpoint=f"myorg/gateways/{gateway_id}/datasources/{datasource_id}",
             json_payload=payload,
         )
 
+        return content
+
     # ------------------------------------------------------------------
     # DELETE operations
     # ------------------------------------------------------------------
@@ -448,11 +452,13 @@ class Gateways:
             )
         """
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="delete",
             endpoint=f"myorg/gateways/{gateway_id}/datasources/{datasource_id}",
         )
 
+        return content
+
     def delete_datasource_user(
         self,
         gateway_id: str,
@@ -491,8 +497,10 @@ class Gateways:
         if profile_id is not None:
             params = {"profileId": profile_id}
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="delete",
             endpoint=f"myorg/gateways/{gateway_id}/datasources/{datasource_id}/users/{email_address}",
             params=params,
         )
+
+        return content
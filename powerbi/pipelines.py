@@ -512,12 +512,14 @@ class Pipelines:
 
         body = {"workspaceId": workspace_id}
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="post",
             endpoint=f"myorg/pipelines/{pipeline_id}/stages/{stage_order}/assignWorkspace",
             json_payload=body,
         )
 
+        return content
+
     def unassign_workspace(self, pipeline_id: str, stage_order: int) -> None:
         """Unassigns the workspace from the specified stage in the
         specified deployment pipeline.
@@ -540,11 +542,13 @@ class Pipelines:
             )
         """
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="post",
             endpoint=f"myorg/pipelines/{pipeline_id}/stages/{stage_order}/unassignWorkspace",
         )
 
+        return content
+
     def update_pipeline_user(
         self,
         pipeline_id: str,
@@ -587,12 +591,14 @@ class Pipelines:
             "principalType": principal_type,
         }
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="post",
             endpoint=f"myorg/pipelines/{pipeline_id}/users",
             json_payload=body,
         )
 
+        return content
+
     # ------------------------------------------------------------------
     # PATCH operations
     # ------------------------------------------------------------------
@@ -668,11 +674,13 @@ class Pipelines:
             )
         """
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="delete",
             endpoint=f"myorg/pipelines/{pipeline_id}",
         )
 
+        return content
+
     def delete_pipeline_user(
         self, pipeline_id: str, identifier: str
     ) -> None:
@@ -697,7 +705,9 @@ class Pipelines:
             )
         """
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="delete",
             endpoint=f"myorg/pipelines/{pipeline_id}/users/{identifier}",
         )
+
+        return content
@@ -4,6 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 from typing import Union
+from powerbi.columnar import ColumnTypes
+from powerbi.columnar import encode_columnar_body
+from powerbi.columnar import is_columnar
+from powerbi.row_buffer import TypedRowBuffer
 from powerbi.utils import Dataset
 from powerbi.utils import Table
 from powerbi.session import PowerBiSession
@@ -126,7 +130,12 @@ class PushDatasets:
         return content
 
     def post_dataset_rows(
-        self, dataset_id: str, table_name: str, rows: list, group_id: str = None
+        self,
+        dataset_id: str,
+        table_name: str,
+        rows: Union[list, bytes, object],
+        group_id: str = None,
+        column_types: ColumnTypes = None,
     ) -> None:
         """Adds new data rows to the specified table within the specified dataset.
 
@@ -138,14 +147,22 @@ class PushDatasets:
         table_name : str
             The dataset table name you want to post rows to.
 
-        rows : list
+        rows : Union[list, bytes, object]
             An array of data rows pushed to a dataset table.
             Each element is a collection of properties
-            represented using key-value format.
+            represented using key-value format. Can also be
+            an already encoded `{"rows": [...]}` JSON body, or a
+            pandas `DataFrame`, pyarrow `Table`, NumPy structured
+            array or `TypedRowBuffer`, which is encoded column-wise.
 
         group_id : str (optional, Default=None)
             The workspace id. If not provided, uses "My Workspace".
 
+        column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+            The Power BI type of each column of columnar `rows`, for
+            example `{"sold_on": ColumnDataTypes.DATETIME}`. Columns
+            without a type are inferred from their dtype.
+
         ### Usage
         ----
             >>> push_datasets_service = power_bi_client.push_datasets()
@@ -169,14 +186,27 @@ class PushDatasets:
             )
         """
 
-        self.power_bi_session.make_request(
+        if is_columnar(rows):
+            rows = encode_columnar_body(rows, column_types=column_types)
+        elif isinstance(rows, TypedRowBuffer):
+            rows = rows.to_body()
+
+        # Encoded bodies are sent as is, so they are not serialized twice.
+        if isinstance(rows, bytes):
+            payload = {"data": rows}
+        else:
+            payload = {"json_payload": {"rows": rows}}
+
+        content = self.power_bi_session.make_request(
             method="post",
             endpoint=self._build_endpoint(
                 f"datasets/{dataset_id}/tables/{table_name}/rows", group_id
             ),
-            json_payload={"rows": rows},
+            **payload,
         )
 
+        return content
+
     def put_dataset(
         self,
         dataset_id: str,
@@ -218,8 +248,7 @@ class PushDatasets:
         """
 
         if isinstance(table, Table):
-            table = table.to_dict()
-            table.pop("rows", None)
+            table = table.schema()
 
         content = self.power_bi_session.make_request(
             method="put",
@@ -261,9 +290,11 @@ class PushDatasets:
             )
         """
 
-        self.power_bi_session.make_request(
+        content = self.power_bi_session.make_request(
             method="delete",
             endpoint=self._build_endpoint(
                 f"datasets/{dataset_id}/tables/{table_name}/rows", group_id
             ),
         )
+
+        return content
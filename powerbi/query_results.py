@@ -0,0 +1,495 @@
+"""Streams and decodes `executeQueries` results in row batches."""
+
+from __future__ import annotations
+
+import re
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from powerbi.exceptions import PowerBiError
+from powerbi.serialization import get_serializer
+from powerbi.serialization import strip_bom
+
+# The start of a `rows` array, anywhere in the response.
+_ROWS_START = re.compile(rb'"rows"\s*:\s*\[')
+
+# One flat row object, DAX rows never nest. Strings may hold braces
+# and escaped quotes, so they are matched as a whole.
+_ROW = rb'\{[^{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^{}"]*)*\}'
+
+# Every complete row at the start of the buffer, matched in one pass so
+# rows are not cut out one at a time.
+_ROW_RUN = re.compile(rb"\s*,?\s*(" + _ROW + rb"(?:\s*,\s*" + _ROW + rb")*)")
+
+_ROWS_END = re.compile(rb"\s*\]")
+
+# Long enough to hold a `"rows" : [` split across two chunks.
+_KEEP = 64
+
+_KEY = re.compile(r"^(.*?)\[(.*)\]$")
+
+_ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?$")
+
+
+def split_key(key: str) -> Tuple[str, str]:
+    """Splits a `Table[Column]` result key into its table and column.
+
+    ### Parameters
+    ----
+    key : str
+        A result key, such as `Sales[Amount]` or `[Total Sales]` for
+        a measure or an expression without a table.
+
+    ### Returns
+    ----
+    Tuple[str, str]
+        The table, empty if there is none, and the column.
+
+    ### Usage
+    ----
+        >>> split_key("Sales[Amount]")
+        ('Sales', 'Amount')
+    """
+
+    match = _KEY.match(key)
+    if match is None:
+        return "", key
+
+    return match.group(1), match.group(2)
+
+
+def column_names(keys: Iterable[str], strip_table: bool = True) -> List[str]:
+    """Maps result keys to column names.
+
+    The table is dropped from each key unless two keys share the same
+    column, in which case those keys are kept whole.
+
+    ### Parameters
+    ----
+    keys : Iterable[str]
+        The `Table[Column]` keys, in order.
+
+    strip_table : bool (optional, Default=True)
+        Whether to drop the table from the keys. If `False`, the keys
+        are returned as they are.
+
+    ### Returns
+    ----
+    List[str]
+        One column name per key.
+    """
+
+    keys = list(keys)
+    if not strip_table:
+        return keys
+
+    columns = [split_key(key)[1] for key in keys]
+    counts = {}
+    for column in columns:
+        counts[column] = counts.get(column, 0) + 1
+
+    return [column if counts[column] == 1 else key for key, column in zip(keys, columns)]
+
+
+def _first_value(values: List[object]) -> object:
+    return next((value for value in values if value is not None), None)
+
+
+def _date_columns(columns: Dict[str, List[object]]) -> List[str]:
+    """Returns the columns whose first value is an ISO 8601 date and time."""
+
+    names = []
+    for name, values in columns.items():
+        value = _first_value(values)
+        if isinstance(value, str) and _ISO_DATETIME.match(value):
+            names.append(name)
+
+    return names
+
+
+def _pandas():
+    try:
+        import pandas  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            "Decoding query results to a DataFrame requires pandas, install it with "
+            "`pip install python-power-bi[dataframes]`."
+        ) from error
+
+    return pandas
+
+
+def _pyarrow():
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            "Decoding query results to Arrow requires pyarrow, install it with "
+            "`pip install python-power-bi[dataframes]`."
+        ) from error
+
+    return pyarrow
+
+
+@dataclass
+class QueryBatch:
+    """A batch of rows from one table of an `executeQueries` result.
+
+    ### Parameters
+    ----
+    table : int
+        The position of the table in the response, starting at 0.
+
+    rows : List[Dict]
+        The decoded rows, keyed by `Table[Column]`.
+
+    keys : List[str]
+        Every key seen in the table so far, in order. Rows leave out
+        blank values unless `includeNulls` is set, so a single row may
+        not hold them all.
+    """
+
+    table: int
+    rows: List[Dict] = field(default_factory=list)
+    keys: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_columns(self, strip_table: bool = True) -> Dict[str, List[object]]:
+        """Converts the batch into one list of values per column.
+
+        ### Parameters
+        ----
+        strip_table : bool (optional, Default=True)
+            Whether to drop the table from the `Table[Column]` keys,
+            see `column_names`.
+
+        ### Returns
+        ----
+        Dict[str, List[object]]
+            The values of each column, `None` where the row left the
+            value out.
+        """
+
+        names = column_names(self.keys, strip_table=strip_table)
+
+        return {
+            name: [row.get(key) for row in self.rows] for name, key in zip(names, self.keys)
+        }
+
+    def to_pandas(self, strip_table: bool = True, parse_dates: bool = True) -> object:
+        """Converts the batch into a pandas `DataFrame`.
+
+        ### Parameters
+        ----
+        strip_table : bool (optional, Default=True)
+            Whether to drop the table from the `Table[Column]` keys.
+
+        parse_dates : bool (optional, Default=True)
+            Whether text columns holding ISO 8601 dates and times are
+            converted to `datetime64` columns.
+
+        ### Returns
+        ----
+        pandas.DataFrame
+            The rows of the batch.
+        """
+
+        pandas = _pandas()
+        columns = self.to_columns(strip_table=strip_table)
+        frame = pandas.DataFrame(columns, columns=list(columns))
+
+        if parse_dates:
+            for name in _date_columns(columns):
+                frame[name] = pandas.to_datetime(frame[name], errors="coerce")
+
+        return frame
+
+    def to_arrow(self, strip_table: bool = True, parse_dates: bool = True) -> object:
+        """Converts the batch into a pyarrow `Table`.
+
+        ### Parameters
+        ----
+        strip_table : bool (optional, Default=True)
+            Whether to drop the table from the `Table[Column]` keys.
+
+        parse_dates : bool (optional, Default=True)
+            Whether text columns holding ISO 8601 dates and times are
+            converted to timestamp columns.
+
+        ### Returns
+        ----
+        pyarrow.Table
+            The rows of the batch.
+        """
+
+        pyarrow = _pyarrow()
+        columns = self.to_columns(strip_table=strip_table)
+        table = pyarrow.table(columns)
+
+        if parse_dates:
+            for name in _date_columns(columns):
+                index = table.schema.get_field_index(name)
+                try:
+                    converted = table.column(index).cast(pyarrow.timestamp("ms"))
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+                    continue
+                table = table.set_column(index, name, converted)
+
+        return table
+
+
+def _raise_for_errors(skeleton: object) -> None:
+    """Raises the first `error` found in the response outside its rows."""
+
+    if isinstance(skeleton, dict):
+        if "error" in skeleton:
+            raise PowerBiError(f"The query failed: {skeleton['error']}")
+        for value in skeleton.values():
+            _raise_for_errors(value)
+    elif isinstance(skeleton, list):
+        for value in skeleton:
+            _raise_for_errors(value)
+
+
+def iter_query_batches(
+    chunks: Iterable[bytes], batch_size: int = 10000, serializer: object = None
+) -> Iterator[QueryBatch]:
+    """Decodes a `DatasetExecuteQueriesResponse` incrementally.
+
+    ### Overview
+    ----
+    The response is read chunk by chunk. The complete row objects of
+    each chunk are cut out of the `rows` arrays in one regular
+    expression pass and decoded in one call to the serializer. Only the
+    current batch and the unread end of the last chunk are held, so
+    memory follows the batch and chunk sizes and not the size of the
+    result. The rest of the document
+    is kept without its rows and checked for errors once it is read.
+
+    ### Parameters
+    ----
+    chunks : Iterable[bytes]
+        The response body, in chunks of any size, for example
+        `response.iter_content(chunk_size=65536)`.
+
+    batch_size : int (optional, Default=10000)
+        The most rows per batch.
+
+    serializer : object (optional, Default=None)
+        Decodes the rows, by default the fastest serializer installed.
+
+    ### Raises
+    ----
+    PowerBiError:
+        If a query result holds an `error`.
+
+    ValueError:
+        If the response is not a well formed query result.
+
+    ### Returns
+    ----
+    Iterator[QueryBatch]
+        The rows of each table, in batches of up to `batch_size` rows.
+
+    ### Usage
+    ----
+        >>> with open("result.json", "rb") as result:
+        >>>     for batch in iter_query_batches(iter(lambda: result.read(65536), b"")):
+        >>>         print(batch.table, len(batch))
+    """
+
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+
+    serializer = serializer or get_serializer()
+    buffer = bytearray()
+    skeleton = []
+    pending = []
+    keys = {}
+    table = -1
+    in_rows = False
+    started = False
+
+    def decode() -> QueryBatch:
+        rows = pending[:batch_size]
+        del pending[:batch_size]
+        for row in rows:
+            if not keys.keys() >= row.keys():
+                keys.update(dict.fromkeys(row))
+        return QueryBatch(table=table, rows=rows, keys=list(keys))
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        position = 0
+
+        # The response may start with a byte order mark, which can be
+        # split across the first chunks.
+        if not started:
+            if len(buffer) < 3:
+                continue
+            buffer[:] = strip_bom(bytes(buffer))
+            started = True
+
+        while True:
+            if in_rows:
+                match = _ROW_RUN.match(buffer, position)
+                if match is not None:
+                    pending.extend(serializer.loads(b"[" + match.group(1) + b"]"))
+                    position = match.end()
+                    while len(pending) >= batch_size:
+                        yield decode()
+                    continue
+
+                match = _ROWS_END.match(buffer, position)
+                if match is None:
+                    break
+                while pending:
+                    yield decode()
+                skeleton.append(b"]")
+                position = match.end()
+                in_rows = False
+
+            else:
+                match = _ROWS_START.search(buffer, position)
+                if match is None:
+                    keep = max(position, len(buffer) - _KEEP)
+                    skeleton.append(bytes(buffer[position:keep]))
+                    position = keep
+                    break
+                skeleton.append(bytes(buffer[position : match.end()]))
+                position = match.end()
+                in_rows = True
+                table += 1
+                keys = {}
+
+        del buffer[:position]
+
+    if in_rows:
+        raise ValueError("The query result ended inside a `rows` array.")
+
+    skeleton.append(bytes(buffer))
+    try:
+        document = serializer.loads(b"".join(skeleton))
+    except ValueError as error:
+        raise ValueError(f"The query result is not valid JSON: {error}") from error
+
+    _raise_for_errors(document)
+
+
+def read_query_result(
+    batches: Iterable[QueryBatch],
+    output: str = "arrow",
+    strip_table: bool = True,
+    parse_dates: bool = True,
+    table: int = 0,
+) -> object:
+    """Collects the batches of one result table into a single object.
+
+    ### Overview
+    ----
+    Each batch is converted as it arrives and its row dictionaries are
+    dropped, so only the columnar form of the result is held in full.
+
+    ### Parameters
+    ----
+    batches : Iterable[QueryBatch]
+        The batches, as returned by `iter_query_batches` or
+        `Datasets.execute_queries_stream`.
+
+    output : str (optional, Default="arrow")
+        One of `arrow` for a pyarrow `Table`, `pandas` for a
+        `DataFrame` or `columns` for a dictionary of lists.
+
+    strip_table : bool (optional, Default=True)
+        Whether to drop the table from the `Table[Column]` keys.
+
+    parse_dates : bool (optional, Default=True)
+        Whether ISO 8601 text columns are converted to timestamps.
+        Ignored for `columns`.
+
+    table : int (optional, Default=0)
+        The result table to collect, batches of other tables are
+        skipped.
+
+    ### Returns
+    ----
+    object
+        The result table in the requested form.
+
+    ### Usage
+    ----
+        >>> datasets_service = power_bi_client.datasets()
+        >>> frame = read_query_result(
+                datasets_service.execute_queries_stream(
+                    dataset_id='cfafbeb1-8037-4d0c-896e-a46fb27ff229',
+                    query='EVALUATE Sales'
+                ),
+                output='pandas'
+            )
+    """
+
+    if output not in ("arrow", "pandas", "columns"):
+        raise ValueError(f"Unknown output {output!r}, use 'arrow', 'pandas' or 'columns'.")
+
+    parts = []
+    columns = {}
+
+    for batch in batches:
+        if batch.table != table:
+            continue
+
+        if output == "columns":
+            names = column_names(batch.keys, strip_table=strip_table)
+            seen = len(next(iter(columns.values()), []))
+            for name in names:
+                columns.setdefault(name, [None] * seen)
+            for name, values in batch.to_columns(strip_table=strip_table).items():
+                columns[name].extend(values)
+            for name in set(columns) - set(names):
+                columns[name].extend([None] * len(batch))
+        else:
+            # Through Arrow, which stores the columns far more compactly
+            # than the row dictionaries.
+            parts.append(batch.to_arrow(strip_table=strip_table, parse_dates=parse_dates))
+
+    if output == "columns":
+        return columns
+
+    pyarrow = _pyarrow()
+    if not parts:
+        result = pyarrow.table({})
+    elif len(parts) == 1:
+        result = parts[0]
+    else:
+        result = _concat_tables(pyarrow, parts)
+
+    if output == "pandas":
+        _pandas()
+        return result.to_pandas()
+
+    return result
+
+
+def _concat_tables(pyarrow: object, parts: List[object]) -> object:
+    """Concatenates batches whose columns or types may differ.
+
+    A column that is blank for a whole batch has the `null` type, and
+    is promoted to the type of the other batches.
+    """
+
+    try:
+        return pyarrow.concat_tables(parts, promote_options="permissive")
+    except TypeError:
+        # pyarrow < 14 only knows the older keyword.
+        return pyarrow.concat_tables(parts, promote=True)
+
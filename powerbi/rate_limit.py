@@ -0,0 +1,496 @@
+"""Client-side rate limiting for the Power BI REST API."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A sliding window quota applied to a family of endpoints.
+
+    ### Parameters
+    ----
+    name : str
+        The endpoint family name, also the window key.
+
+    pattern : str
+        A regular expression matched against the endpoint path,
+        for example `^myorg/admin/groups$`.
+
+    limit : int
+        The number of requests allowed per `period`. Up to `limit`
+        calls may burst, and no window of `period` seconds ever
+        holds more than `limit`.
+
+    period : float (optional, Default=3600.0)
+        The length of the window in seconds.
+
+    methods : FrozenSet[str] (optional, Default=None)
+        The methods the rule applies to. `None` matches all.
+    """
+
+    name: str
+    pattern: str
+    limit: int
+    period: float = 3600.0
+    methods: Optional[FrozenSet[str]] = None
+
+    @property
+    def rate(self) -> float:
+        """The average number of requests allowed per second."""
+
+        return self.limit / self.period
+
+    def matches(self, method: str, endpoint: str) -> bool:
+        """Returns whether the rule applies to a request.
+
+        ### Parameters
+        ----
+        method : str
+            The request method.
+
+        endpoint : str
+            The API URL endpoint, example is 'myorg/admin/groups'.
+
+        ### Returns
+        ----
+        bool
+            `True` if the method and endpoint match the rule.
+        """
+
+        if self.methods is not None and method.upper() not in self.methods:
+            return False
+
+        return re.search(self.pattern, endpoint.split("?")[0].lstrip("/")) is not None
+
+
+# Documented limits for the admin and scanner APIs. The first matching
+# rule wins, so the generic admin rule must stay last.
+DEFAULT_RATE_LIMITS: Tuple[RateLimitRule, ...] = (
+    RateLimitRule(
+        name="admin_workspace_info",
+        pattern=r"^myorg/admin/workspaces/getInfo$",
+        limit=500,
+        methods=frozenset({"POST"}),
+    ),
+    RateLimitRule(
+        name="admin_scan_status",
+        pattern=r"^myorg/admin/workspaces/scanStatus/",
+        limit=10000,
+    ),
+    RateLimitRule(
+        name="admin_scan_result",
+        pattern=r"^myorg/admin/workspaces/scanResult/",
+        limit=500,
+    ),
+    RateLimitRule(
+        name="admin_modified_workspaces",
+        pattern=r"^myorg/admin/workspaces/modified$",
+        limit=30,
+    ),
+    RateLimitRule(
+        name="admin_activity_events",
+        pattern=r"^myorg/admin/activityevents$",
+        limit=200,
+    ),
+    RateLimitRule(
+        name="admin_groups",
+        pattern=r"^myorg/admin/groups$",
+        limit=50,
+        methods=frozenset({"GET"}),
+    ),
+    RateLimitRule(
+        name="admin",
+        pattern=r"^myorg/admin/",
+        limit=200,
+    ),
+)
+
+
+class MemoryBucketStore:
+    """Keeps the calls of each rule's window in memory, shared by
+    every thread in the process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Deque[Tuple[float, float]]] = {}
+
+    def try_acquire(self, rule: RateLimitRule, now: float, cost: float = 1.0) -> float:
+        """Records a call in the rule's window if it has room.
+
+        ### Parameters
+        ----
+        rule : RateLimitRule
+            The rule whose window is used.
+
+        now : float
+            The current `time.time()`.
+
+        cost : float (optional, Default=1.0)
+            The amount of quota the call uses, for example the number
+            of rows in a batch.
+
+        ### Returns
+        ----
+        float
+            `0.0` if the call was recorded, else the number of seconds
+            until the window has room for it.
+        """
+
+        cost = min(cost, float(rule.limit))
+
+        with self._lock:
+            window = self._windows.setdefault(rule.name, deque())
+            while window and window[0][0] <= now - rule.period:
+                window.popleft()
+
+            wait = _window_wait(
+                rule=rule,
+                used=sum(spent for _, spent in window),
+                calls=lambda: window,
+                now=now,
+                cost=cost,
+            )
+            if wait == 0.0:
+                window.append((now, cost))
+
+        return wait
+
+
+class SQLiteBucketStore:
+    """Keeps the calls of each rule's window in a SQLite database,
+    shared by every process on the machine that points at the same
+    file."""
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Initializes the `SQLiteBucketStore` object.
+
+        ### Parameters
+        ----
+        path : str
+            The path to the SQLite database file.
+
+        timeout : float (optional, Default=30.0)
+            Seconds to wait for another process to release the
+            database lock.
+        """
+
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_calls ("
+                "name TEXT NOT NULL, at REAL NOT NULL, cost REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS rate_limit_calls_name_at "
+                "ON rate_limit_calls (name, at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def try_acquire(self, rule: RateLimitRule, now: float, cost: float = 1.0) -> float:
+        """Records a call in the rule's window if it has room.
+
+        ### Parameters
+        ----
+        rule : RateLimitRule
+            The rule whose window is used.
+
+        now : float
+            The current `time.time()`.
+
+        cost : float (optional, Default=1.0)
+            The amount of quota the call uses, for example the number
+            of rows in a batch.
+
+        ### Returns
+        ----
+        float
+            `0.0` if the call was recorded, else the number of seconds
+            until the window has room for it.
+        """
+
+        cost = min(cost, float(rule.limit))
+        connection = self._connection()
+
+        # BEGIN IMMEDIATE takes the write lock up front, so the
+        # read-modify-write below is atomic across processes.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM rate_limit_calls WHERE name = ? AND at <= ?",
+                (rule.name, now - rule.period),
+            )
+            (used,) = connection.execute(
+                "SELECT COALESCE(SUM(cost), 0) FROM rate_limit_calls WHERE name = ?",
+                (rule.name,),
+            ).fetchone()
+            wait = _window_wait(
+                rule=rule,
+                used=used,
+                calls=lambda: connection.execute(
+                    "SELECT at, cost FROM rate_limit_calls WHERE name = ? ORDER BY at",
+                    (rule.name,),
+                ),
+                now=now,
+                cost=cost,
+            )
+            if wait == 0.0:
+                connection.execute(
+                    "INSERT INTO rate_limit_calls (name, at, cost) VALUES (?, ?, ?)",
+                    (rule.name, now, cost),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return wait
+
+    def close(self) -> None:
+        """Close the current thread's database connection."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _window_wait(
+    rule: RateLimitRule,
+    used: float,
+    calls: Callable[[], Iterable[Tuple[float, float]]],
+    now: float,
+    cost: float,
+) -> float:
+    """Returns how long a call must wait for room in a sliding window.
+
+    ### Parameters
+    ----
+    used : float
+        The quota used by the calls still in the window.
+
+    calls : Callable[[], Iterable[Tuple[float, float]]]
+        Returns the `(time, cost)` of those calls, oldest first. Only
+        called when the window is full.
+
+    ### Returns
+    ----
+    float
+        `0.0` if the call fits, else the seconds until enough of the
+        oldest calls leave the window.
+    """
+
+    excess = used + cost - rule.limit
+    if excess <= 0:
+        return 0.0
+
+    for at, spent in calls():
+        excess -= spent
+        if excess <= 0:
+            return max(at + rule.period - now, 0.0)
+
+    return rule.period
+
+
+class RateLimiter:
+    """Paces requests with per-endpoint-family sliding windows, so
+    quotas are respected before the API starts returning `429`."""
+
+    def __init__(
+        self,
+        rules: Iterable[RateLimitRule] = DEFAULT_RATE_LIMITS,
+        store: object = None,
+    ) -> None:
+        """Initializes the `RateLimiter` object.
+
+        ### Parameters
+        ----
+        rules : Iterable[RateLimitRule] (optional, Default=DEFAULT_RATE_LIMITS)
+            The rules checked in order, the first match is used.
+            Requests that match no rule are not limited.
+
+        store : object (optional, Default=None)
+            Where windows are kept. Defaults to a `MemoryBucketStore`;
+            use a `SQLiteBucketStore` to share quotas across processes.
+
+        ### Usage
+        ----
+            >>> power_bi_client = PowerBiClient(
+                    ...,
+                    rate_limiter=RateLimiter(
+                        store=SQLiteBucketStore("config/rate_limits.db")
+                    )
+                )
+        """
+
+        self.rules = tuple(rules)
+        self.store = store or MemoryBucketStore()
+
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def with_overrides(self, *rules: RateLimitRule) -> "RateLimiter":
+        """Returns a limiter where rules with the same name are replaced
+        and new rules are checked first.
+
+        ### Parameters
+        ----
+        *rules : RateLimitRule
+            The rules to add or replace.
+
+        ### Returns
+        ----
+        RateLimiter
+            A new limiter sharing this limiter's store.
+
+        ### Usage
+        ----
+            >>> limiter = RateLimiter().with_overrides(
+                    RateLimitRule("admin_groups", r"^myorg/admin/groups$", limit=25)
+                )
+        """
+
+        names = {rule.name for rule in rules}
+        kept = tuple(rule for rule in self.rules if rule.name not in names)
+
+        return RateLimiter(rules=tuple(rules) + kept, store=self.store)
+
+    def rule_for(self, method: str, endpoint: str) -> Optional[RateLimitRule]:
+        """Returns the first rule matching a request, if any."""
+
+        for rule in self.rules:
+            if rule.matches(method=method, endpoint=endpoint):
+                return rule
+
+        return None
+
+    def try_acquire(self, method: str, endpoint: str) -> Tuple[Optional[RateLimitRule], float]:
+        """Attempts to reserve a request without waiting.
+
+        ### Returns
+        ----
+        Tuple[Optional[RateLimitRule], float]
+            The matching rule and the seconds to wait before trying
+            again, `0.0` when the request may proceed.
+        """
+
+        rule = self.rule_for(method=method, endpoint=endpoint)
+        if rule is None:
+            return None, 0.0
+
+        return rule, self.store.try_acquire(rule=rule, now=time.time())
+
+    def acquire(self, method: str, endpoint: str) -> float:
+        """Blocks until a request may be sent.
+
+        ### Parameters
+        ----
+        method : str
+            The request method.
+
+        endpoint : str
+            The API URL endpoint.
+
+        ### Returns
+        ----
+        float
+            The number of seconds spent waiting.
+        """
+
+        waited = 0.0
+
+        while True:
+            rule, wait = self.try_acquire(method=method, endpoint=endpoint)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        if rule is not None:
+            self.record(rule=rule, waited=waited)
+
+        return waited
+
+    async def acquire_async(self, method: str, endpoint: str) -> float:
+        """Waits without blocking the event loop until a request may be sent.
+
+        ### Parameters
+        ----
+        method : str
+            The request method.
+
+        endpoint : str
+            The API URL endpoint.
+
+        ### Returns
+        ----
+        float
+            The number of seconds spent waiting.
+        """
+
+        # Imported here so sync-only programs never load asyncio.
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        waited = 0.0
+
+        while True:
+            rule, wait = self.try_acquire(method=method, endpoint=endpoint)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+
+        if rule is not None:
+            self.record(rule=rule, waited=waited)
+
+        return waited
+
+    def record(self, rule: RateLimitRule, waited: float) -> None:
+        """Records a granted request and the time it waited."""
+
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                rule.name, {"requests": 0, "delayed": 0, "waited_seconds": 0.0}
+            )
+            stats["requests"] += 1
+            if waited > 0:
+                stats["delayed"] += 1
+                stats["waited_seconds"] += waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns per-family counters of requests and waits.
+
+        ### Returns
+        ----
+        Dict[str, Dict[str, float]]
+            For every family, the `requests` granted, how many were
+            `delayed` and the total `waited_seconds`.
+        """
+
+        with self._stats_lock:
+            return {name: dict(values) for name, values in self._stats.items()}
@@ -0,0 +1,636 @@
+"""Refreshes dataflows and the datasets that read them in dependency order."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from powerbi.dataflows import Dataflows
+from powerbi.datasets import Datasets
+from powerbi.refresh_orchestrator import RefreshOrchestrator
+from powerbi.refresh_orchestrator import RefreshReport
+from powerbi.refresh_orchestrator import RefreshResult
+from powerbi.refresh_orchestrator import RefreshTarget
+from powerbi.refresh_orchestrator import _is_transient
+from powerbi.refresh_orchestrator import _parse_time
+
+logger = logging.getLogger(__name__)
+
+DATAFLOW = "dataflow"
+DATASET = "dataset"
+
+# Statuses of a dataflow transaction that has not finished.
+DATAFLOW_IN_PROGRESS_STATUSES = frozenset({"NotStarted", "InProgress", "Unknown", None})
+
+
+@dataclass(frozen=True, order=True)
+class RefreshNode:
+    """A dataflow or dataset in a refresh graph.
+
+    ### Parameters
+    ----
+    kind : str
+        `dataflow` or `dataset`.
+
+    group_id : str
+        The workspace ID.
+
+    object_id : str
+        The dataflow or dataset ID.
+    """
+
+    kind: str
+    group_id: str
+    object_id: str
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id}"
+
+
+@dataclass
+class NodeResult:
+    """The outcome of refreshing one node of a `RefreshGraph`.
+
+    ### Parameters
+    ----
+    status : str
+        `Completed`, `Failed`, `Cancelled`, `TimedOut`, or `Skipped`
+        when an upstream refresh did not complete.
+
+    level : int
+        The depth of the node in the graph, `0` for nodes without
+        inputs.
+    """
+
+    kind: str
+    group_id: str
+    object_id: str
+    level: int
+    status: str = "NotStarted"
+    request_id: Optional[str] = None
+    attempts: int = 0
+    start_time: Optional[datetime.datetime] = None
+    end_time: Optional[datetime.datetime] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the refresh completed."""
+
+        return self.status == "Completed"
+
+    def to_dict(self) -> Dict:
+        """Returns the result as a dictionary."""
+
+        return asdict(self)
+
+
+class RefreshGraph:
+    """The dependencies between dataflows and datasets.
+
+    ### Overview
+    ----
+    An edge from an upstream node to a downstream node means the
+    downstream node reads from the upstream one, so it is refreshed
+    after it. Nodes keep the order they were added in.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty `RefreshGraph` object.
+
+        ### Usage
+        ----
+            >>> graph = RefreshGraph()
+            >>> staging = RefreshNode("dataflow", group_id, staging_dataflow_id)
+            >>> sales = RefreshNode("dataset", group_id, sales_dataset_id)
+            >>> graph.add_edge(upstream=staging, downstream=sales)
+        """
+
+        self._upstream: Dict[RefreshNode, Dict[RefreshNode, None]] = {}
+        self._downstream: Dict[RefreshNode, Dict[RefreshNode, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._upstream)
+
+    def __contains__(self, node: RefreshNode) -> bool:
+        return node in self._upstream
+
+    @property
+    def nodes(self) -> List[RefreshNode]:
+        """Every node, in the order they were added."""
+
+        return list(self._upstream)
+
+    def add_node(self, node: RefreshNode) -> RefreshNode:
+        """Adds a node, if it is not part of the graph yet."""
+
+        if node not in self._upstream:
+            self._upstream[node] = {}
+            self._downstream[node] = {}
+
+        return node
+
+    def add_edge(self, upstream: RefreshNode, downstream: RefreshNode) -> None:
+        """Adds both nodes and makes `downstream` wait for `upstream`."""
+
+        self.add_node(upstream)
+        self.add_node(downstream)
+        self._upstream[downstream][upstream] = None
+        self._downstream[upstream][downstream] = None
+
+    def upstream(self, node: RefreshNode) -> List[RefreshNode]:
+        """The nodes `node` reads from."""
+
+        return list(self._upstream[node])
+
+    def downstream(self, node: RefreshNode) -> List[RefreshNode]:
+        """The nodes that read from `node`."""
+
+        return list(self._downstream[node])
+
+    def descendants(self, node: RefreshNode) -> List[RefreshNode]:
+        """Every node that depends on `node`, directly or not."""
+
+        seen: Dict[RefreshNode, None] = {}
+        stack = self.downstream(node)
+
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen[current] = None
+                stack.extend(self._downstream[current])
+
+        return list(seen)
+
+    def levels(self) -> List[List[RefreshNode]]:
+        """Groups the nodes by depth, in topological order.
+
+        ### Returns
+        ----
+        List[List[RefreshNode]]
+            The nodes without inputs first, then the nodes whose
+            inputs are all in earlier levels, and so on.
+
+        ### Raises
+        ----
+        ValueError:
+            If the graph has a cycle.
+        """
+
+        remaining = {node: len(upstream) for node, upstream in self._upstream.items()}
+        level = [node for node, count in remaining.items() if count == 0]
+        levels = []
+
+        while level:
+            levels.append(level)
+            next_level = []
+            for node in level:
+                for downstream in self._downstream[node]:
+                    remaining[downstream] -= 1
+                    if remaining[downstream] == 0:
+                        next_level.append(downstream)
+            level = next_level
+
+        if sum(map(len, levels)) != len(self._upstream):
+            cycle = sorted(str(node) for node, count in remaining.items() if count > 0)
+            raise ValueError(f"The refresh graph has a cycle between {cycle}.")
+
+        return levels
+
+    def to_dict(self) -> Dict:
+        """Returns the nodes and edges as a dictionary."""
+
+        return {
+            "nodes": [asdict(node) for node in self._upstream],
+            "edges": [
+                {"upstream": asdict(upstream), "downstream": asdict(downstream)}
+                for downstream, upstreams in self._upstream.items()
+                for upstream in upstreams
+            ],
+        }
+
+
+class RefreshScheduler:
+    """Refreshes a graph of dataflows and datasets as soon as inputs are ready.
+
+    ### Overview
+    ----
+    `discover` builds a `RefreshGraph` from the dataflows of one or
+    more workspaces, their upstream dataflows and the datasets that
+    read them. `run` refreshes the graph in topological order, up to
+    `max_parallel` refreshes at a time: a node starts the moment the
+    last of its inputs completes, without waiting for the rest of its
+    level. When a refresh fails, every node downstream of it is
+    skipped.
+
+    Dataset refreshes are submitted and followed like in the
+    `RefreshOrchestrator`. Dataflow refreshes are followed through
+    their transactions.
+    """
+
+    def __init__(
+        self,
+        datasets: Datasets,
+        dataflows: Dataflows,
+        max_parallel: int = 8,
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 120.0,
+        refresh_timeout: float = 4 * 60 * 60,
+        max_retries: int = 3,
+        backoff_factor: float = 5.0,
+        dataset_refresh_options: Dict = None,
+        notify_option: str = "NoNotification",
+        max_workers: int = 8,
+    ) -> None:
+        """Initializes the `RefreshScheduler` object.
+
+        ### Parameters
+        ----
+        datasets : Datasets
+            The `Datasets` service.
+
+        dataflows : Dataflows
+            The `Dataflows` service.
+
+        max_parallel : int (optional, Default=8)
+            Refreshes running at the same time.
+
+        poll_interval : float (optional, Default=10.0)
+            Seconds before the first status check of a refresh.
+
+        max_poll_interval : float (optional, Default=120.0)
+            The longest wait between status checks, in seconds.
+
+        refresh_timeout : float (optional, Default=14400)
+            Seconds after which a running refresh is reported as
+            `TimedOut`, which skips its downstream nodes.
+
+        max_retries : int (optional, Default=3)
+            Resubmissions of a refresh rejected with a transient error.
+
+        backoff_factor : float (optional, Default=5.0)
+            The base delay between resubmissions, doubled on every
+            attempt.
+
+        dataset_refresh_options : Dict (optional, Default={"refresh_type": "Full"})
+            Arguments passed to `Datasets.refresh_dataset`.
+
+        notify_option : str (optional, Default="NoNotification")
+            The mail notification option of dataflow refreshes.
+
+        max_workers : int (optional, Default=8)
+            Lineage requests sent at the same time by `discover`.
+
+        ### Usage
+        ----
+            >>> scheduler = RefreshScheduler(
+                    datasets=power_bi_client.datasets(),
+                    dataflows=power_bi_client.dataflows(),
+                    max_parallel=6
+                )
+            >>> graph = scheduler.discover(group_ids=[staging_workspace_id, sales_workspace_id])
+            >>> report = scheduler.run(graph=graph)
+            >>> report.summary()
+            {'Completed': 14}
+        """
+
+        self.datasets = datasets
+        self.dataflows = dataflows
+        self.max_parallel = max_parallel
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.refresh_timeout = refresh_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.notify_option = notify_option
+        self.max_workers = max_workers
+
+        self._orchestrator = RefreshOrchestrator(
+            datasets=datasets,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            refresh_timeout=refresh_timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            refresh_options=dataset_refresh_options,
+        )
+
+    def discover(self, group_ids: Iterable[str]) -> RefreshGraph:
+        """Builds the refresh graph of one or more workspaces.
+
+        ### Parameters
+        ----
+        group_ids : Iterable[str]
+            The workspace IDs. Every dataflow in them is part of the
+            graph, along with the datasets that read from a dataflow.
+            Upstream dataflows in other workspaces are left out, so
+            they are not refreshed.
+
+        ### Returns
+        ----
+        RefreshGraph
+            The dataflows and datasets, and the edges between them.
+        """
+
+        group_ids = list(group_ids)
+        graph = RefreshGraph()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            dataflow_pages = executor.map(self.dataflows.get_dataflows, group_ids)
+            dataflows = [
+                RefreshNode(DATAFLOW, group_id, dataflow["objectId"])
+                for group_id, page in zip(group_ids, dataflow_pages)
+                for dataflow in page.get("value", [])
+            ]
+            for node in dataflows:
+                graph.add_node(node)
+
+            upstream_pages = executor.map(
+                lambda node: self.dataflows.get_upstream_dataflows_in_group(
+                    group_id=node.group_id, dataflow_id=node.object_id
+                ),
+                dataflows,
+            )
+            link_pages = executor.map(
+                self.datasets.get_dataset_to_dataflows_links_in_group, group_ids
+            )
+
+            for node, page in zip(dataflows, upstream_pages):
+                for upstream in page.get("value", []):
+                    upstream_node = RefreshNode(
+                        DATAFLOW,
+                        upstream.get("groupId") or node.group_id,
+                        upstream["targetDataflowId"],
+                    )
+                    if upstream_node in graph:
+                        graph.add_edge(upstream=upstream_node, downstream=node)
+                    else:
+                        logger.debug("%s reads %s from another workspace.", node, upstream_node)
+
+            for group_id, page in zip(group_ids, link_pages):
+                for link in page.get("value", []):
+                    dataflow = RefreshNode(
+                        DATAFLOW,
+                        link.get("workspaceObjectId") or group_id,
+                        link["dataflowObjectId"],
+                    )
+                    dataset = RefreshNode(DATASET, group_id, link["datasetObjectId"])
+                    if dataflow in graph:
+                        graph.add_edge(upstream=dataflow, downstream=dataset)
+                    else:
+                        graph.add_node(dataset)
+
+        logger.info(
+            "Discovered %d dataflows and %d datasets in %d workspaces.",
+            len(dataflows),
+            len(graph) - len(dataflows),
+            len(group_ids),
+        )
+
+        return graph
+
+    def run(self, graph: RefreshGraph) -> RefreshReport:
+        """Refreshes every node of a graph after its inputs.
+
+        ### Parameters
+        ----
+        graph : RefreshGraph
+            The graph, usually from `discover`.
+
+        ### Returns
+        ----
+        RefreshReport
+            One `NodeResult` per node, in topological order.
+
+        ### Raises
+        ----
+        ValueError:
+            If the graph has a cycle.
+        """
+
+        started = time.monotonic()
+        levels = graph.levels()
+
+        results = {
+            node: NodeResult(
+                kind=node.kind, group_id=node.group_id, object_id=node.object_id, level=depth
+            )
+            for depth, level in enumerate(levels)
+            for node in level
+        }
+        waiting = {node: set(graph.upstream(node)) for node in results}
+        ready = deque(levels[0] if levels else [])
+        retry_at: Dict[RefreshNode, float] = {}
+        polls: Dict[RefreshNode, Dict] = {}
+
+        def finish(node: RefreshNode) -> None:
+            if results[node].succeeded:
+                for downstream in graph.downstream(node):
+                    waiting[downstream].discard(node)
+                    if not waiting[downstream]:
+                        ready.append(downstream)
+                return
+
+            for descendant in graph.descendants(node):
+                if results[descendant].status == "NotStarted":
+                    results[descendant].status = "Skipped"
+                    results[descendant].error = f"Upstream {node} did not complete."
+
+        def start(node: RefreshNode) -> None:
+            poll = self._start(node, results[node])
+            if poll is not None:
+                polls[node] = poll
+            elif results[node].status == "NotStarted":
+                retry_at[node] = time.monotonic() + self.backoff_factor * 2 ** (
+                    results[node].attempts - 1
+                )
+            else:
+                finish(node)
+
+        while ready or retry_at or polls:
+            while ready and len(polls) < self.max_parallel:
+                start(ready.popleft())
+
+            events = [(poll["next_poll"], 0, node) for node, poll in polls.items()]
+            if len(polls) < self.max_parallel:
+                events += [(when, 1, node) for node, when in retry_at.items()]
+            if not events:
+                break
+
+            when, kind, node = min(events)
+
+            delay = when - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            if kind == 1:
+                del retry_at[node]
+                start(node)
+                continue
+
+            if self._poll(node, results[node], polls[node]):
+                del polls[node]
+                finish(node)
+
+        report = RefreshReport(
+            results=[results[node] for level in levels for node in level],
+            elapsed=time.monotonic() - started,
+        )
+
+        logger.info("Refreshed a graph of %d nodes: %s.", len(graph), report.summary())
+
+        return report
+
+    def _start(self, node: RefreshNode, result: NodeResult) -> Optional[Dict]:
+        """Submits the refresh of a node.
+
+        ### Returns
+        ----
+        Optional[Dict]
+            The polling state of the refresh, or `None` if it was not
+            accepted. On a transient error the status stays
+            `NotStarted` and the refresh is retried.
+        """
+
+        if node.kind == DATASET:
+            # pylint: disable=protected-access
+            target = RefreshTarget(group_id=node.group_id, dataset_id=node.object_id)
+            refresh = RefreshResult(
+                group_id=node.group_id,
+                dataset_id=node.object_id,
+                capacity_id="",
+                attempts=result.attempts,
+            )
+            accepted = self._orchestrator._submit(target=target, result=refresh)
+            result.attempts = refresh.attempts
+            result.status = refresh.status
+            result.error = refresh.error
+            if not accepted:
+                return None
+
+            result.request_id = refresh.request_id
+            result.start_time = refresh.start_time
+            poll = self._orchestrator._poll_state(refresh)
+            poll.update(target=target, refresh=refresh)
+            return poll
+
+        result.attempts += 1
+
+        try:
+            known = {
+                transaction.get("id")
+                for transaction in self.dataflows.get_dataflow_transactions(
+                    group_id=node.group_id, dataflow_id=node.object_id
+                ).get("value", [])
+            }
+            self.dataflows.refresh_dataflow(
+                group_id=node.group_id,
+                dataflow_id=node.object_id,
+                notify_option=self.notify_option,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            if _is_transient(error) and result.attempts <= self.max_retries:
+                logger.warning("Refresh of %s was rejected (%s), retrying.", node, error)
+                return None
+
+            logger.error("Refresh of %s failed to start: %s", node, error)
+            result.status = "Failed"
+            result.error = str(error)
+            return None
+
+        result.status = "InProgress"
+        result.start_time = datetime.datetime.now(tz=datetime.timezone.utc)
+        now = time.monotonic()
+
+        return {
+            "next_poll": now + self.poll_interval,
+            "interval": self.poll_interval,
+            "submitted": now,
+            "known": known,
+        }
+
+    def _poll(self, node: RefreshNode, result: NodeResult, poll: Dict) -> bool:
+        """Checks on a running refresh.
+
+        ### Returns
+        ----
+        bool
+            `True` once the refresh has finished.
+        """
+
+        if node.kind == DATASET:
+            refresh = poll["refresh"]
+            # pylint: disable=protected-access
+            if not self._orchestrator._poll(target=poll["target"], result=refresh, poll=poll):
+                return False
+
+            result.status = refresh.status
+            result.request_id = refresh.request_id
+            result.start_time = refresh.start_time
+            result.end_time = refresh.end_time
+            result.duration = refresh.duration
+            result.error = refresh.error
+            return True
+
+        transaction = None
+        try:
+            transactions = self.dataflows.get_dataflow_transactions(
+                group_id=node.group_id, dataflow_id=node.object_id
+            ).get("value", [])
+            started = [
+                transaction
+                for transaction in transactions
+                if transaction.get("id") not in poll["known"]
+            ]
+            if started:
+                transaction = max(started, key=lambda item: item.get("startTime") or "")
+        except Exception as error:  # pylint: disable=broad-except
+            if not _is_transient(error):
+                result.status = "Failed"
+                result.error = str(error)
+                return True
+
+        status = (transaction or {}).get("status")
+
+        if status in DATAFLOW_IN_PROGRESS_STATUSES:
+            if time.monotonic() - poll["submitted"] > self.refresh_timeout:
+                logger.error("Refresh of %s still running after %s seconds.", node, self.refresh_timeout)
+                result.status = "TimedOut"
+                result.error = f"Still running after {self.refresh_timeout} seconds."
+                result.duration = time.monotonic() - poll["submitted"]
+                return True
+
+            poll["interval"] = min(poll["interval"] * 1.5, self.max_poll_interval)
+            poll["next_poll"] = time.monotonic() + poll["interval"]
+            return False
+
+        result.status = "Completed" if status in ("Success", "Completed") else status
+        result.request_id = transaction.get("id")
+        result.start_time = _parse_time(transaction.get("startTime")) or result.start_time
+        result.end_time = _parse_time(transaction.get("endTime")) or datetime.datetime.now(
+            tz=datetime.timezone.utc
+        )
+
+        if result.start_time is not None and (result.start_time.tzinfo is None) == (
+            result.end_time.tzinfo is None
+        ):
+            result.duration = (result.end_time - result.start_time).total_seconds()
+        else:
+            result.duration = time.monotonic() - poll["submitted"]
+
+        if not result.succeeded:
+            result.error = f"Dataflow transaction ended with status {status}."
+            logger.error("Refresh of %s ended with status %s.", node, status)
+
+        return True
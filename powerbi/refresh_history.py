@@ -0,0 +1,671 @@
+"""Harvests dataset refresh history into a local SQLite store for SLA analysis."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from powerbi.datasets import Datasets
+from powerbi.groups import Groups
+from powerbi.rate_limit import RateLimiter
+from powerbi.rate_limit import RateLimitRule
+from powerbi.refresh_orchestrator import _parse_time
+
+logger = logging.getLogger(__name__)
+
+# The columns of a harvested refresh, in storage order.
+HISTORY_COLUMNS = (
+    "group_id",
+    "dataset_id",
+    "request_id",
+    "refresh_type",
+    "status",
+    "start_time",
+    "end_time",
+    "duration",
+    "attempts",
+    "error",
+    "harvested_at",
+)
+
+# The columns results can be grouped by.
+GROUP_BY_COLUMNS = frozenset({"group_id", "dataset_id", "refresh_type"})
+
+# The refresh history reports a running refresh as `Unknown`.
+_IN_PROGRESS = "Unknown"
+
+
+def _iso(value: Optional[str]) -> Optional[str]:
+    """Normalizes a service timestamp to UTC ISO 8601, so it sorts as text."""
+
+    parsed = _parse_time(value)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+
+    return parsed.astimezone(datetime.timezone.utc).isoformat()
+
+
+def normalize_refresh(
+    entry: Dict, group_id: Optional[str], dataset_id: str, harvested_at: str
+) -> Dict:
+    """Flattens a refresh history entry into a row.
+
+    ### Parameters
+    ----
+    entry : Dict
+        A `Refresh` resource from `get_refresh_history`.
+
+    group_id : str
+        The workspace ID, `None` for "My Workspace".
+
+    dataset_id : str
+        The dataset ID.
+
+    harvested_at : str
+        The time of the harvest, in ISO 8601.
+
+    ### Returns
+    ----
+    Dict
+        The row, keyed by the names in `HISTORY_COLUMNS`. `duration`
+        is in seconds, and `None` while the refresh runs.
+    """
+
+    start_time = _iso(entry.get("startTime"))
+    end_time = _iso(entry.get("endTime"))
+
+    duration = None
+    if start_time and end_time:
+        duration = (
+            datetime.datetime.fromisoformat(end_time) - datetime.datetime.fromisoformat(start_time)
+        ).total_seconds()
+
+    return {
+        "group_id": group_id,
+        "dataset_id": dataset_id,
+        "request_id": entry.get("requestId") or str(entry.get("id")),
+        "refresh_type": entry.get("refreshType"),
+        "status": entry.get("status"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": duration,
+        "attempts": len(entry.get("refreshAttempts") or []) or None,
+        "error": entry.get("serviceExceptionJson"),
+        "harvested_at": harvested_at,
+    }
+
+
+def _percentile(values: Sequence[float], percentile: float) -> Optional[float]:
+    """Linear interpolation between the closest ranks of sorted values."""
+
+    if not values:
+        return None
+
+    position = (len(values) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class SQLiteRefreshHistoryStore:
+    """Keeps harvested refreshes and a watermark per dataset in SQLite,
+    and answers duration and failure queries over them."""
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Initializes the `SQLiteRefreshHistoryStore` object.
+
+        ### Parameters
+        ----
+        path : str
+            The path to the SQLite database file.
+
+        timeout : float (optional, Default=30.0)
+            Seconds to wait for another process to release the
+            database lock.
+        """
+
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_history ("
+                "group_id TEXT, dataset_id TEXT NOT NULL, request_id TEXT NOT NULL, "
+                "refresh_type TEXT, status TEXT, start_time TEXT, end_time TEXT, "
+                "duration REAL, attempts INTEGER, error TEXT, harvested_at TEXT NOT NULL, "
+                "PRIMARY KEY (dataset_id, request_id))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS refresh_history_start_time "
+                "ON refresh_history (start_time)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_watermarks ("
+                "dataset_id TEXT PRIMARY KEY, watermark TEXT NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def get_watermark(self, dataset_id: str) -> Optional[str]:
+        """Returns the start time from which a dataset's history is fetched again."""
+
+        row = (
+            self._connection()
+            .execute(
+                "SELECT watermark FROM refresh_watermarks WHERE dataset_id = ?", (dataset_id,)
+            )
+            .fetchone()
+        )
+
+        return row[0] if row else None
+
+    def upsert(self, rows: Iterable[Dict], watermarks: Dict[str, str] = None) -> None:
+        """Adds or replaces refreshes and moves watermarks in one transaction.
+
+        ### Parameters
+        ----
+        rows : Iterable[Dict]
+            Rows from `normalize_refresh`, keyed by dataset and
+            request ID.
+
+        watermarks : Dict[str, str] (optional, Default=None)
+            The new watermark of each dataset.
+        """
+
+        placeholders = ", ".join("?" for _ in HISTORY_COLUMNS)
+
+        with self._connection() as connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO refresh_history ({', '.join(HISTORY_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                (tuple(row[column] for column in HISTORY_COLUMNS) for row in rows),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO refresh_watermarks (dataset_id, watermark) VALUES (?, ?)",
+                (watermarks or {}).items(),
+            )
+
+    def rows(self, since: str = None, dataset_id: str = None) -> List[Dict]:
+        """Returns the stored refreshes, oldest first.
+
+        ### Parameters
+        ----
+        since : str (optional, Default=None)
+            Only refreshes started at or after this ISO 8601 time.
+
+        dataset_id : str (optional, Default=None)
+            Only the refreshes of this dataset.
+        """
+
+        where, params = self._filter(since=since, dataset_id=dataset_id)
+        cursor = self._connection().execute(
+            f"SELECT {', '.join(HISTORY_COLUMNS)} FROM refresh_history{where} "
+            "ORDER BY start_time, dataset_id",
+            params,
+        )
+
+        return [dict(zip(HISTORY_COLUMNS, row)) for row in cursor]
+
+    @staticmethod
+    def _filter(since: str = None, dataset_id: str = None, extra: str = None) -> Tuple[str, list]:
+        clauses, params = [], []
+
+        if since is not None:
+            clauses.append("start_time >= ?")
+            params.append(_iso(since) or since)
+        if dataset_id is not None:
+            clauses.append("dataset_id = ?")
+            params.append(dataset_id)
+        if extra:
+            clauses.append(extra)
+
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def _group_column(by: Optional[str]) -> str:
+        if by is None:
+            return "NULL"
+        if by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Cannot group by '{by}', expected one of {sorted(GROUP_BY_COLUMNS)}.")
+        return by
+
+    def duration_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 90, 95, 99),
+        by: Optional[str] = "dataset_id",
+        since: str = None,
+        status: str = "Completed",
+    ) -> List[Dict]:
+        """Computes refresh duration percentiles.
+
+        ### Parameters
+        ----
+        percentiles : Sequence[float] (optional, Default=(50, 90, 95, 99))
+            The percentiles, between 0 and 100.
+
+        by : str (optional, Default="dataset_id")
+            `dataset_id`, `group_id`, `refresh_type`, or `None` for a
+            single row over every refresh.
+
+        since : str (optional, Default=None)
+            Only refreshes started at or after this ISO 8601 time.
+
+        status : str (optional, Default="Completed")
+            Only refreshes that ended with this status. `None` keeps
+            every finished refresh.
+
+        ### Returns
+        ----
+        List[Dict]
+            One row per group with `count` and a `p<percentile>`
+            duration in seconds for each percentile.
+
+        ### Usage
+        ----
+            >>> store.duration_percentiles(percentiles=(50, 95), by="dataset_id")
+            [{'dataset_id': 'cfafbeb1-...', 'count': 31, 'p50': 412.5, 'p95': 1280.0}]
+        """
+
+        column = self._group_column(by)
+        where, params = self._filter(since=since, extra="duration IS NOT NULL")
+        if status is not None:
+            where += " AND status = ?"
+            params.append(status)
+
+        cursor = self._connection().execute(
+            f"SELECT {column}, duration FROM refresh_history{where} ORDER BY {column}, duration",
+            params,
+        )
+
+        groups: Dict[Optional[str], List[float]] = {}
+        for key, duration in cursor:
+            groups.setdefault(key, []).append(duration)
+
+        results = []
+        for key, durations in groups.items():
+            result = {by: key} if by is not None else {}
+            result["count"] = len(durations)
+            for percentile in percentiles:
+                result[f"p{percentile:g}"] = _percentile(durations, percentile)
+            results.append(result)
+
+        return results
+
+    def failure_rates(self, by: Optional[str] = "dataset_id", since: str = None) -> List[Dict]:
+        """Computes the share of finished refreshes that failed.
+
+        ### Parameters
+        ----
+        by : str (optional, Default="dataset_id")
+            `dataset_id`, `group_id`, `refresh_type`, or `None` for a
+            single row over every refresh.
+
+        since : str (optional, Default=None)
+            Only refreshes started at or after this ISO 8601 time.
+
+        ### Returns
+        ----
+        List[Dict]
+            One row per group with `refreshes`, `failed` and
+            `failure_rate`, highest failure rate first. Refreshes
+            still running are left out.
+        """
+
+        column = self._group_column(by)
+        where, params = self._filter(since=since, extra="status IS NOT NULL AND status != ?")
+        params.append(_IN_PROGRESS)
+
+        cursor = self._connection().execute(
+            f"SELECT {column}, COUNT(*), SUM(status = 'Failed') FROM refresh_history{where} "
+            f"GROUP BY {column} ORDER BY 1.0 * SUM(status = 'Failed') / COUNT(*) DESC, {column}",
+            params,
+        )
+
+        results = []
+        for key, refreshes, failed in cursor:
+            result = {by: key} if by is not None else {}
+            result.update(refreshes=refreshes, failed=failed, failure_rate=failed / refreshes)
+            results.append(result)
+
+        return results
+
+    def export_parquet(self, path: str, since: str = None) -> int:
+        """Writes the stored refreshes to a Parquet file.
+
+        ### Parameters
+        ----
+        path : str
+            The Parquet file to write.
+
+        since : str (optional, Default=None)
+            Only refreshes started at or after this ISO 8601 time.
+
+        ### Returns
+        ----
+        int
+            The number of rows written.
+
+        ### Raises
+        ----
+        ImportError:
+            If pyarrow is not installed.
+        """
+
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "`export_parquet` requires pyarrow, install it with "
+                "`pip install python-power-bi[dataframes]`."
+            ) from error
+
+        rows = self.rows(since=since)
+        table = pyarrow.table(
+            {column: [row[column] for row in rows] for column in HISTORY_COLUMNS}
+        )
+        pyarrow.parquet.write_table(table, path)
+
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM refresh_history").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the current thread's database connection."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+@dataclass
+class HarvestReport:
+    """The outcome of a `RefreshHistoryHarvester.harvest`.
+
+    ### Parameters
+    ----
+    datasets : int
+        The datasets whose history was read.
+
+    rows : int
+        The refreshes added or updated in the store.
+
+    requests : int
+        The refresh history requests sent.
+
+    failed : Dict[str, str]
+        The error of each dataset whose history could not be read.
+    """
+
+    datasets: int = 0
+    rows: int = 0
+    requests: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class RefreshHistoryHarvester:
+    """Copies the refresh history of many datasets into a local store.
+
+    ### Overview
+    ----
+    The history of each dataset is read in parallel, paced by a
+    `RateLimiter`. Only refreshes that started at or after the
+    dataset's watermark are kept, and the watermark moves to the
+    start of the newest refresh, or of the oldest one still running
+    so its outcome is picked up next time. A small `top` is asked for
+    first, and the full history only when every entry returned is new.
+    """
+
+    def __init__(
+        self,
+        datasets: Datasets,
+        store: SQLiteRefreshHistoryStore,
+        groups: Groups = None,
+        max_workers: int = 8,
+        rate_limiter: RateLimiter = None,
+        max_requests_per_second: float = None,
+        top: int = 10,
+    ) -> None:
+        """Initializes the `RefreshHistoryHarvester` object.
+
+        ### Parameters
+        ----
+        datasets : Datasets
+            The `Datasets` service.
+
+        store : SQLiteRefreshHistoryStore
+            Where refreshes and watermarks are kept.
+
+        groups : Groups (optional, Default=None)
+            The `Groups` service, used to list every workspace when
+            `harvest` is not given any.
+
+        max_workers : int (optional, Default=8)
+            Datasets read at the same time.
+
+        rate_limiter : RateLimiter (optional, Default=None)
+            Paces the refresh history requests, on top of any limiter
+            of the session.
+
+        max_requests_per_second : float (optional, Default=None)
+            A shortcut for a `rate_limiter` with a single rule.
+
+        top : int (optional, Default=10)
+            The entries asked for on the first request per dataset.
+
+        ### Usage
+        ----
+            >>> harvester = RefreshHistoryHarvester(
+                    datasets=power_bi_client.datasets(),
+                    groups=power_bi_client.groups(),
+                    store=SQLiteRefreshHistoryStore("config/refresh_history.db"),
+                    max_requests_per_second=5
+                )
+            >>> harvester.harvest()
+            >>> harvester.store.duration_percentiles(percentiles=(50, 95))
+        """
+
+        self.datasets = datasets
+        self.store = store
+        self.groups = groups
+        self.max_workers = max_workers
+        self.top = top
+
+        if rate_limiter is None and max_requests_per_second:
+            rate_limiter = RateLimiter(
+                rules=[
+                    RateLimitRule(
+                        name="refresh_history",
+                        pattern=r"/refreshes$",
+                        limit=max(1, int(max_requests_per_second)),
+                        period=max(1, int(max_requests_per_second)) / max_requests_per_second,
+                    )
+                ]
+            )
+        self.rate_limiter = rate_limiter
+
+    def targets(self, group_ids: Iterable[str] = None) -> List[Tuple[Optional[str], str]]:
+        """Lists the refreshable datasets of some workspaces.
+
+        ### Parameters
+        ----
+        group_ids : Iterable[str] (optional, Default=None)
+            The workspace IDs. Every workspace of the `groups` service
+            if omitted.
+
+        ### Returns
+        ----
+        List[Tuple[str, str]]
+            `(group_id, dataset_id)` pairs.
+        """
+
+        if group_ids is None:
+            if self.groups is None:
+                raise ValueError("Pass `group_ids` or a `groups` service to list workspaces.")
+            group_ids = [group["id"] for group in self.groups.get_groups().get("value", [])]
+
+        group_ids = list(group_ids)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = executor.map(
+                lambda group_id: self.datasets.get_datasets(group_id=group_id), group_ids
+            )
+
+            return [
+                (group_id, dataset["id"])
+                for group_id, page in zip(group_ids, pages)
+                for dataset in page.get("value", [])
+                if dataset.get("isRefreshable", True)
+            ]
+
+    def _fetch(self, group_id: Optional[str], dataset_id: str, top: Optional[int]) -> List[Dict]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(
+                method="get", endpoint=f"myorg/groups/{group_id}/datasets/{dataset_id}/refreshes"
+            )
+
+        return self.datasets.get_refresh_history(
+            dataset_id=dataset_id, top=top, group_id=group_id
+        ).get("value", [])
+
+    def _harvest_dataset(
+        self, group_id: Optional[str], dataset_id: str, watermark: Optional[str], harvested_at: str
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        """Reads the new refreshes of one dataset.
+
+        ### Returns
+        ----
+        Tuple[List[Dict], Optional[str], int]
+            The rows, the new watermark and the number of requests.
+        """
+
+        entries = self._fetch(group_id, dataset_id, self.top)
+        requests = 1
+
+        # Every entry is new, so older ones may be missing: read the whole history.
+        if len(entries) >= self.top and all(
+            watermark is None or (_iso(entry.get("startTime")) or "") >= watermark
+            for entry in entries
+        ):
+            entries = self._fetch(group_id, dataset_id, None)
+            requests += 1
+
+        rows = [
+            normalize_refresh(
+                entry, group_id=group_id, dataset_id=dataset_id, harvested_at=harvested_at
+            )
+            for entry in entries
+        ]
+        rows = [
+            row for row in rows if watermark is None or (row["start_time"] or "") >= watermark
+        ]
+
+        running = [
+            row["start_time"]
+            for row in rows
+            if row["status"] == _IN_PROGRESS and row["start_time"]
+        ]
+        started = [row["start_time"] for row in rows if row["start_time"]]
+
+        if running:
+            new_watermark = min(running)
+        elif started:
+            new_watermark = max(started)
+        else:
+            new_watermark = watermark
+
+        return rows, new_watermark, requests
+
+    def harvest(
+        self,
+        group_ids: Iterable[str] = None,
+        targets: Iterable[Tuple[Optional[str], str]] = None,
+    ) -> HarvestReport:
+        """Reads the new refreshes of every dataset into the store.
+
+        ### Parameters
+        ----
+        group_ids : Iterable[str] (optional, Default=None)
+            The workspaces to harvest, see `targets`.
+
+        targets : Iterable[Tuple[str, str]] (optional, Default=None)
+            `(group_id, dataset_id)` pairs to harvest instead of
+            listing the datasets of workspaces.
+
+        ### Returns
+        ----
+        HarvestReport
+            The datasets read, rows stored and failures.
+        """
+
+        started = time.monotonic()
+        targets = list(targets) if targets is not None else self.targets(group_ids)
+        harvested_at = datetime.datetime.now(tz=datetime.timezone.utc).isoformat()
+        report = HarvestReport()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._harvest_dataset,
+                    group_id,
+                    dataset_id,
+                    self.store.get_watermark(dataset_id),
+                    harvested_at,
+                ): dataset_id
+                for group_id, dataset_id in targets
+            }
+
+            # Written from this thread only, one transaction per dataset.
+            for future in as_completed(futures):
+                dataset_id = futures[future]
+                try:
+                    rows, watermark, requests = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error("Reading the refresh history of %s failed: %s", dataset_id, error)
+                    report.failed[dataset_id] = str(error)
+                    continue
+
+                self.store.upsert(
+                    rows, watermarks={dataset_id: watermark} if watermark else None
+                )
+                report.datasets += 1
+                report.rows += len(rows)
+                report.requests += requests
+
+        report.elapsed = time.monotonic() - started
+
+        logger.info(
+            "Harvested %d refreshes from %d datasets with %d requests, %d failed.",
+            report.rows,
+            report.datasets,
+            report.requests,
+            len(report.failed),
+        )
+
+        return report
@@ -0,0 +1,572 @@
+"""Runs many dataset refreshes with a concurrency cap per capacity."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import re
+import time
+
+from collections import deque
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import requests
+
+from powerbi.datasets import Datasets
+from powerbi.groups import Groups
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying, the session's own retries aside.
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Statuses of a refresh that has not finished. The refresh history
+# reports a running refresh as `Unknown`.
+IN_PROGRESS_STATUSES = frozenset({"NotStarted", "InProgress", "Unknown"})
+
+# The bucket for workspaces that are not on a dedicated capacity.
+SHARED_CAPACITY = "shared"
+
+_FRACTION = re.compile(r"\.(\d+)")
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parses a service timestamp, which can carry up to 7 fractional digits."""
+
+    if not value:
+        return None
+
+    value = _FRACTION.sub(lambda match: "." + match.group(1)[:6].ljust(6, "0"), value)
+
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError):
+        return _status_code(error) in TRANSIENT_STATUS_CODES
+
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+@dataclass
+class RefreshTarget:
+    """A dataset to refresh.
+
+    ### Parameters
+    ----
+    group_id : str
+        The workspace ID, `None` for "My Workspace".
+
+    dataset_id : str
+        The dataset ID.
+
+    capacity_id : str (optional, Default=None)
+        The capacity the workspace runs on. Looked up through the
+        `Groups` service if omitted.
+
+    options : Dict (optional, Default={})
+        `refresh_dataset` arguments that override the orchestrator's
+        `refresh_options` for this dataset.
+    """
+
+    group_id: Optional[str]
+    dataset_id: str
+    capacity_id: Optional[str] = None
+    options: Dict = field(default_factory=dict)
+
+
+@dataclass
+class RefreshResult:
+    """The outcome of one refresh.
+
+    ### Parameters
+    ----
+    status : str
+        The final status reported by the service, such as
+        `Completed`, `Failed` or `Cancelled`. `TimedOut` if the
+        refresh was still running after `refresh_timeout`.
+
+    request_id : str
+        The refresh ID, usable with `get_refresh_execution_details`.
+
+    attempts : int
+        The number of times the refresh was submitted.
+
+    queued : float
+        Seconds spent waiting for a free slot on the capacity.
+
+    duration : float
+        Seconds the refresh ran, from the service timestamps when
+        available.
+    """
+
+    group_id: Optional[str]
+    dataset_id: str
+    capacity_id: str
+    status: str = "NotStarted"
+    extended_status: Optional[str] = None
+    request_id: Optional[str] = None
+    attempts: int = 0
+    start_time: Optional[datetime.datetime] = None
+    end_time: Optional[datetime.datetime] = None
+    queued: Optional[float] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the refresh completed."""
+
+        return self.status == "Completed"
+
+    def to_dict(self) -> Dict:
+        """Returns the result as a dictionary."""
+
+        return asdict(self)
+
+
+@dataclass
+class RefreshReport:
+    """The results of a `RefreshOrchestrator.run` or `RefreshScheduler.run`.
+
+    ### Parameters
+    ----
+    results : List[RefreshResult]
+        One result per refresh, in the order of the targets, or of
+        the graph levels for a `RefreshScheduler`.
+
+    elapsed : float
+        Seconds the whole run took.
+    """
+
+    results: List[RefreshResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[RefreshResult]:
+        """The refreshes that completed."""
+
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> List[RefreshResult]:
+        """The refreshes that did not complete."""
+
+        return [result for result in self.results if not result.succeeded]
+
+    def summary(self) -> Dict[str, int]:
+        """Counts the results by status."""
+
+        counts: Dict[str, int] = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+
+        return counts
+
+    def to_rows(self) -> List[Dict]:
+        """Returns the results as a list of dictionaries."""
+
+        return [result.to_dict() for result in self.results]
+
+    def to_dataframe(self) -> object:
+        """Returns the results as a pandas `DataFrame`.
+
+        ### Raises
+        ----
+        ImportError:
+            If pandas is not installed.
+        """
+
+        try:
+            import pandas  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "`to_dataframe` requires pandas, install it with "
+                "`pip install python-power-bi[dataframes]`."
+            ) from error
+
+        return pandas.DataFrame(self.to_rows())
+
+
+class RefreshOrchestrator:
+    """Refreshes many datasets without overloading their capacities.
+
+    ### Overview
+    ----
+    `refresh_dataset` only queues a refresh. `RefreshOrchestrator`
+    submits the refreshes of many datasets, keeping at most
+    `max_concurrent_per_capacity` of them running on each capacity,
+    and follows each one by its request ID through
+    `get_refresh_execution_details` until it finishes. A finished
+    refresh frees its slot for the next dataset on the same capacity.
+
+    Polls start every `poll_interval` seconds and grow by half on each
+    poll up to `max_poll_interval`, so short refreshes are noticed
+    quickly and long ones cost few requests. Submissions and polls
+    that fail with a transient error are retried.
+    """
+
+    def __init__(
+        self,
+        datasets: Datasets,
+        groups: Groups = None,
+        max_concurrent_per_capacity: int = 4,
+        capacity_limits: Dict[str, int] = None,
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 120.0,
+        refresh_timeout: float = 4 * 60 * 60,
+        max_retries: int = 3,
+        backoff_factor: float = 5.0,
+        refresh_options: Dict = None,
+    ) -> None:
+        """Initializes the `RefreshOrchestrator` object.
+
+        ### Parameters
+        ----
+        datasets : Datasets
+            The `Datasets` service.
+
+        groups : Groups (optional, Default=None)
+            The `Groups` service, used to find the capacity of targets
+            without a `capacity_id`. Without it, those targets share
+            a single `shared` capacity.
+
+        max_concurrent_per_capacity : int (optional, Default=4)
+            Refreshes running at the same time on each capacity.
+
+        capacity_limits : Dict[str, int] (optional, Default=None)
+            Per capacity overrides of `max_concurrent_per_capacity`.
+
+        poll_interval : float (optional, Default=10.0)
+            Seconds before the first status check of a refresh.
+
+        max_poll_interval : float (optional, Default=120.0)
+            The longest wait between status checks, in seconds.
+
+        refresh_timeout : float (optional, Default=14400)
+            Seconds after which a running refresh is reported as
+            `TimedOut` and its slot freed. The refresh itself is left
+            running.
+
+        max_retries : int (optional, Default=3)
+            Resubmissions of a refresh rejected with a transient error.
+
+        backoff_factor : float (optional, Default=5.0)
+            The base delay between resubmissions, doubled on every
+            attempt.
+
+        refresh_options : Dict (optional, Default={"refresh_type": "Full"})
+            Arguments passed to `refresh_dataset`. The default makes an
+            enhanced refresh, the kind `get_refresh_execution_details`
+            reports on; other refreshes are followed through the
+            refresh history.
+
+        ### Usage
+        ----
+            >>> orchestrator = RefreshOrchestrator(
+                    datasets=power_bi_client.datasets(),
+                    groups=power_bi_client.groups(),
+                    max_concurrent_per_capacity=3
+                )
+            >>> report = orchestrator.run(
+                    targets=[
+                        ('f089354e-8366-4e18-aea3-4cb4a3a50b48', 'cfafbeb1-8037-4d0c-896e-a46fb27ff229'),
+                        ('f089354e-8366-4e18-aea3-4cb4a3a50b48', '5dba60b0-d9a7-42a3-b12c-6d9d51e7739a')
+                    ]
+                )
+            >>> report.summary()
+            {'Completed': 2}
+        """
+
+        self.datasets = datasets
+        self.groups = groups
+        self.max_concurrent_per_capacity = max_concurrent_per_capacity
+        self.capacity_limits = dict(capacity_limits or {})
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.refresh_timeout = refresh_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.refresh_options = (
+            {"refresh_type": "Full"} if refresh_options is None else dict(refresh_options)
+        )
+
+    def _limit(self, capacity_id: str) -> int:
+        return self.capacity_limits.get(capacity_id, self.max_concurrent_per_capacity)
+
+    def _capacities(self, targets: List[RefreshTarget]) -> Dict[Optional[str], str]:
+        """Maps the workspace of each target without a capacity to one."""
+
+        if self.groups is None or all(target.capacity_id for target in targets):
+            return {}
+
+        return {
+            group["id"]: group.get("capacityId") or SHARED_CAPACITY
+            for group in self.groups.get_groups().get("value", [])
+        }
+
+    def run(
+        self, targets: Iterable[Union[RefreshTarget, Tuple[Optional[str], str]]]
+    ) -> RefreshReport:
+        """Refreshes every target and waits for all of them to finish.
+
+        ### Parameters
+        ----
+        targets : Iterable[Union[RefreshTarget, Tuple[str, str]]]
+            `RefreshTarget` objects or `(group_id, dataset_id)` pairs.
+            Datasets are submitted in this order as slots free up.
+
+        ### Returns
+        ----
+        RefreshReport
+            One `RefreshResult` per target, with its status and
+            duration.
+        """
+
+        started = time.monotonic()
+
+        targets = [
+            target if isinstance(target, RefreshTarget) else RefreshTarget(*target)
+            for target in targets
+        ]
+        capacities = self._capacities(targets)
+
+        report = RefreshReport(
+            results=[
+                RefreshResult(
+                    group_id=target.group_id,
+                    dataset_id=target.dataset_id,
+                    capacity_id=target.capacity_id
+                    or capacities.get(target.group_id, SHARED_CAPACITY),
+                )
+                for target in targets
+            ]
+        )
+
+        queue = deque(range(len(targets)))
+        retry_at: Dict[int, float] = {}
+        polls: Dict[int, Dict] = {}
+        running: Dict[str, int] = {}
+
+        def has_room(index: int) -> bool:
+            capacity_id = report.results[index].capacity_id
+            return running.get(capacity_id, 0) < self._limit(capacity_id)
+
+        def submit(index: int) -> None:
+            queue.remove(index)
+            if self._submit(targets[index], report.results[index], started):
+                capacity_id = report.results[index].capacity_id
+                running[capacity_id] = running.get(capacity_id, 0) + 1
+                polls[index] = self._poll_state(report.results[index])
+            elif report.results[index].status == "NotStarted":
+                result = report.results[index]
+                retry_at[index] = time.monotonic() + self.backoff_factor * 2 ** (
+                    result.attempts - 1
+                )
+                queue.append(index)
+
+        while queue or polls:
+            now = time.monotonic()
+            for index in list(queue):
+                if retry_at.get(index, now) <= now and has_room(index):
+                    submit(index)
+
+            events = [(poll["next_poll"], 0, index) for index, poll in polls.items()]
+            events += [
+                (retry_at[index], 1, index)
+                for index in queue
+                if index in retry_at and has_room(index)
+            ]
+            if not events:
+                # Only targets on capacities without a single slot are left.
+                for index in queue:
+                    report.results[index].status = "Skipped"
+                    report.results[index].error = "The capacity allows no refreshes."
+                break
+
+            when, kind, index = min(events)
+
+            delay = when - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            if kind == 1:
+                submit(index)
+                continue
+
+            if self._poll(targets[index], report.results[index], polls[index]):
+                del polls[index]
+                running[report.results[index].capacity_id] -= 1
+
+        report.elapsed = time.monotonic() - started
+
+        logger.info("Refreshed %d datasets: %s.", len(report.results), report.summary())
+
+        return report
+
+    def _poll_state(self, result: RefreshResult) -> Dict:
+        """Returns the polling state of a refresh that was just submitted."""
+
+        now = time.monotonic()
+
+        return {
+            "next_poll": now + self.poll_interval,
+            "interval": self.poll_interval,
+            "submitted": now,
+            "history": result.request_id is None,
+        }
+
+    def _submit(
+        self, target: RefreshTarget, result: RefreshResult, started: float = None
+    ) -> bool:
+        """Submits a refresh.
+
+        ### Returns
+        ----
+        bool
+            `True` if the refresh was accepted. On a transient error the
+            status stays `NotStarted` and the refresh is retried.
+        """
+
+        result.attempts += 1
+        if result.queued is None and started is not None:
+            result.queued = time.monotonic() - started
+
+        options = {**self.refresh_options, **target.options}
+
+        try:
+            response = self.datasets.refresh_dataset(
+                dataset_id=target.dataset_id, group_id=target.group_id, **options
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            if _is_transient(error) and result.attempts <= self.max_retries:
+                logger.warning(
+                    "Refresh of dataset %s was rejected (%s), retrying.",
+                    target.dataset_id,
+                    error,
+                )
+                return False
+
+            logger.error("Refresh of dataset %s failed to start: %s", target.dataset_id, error)
+            result.status = "Failed"
+            result.error = str(error)
+            return False
+
+        if isinstance(response, dict):
+            result.request_id = response.get("request_id")
+
+        result.status = "InProgress"
+        result.start_time = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        return True
+
+    def _fetch_status(self, target: RefreshTarget, result: RefreshResult, poll: Dict) -> Optional[Dict]:
+        """Returns the refresh details, or `None` if they could not be read."""
+
+        if not poll["history"]:
+            try:
+                return self.datasets.get_refresh_execution_details(
+                    dataset_id=target.dataset_id,
+                    refresh_id=result.request_id,
+                    group_id=target.group_id,
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                if _is_transient(error):
+                    return None
+
+                # Only enhanced refreshes have execution details.
+                logger.debug(
+                    "No execution details for refresh %s (%s), using the refresh history.",
+                    result.request_id,
+                    error,
+                )
+                poll["history"] = True
+
+        try:
+            entries = self.datasets.get_refresh_history(
+                dataset_id=target.dataset_id, top=5, group_id=target.group_id
+            ).get("value", [])
+        except Exception as error:  # pylint: disable=broad-except
+            if _is_transient(error):
+                return None
+            raise
+
+        for entry in entries:
+            if result.request_id is None or entry.get("requestId") == result.request_id:
+                result.request_id = entry.get("requestId")
+                return entry
+
+        return None
+
+    def _poll(self, target: RefreshTarget, result: RefreshResult, poll: Dict) -> bool:
+        """Checks on a running refresh.
+
+        ### Returns
+        ----
+        bool
+            `True` once the refresh has finished.
+        """
+
+        try:
+            details = self._fetch_status(target=target, result=result, poll=poll)
+        except Exception as error:  # pylint: disable=broad-except
+            result.status = "Failed"
+            result.error = str(error)
+            return True
+
+        status = (details or {}).get("status", "Unknown")
+
+        if status in IN_PROGRESS_STATUSES:
+            if time.monotonic() - poll["submitted"] > self.refresh_timeout:
+                logger.error(
+                    "Refresh of dataset %s still running after %s seconds.",
+                    target.dataset_id,
+                    self.refresh_timeout,
+                )
+                result.status = "TimedOut"
+                result.error = f"Still running after {self.refresh_timeout} seconds."
+                result.duration = time.monotonic() - poll["submitted"]
+                return True
+
+            poll["interval"] = min(poll["interval"] * 1.5, self.max_poll_interval)
+            poll["next_poll"] = time.monotonic() + poll["interval"]
+            return False
+
+        result.status = status
+        result.extended_status = details.get("extendedStatus")
+        result.start_time = _parse_time(details.get("startTime")) or result.start_time
+        result.end_time = _parse_time(details.get("endTime")) or datetime.datetime.now(
+            tz=datetime.timezone.utc
+        )
+
+        if result.start_time is not None and (result.start_time.tzinfo is None) == (
+            result.end_time.tzinfo is None
+        ):
+            result.duration = (result.end_time - result.start_time).total_seconds()
+        else:
+            result.duration = time.monotonic() - poll["submitted"]
+
+        if status != "Completed":
+            messages = details.get("messages") or []
+            result.error = "; ".join(
+                message.get("message", "") for message in messages if message.get("message")
+            ) or details.get("serviceExceptionJson")
+            logger.error("Refresh of dataset %s ended with status %s.", target.dataset_id, status)
+
+        return True
@@ -0,0 +1,548 @@
+"""Splits the refresh of a large model into enhanced refresh waves that fit in memory."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from powerbi.datasets import Datasets
+from powerbi.exceptions import PowerBiError
+from powerbi.refresh_orchestrator import RefreshOrchestrator
+from powerbi.refresh_orchestrator import RefreshTarget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartitionSpec:
+    """A table or partition to refresh, and how much memory it holds.
+
+    ### Parameters
+    ----
+    table : str
+        The table name.
+
+    partition : str (optional, Default=None)
+        The partition name. The whole table is refreshed if omitted.
+
+    size : float (optional, Default=0.0)
+        The memory the table or partition takes, in bytes.
+    """
+
+    table: str
+    partition: Optional[str] = None
+    size: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """`table` or `table/partition`, as used by the `sizes` overrides."""
+
+        return self.table if self.partition is None else f"{self.table}/{self.partition}"
+
+    def to_object(self) -> Dict:
+        """Returns the item of the enhanced refresh `objects` list."""
+
+        if self.partition is None:
+            return {"table": self.table}
+
+        return {"table": self.table, "partition": self.partition}
+
+
+def partitions_from_spec(
+    spec: Union[Dict, Iterable[Dict]],
+    sizes: Dict[str, float] = None,
+    default_size: float = None,
+) -> List[PartitionSpec]:
+    """Reads the tables and partitions of a model.
+
+    ### Parameters
+    ----
+    spec : Union[Dict, Iterable[Dict]]
+        A dataset from a `TenantScanner` scan with `dataset_schema`,
+        or a local spec of the same shape: a dictionary with a
+        `tables` list, or the list itself. Each table can carry a
+        `size` in bytes and a `partitions` list of dictionaries with a
+        `name` and a `size`.
+
+    sizes : Dict[str, float] (optional, Default=None)
+        Sizes keyed by `table` or `table/partition`, which take
+        precedence over the spec. The scanner does not report sizes,
+        so they come from here or from `default_size`.
+
+    default_size : float (optional, Default=None)
+        The size of tables and partitions that have none.
+
+    ### Returns
+    ----
+    List[PartitionSpec]
+        One item per partition, or per table without partitions.
+
+    ### Raises
+    ----
+    ValueError:
+        If a table or partition has no size and no `default_size` is
+        given, as with scanner output without `sizes`.
+    """
+
+    sizes = sizes or {}
+    tables = spec.get("tables", []) if isinstance(spec, dict) else spec
+    items = []
+    unsized = []
+
+    for table in tables:
+        partitions = table.get("partitions") or [None]
+
+        for partition in partitions:
+            if partition is None:
+                item = PartitionSpec(table=table["name"])
+                size = table.get("size")
+            else:
+                item = PartitionSpec(table=table["name"], partition=partition["name"])
+                size = partition.get("size")
+
+            size = sizes.get(item.key, size)
+            if size is None:
+                size = default_size
+            if size is None:
+                unsized.append(item.key)
+                continue
+
+            item.size = size
+            items.append(item)
+
+    if unsized:
+        raise ValueError(
+            f"No size is known for {', '.join(unsized)}. Pass them in `sizes`, "
+            "or a `default_size`, so the waves can be packed."
+        )
+
+    return items
+
+
+@dataclass
+class RefreshWave:
+    """One enhanced refresh of a `RefreshPlan`.
+
+    ### Parameters
+    ----
+    index : int
+        The position of the wave in the plan.
+
+    objects : List[Dict]
+        The `objects` sent with the refresh, empty for the whole model.
+
+    size : float
+        The memory the refreshed objects take, in bytes.
+
+    max_parallelism : int
+        The `max_parallelism` sent with the refresh.
+
+    oversized : bool
+        Whether a single object is larger than the memory budget.
+    """
+
+    index: int
+    refresh_type: str
+    objects: List[Dict] = field(default_factory=list)
+    size: float = 0.0
+    max_parallelism: int = 1
+    oversized: bool = False
+    status: Optional[str] = None
+    request_id: Optional[str] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Returns the wave as a dictionary."""
+
+        return asdict(self)
+
+
+@dataclass
+class RefreshPlan:
+    """The waves that refresh a model within a memory budget.
+
+    ### Parameters
+    ----
+    dataset_id : str
+        The dataset ID.
+
+    group_id : str (optional)
+        The workspace ID, `None` for "My Workspace".
+
+    memory_budget : float
+        The bytes each wave may use on top of the loaded model.
+
+    waves : List[RefreshWave]
+        The refreshes, in the order they are sent.
+    """
+
+    dataset_id: str
+    group_id: Optional[str]
+    memory_budget: float
+    waves: List[RefreshWave] = field(default_factory=list)
+
+    @property
+    def size(self) -> float:
+        """The memory all the refreshed objects take, in bytes."""
+
+        return sum(wave.size for wave in self.waves)
+
+    def to_dict(self) -> Dict:
+        """Returns the plan as a dictionary."""
+
+        return {
+            "dataset_id": self.dataset_id,
+            "group_id": self.group_id,
+            "memory_budget": self.memory_budget,
+            "waves": [wave.to_dict() for wave in self.waves],
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """Returns the plan as a JSON string."""
+
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+class PartitionRefreshPlanner:
+    """Refreshes a large model in waves of partitions that fit in memory.
+
+    ### Overview
+    ----
+    A full refresh builds a new copy of every partition while the old
+    copy stays loaded, so large models run out of capacity memory.
+    `PartitionRefreshPlanner` packs the tables and partitions of a
+    model into waves whose combined size, times `refresh_overhead`,
+    fits in `memory_limit` next to the loaded model. Each wave is an
+    enhanced refresh of its `objects`, with `max_parallelism` set to
+    the number of objects in it, up to `max_parallelism`. The waves
+    load data only (`DataOnly`), and a last `Calculate` refresh
+    rebuilds calculated tables, columns and relationships once.
+
+    Waves are sent one after the other and followed through
+    `get_refresh_execution_details`.
+    """
+
+    def __init__(
+        self,
+        datasets: Datasets,
+        memory_limit: float,
+        model_size: float = None,
+        refresh_overhead: float = 1.0,
+        max_parallelism: int = 10,
+        max_objects_per_wave: int = None,
+        commit_mode: str = "transactional",
+        final_calculate: bool = True,
+        retry_count: int = None,
+        poll_interval: float = 15.0,
+        max_poll_interval: float = 120.0,
+        refresh_timeout: float = 5 * 60 * 60,
+        max_retries: int = 3,
+        backoff_factor: float = 5.0,
+    ) -> None:
+        """Initializes the `PartitionRefreshPlanner` object.
+
+        ### Parameters
+        ----
+        datasets : Datasets
+            The `Datasets` service.
+
+        memory_limit : float
+            The memory a dataset may use on the capacity, in bytes,
+            such as 25 GB on a P1.
+
+        model_size : float (optional, Default=None)
+            The memory the loaded model takes, in bytes. Defaults to
+            the combined size of the tables and partitions.
+
+        refresh_overhead : float (optional, Default=1.0)
+            The memory needed to refresh an object, as a multiple of
+            its size.
+
+        max_parallelism : int (optional, Default=10)
+            The highest `max_parallelism` sent with a wave.
+
+        max_objects_per_wave : int (optional, Default=None)
+            The most tables and partitions refreshed by one wave.
+
+        commit_mode : str (optional, Default="transactional")
+            The `commit_mode` of each wave.
+
+        final_calculate : bool (optional, Default=True)
+            Whether to end with a `Calculate` refresh of the model.
+
+        retry_count : int (optional, Default=None)
+            The `retry_count` of each wave.
+
+        poll_interval : float (optional, Default=15.0)
+            Seconds before the first status check of a wave.
+
+        max_poll_interval : float (optional, Default=120.0)
+            The longest wait between status checks, in seconds.
+
+        refresh_timeout : float (optional, Default=18000)
+            Seconds after which a running wave is reported as
+            `TimedOut`.
+
+        max_retries : int (optional, Default=3)
+            Resubmissions of a wave rejected with a transient error.
+
+        backoff_factor : float (optional, Default=5.0)
+            The base delay between resubmissions, doubled on every
+            attempt.
+
+        ### Usage
+        ----
+            >>> planner = PartitionRefreshPlanner(
+                    datasets=power_bi_client.datasets(),
+                    memory_limit=25 * 1024**3
+                )
+            >>> plan = planner.plan(
+                    dataset_id='cfafbeb1-8037-4d0c-896e-a46fb27ff229',
+                    spec=scanned_dataset,
+                    sizes={'Sales/2024': 6 * 1024**3, 'Sales/2023': 5 * 1024**3},
+                    default_size=512 * 1024**2
+                )
+            >>> print(plan.to_json())
+            >>> planner.run(plan=plan)
+        """
+
+        self.datasets = datasets
+        self.memory_limit = memory_limit
+        self.model_size = model_size
+        self.refresh_overhead = refresh_overhead
+        self.max_parallelism = max_parallelism
+        self.max_objects_per_wave = max_objects_per_wave
+        self.commit_mode = commit_mode
+        self.final_calculate = final_calculate
+        self.retry_count = retry_count
+
+        self._orchestrator = RefreshOrchestrator(
+            datasets=datasets,
+            max_concurrent_per_capacity=1,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            refresh_timeout=refresh_timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            refresh_options={},
+        )
+
+    def plan(
+        self,
+        dataset_id: str,
+        spec: Union[Dict, Iterable[Dict], Iterable[PartitionSpec]],
+        group_id: str = None,
+        sizes: Dict[str, float] = None,
+        default_size: float = None,
+    ) -> RefreshPlan:
+        """Packs the tables and partitions of a model into waves.
+
+        ### Parameters
+        ----
+        dataset_id : str
+            The dataset ID.
+
+        spec : Union[Dict, Iterable[Dict], Iterable[PartitionSpec]]
+            The model, see `partitions_from_spec`, or a list of
+            `PartitionSpec` objects.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        sizes : Dict[str, float] (optional, Default=None)
+            Sizes keyed by `table` or `table/partition`, in bytes.
+
+        default_size : float (optional, Default=None)
+            The size of tables and partitions that have none.
+
+        ### Returns
+        ----
+        RefreshPlan
+            The waves, largest first.
+
+        ### Raises
+        ----
+        ValueError:
+            If a table or partition has no size, if none has a size
+            above zero, or if the loaded model leaves no memory to
+            refresh with.
+        """
+
+        if not isinstance(spec, dict):
+            spec = list(spec)
+
+        if spec and all(isinstance(item, PartitionSpec) for item in spec):
+            partitions = spec
+        else:
+            partitions = partitions_from_spec(spec=spec, sizes=sizes, default_size=default_size)
+
+        # Without sizes everything lands in one wave, which defeats the plan.
+        if not any(partition.size for partition in partitions):
+            raise ValueError(
+                "No table or partition has a size above zero, so the waves cannot "
+                "be packed. Pass `sizes` or a `default_size`."
+            )
+
+        model_size = self.model_size
+        if model_size is None:
+            model_size = sum(partition.size for partition in partitions)
+
+        budget = self.memory_limit - model_size
+        if budget <= 0:
+            raise ValueError(
+                f"The model takes {model_size:,.0f} bytes, which leaves none of the "
+                f"{self.memory_limit:,.0f} byte memory limit to refresh with."
+            )
+
+        refresh_type = "DataOnly" if self.final_calculate else "Full"
+        waves: List[RefreshWave] = []
+        free: List[float] = []
+
+        # First fit decreasing: each object goes into the first wave with room.
+        for partition in sorted(partitions, key=lambda item: item.size, reverse=True):
+            cost = partition.size * self.refresh_overhead
+
+            for index, wave in enumerate(waves):
+                if cost <= free[index] and (
+                    self.max_objects_per_wave is None
+                    or len(wave.objects) < self.max_objects_per_wave
+                ):
+                    break
+            else:
+                wave = RefreshWave(index=len(waves), refresh_type=refresh_type)
+                waves.append(wave)
+                free.append(budget)
+                index = len(waves) - 1
+
+                if cost > budget:
+                    logger.warning(
+                        "%s needs %.0f bytes to refresh, more than the %.0f byte budget.",
+                        partition.key,
+                        cost,
+                        budget,
+                    )
+                    wave.oversized = True
+
+            wave.objects.append(partition.to_object())
+            wave.size += partition.size
+            free[index] -= cost
+
+        for wave in waves:
+            wave.max_parallelism = max(1, min(self.max_parallelism, len(wave.objects)))
+
+        if self.final_calculate and waves:
+            waves.append(
+                RefreshWave(
+                    index=len(waves),
+                    refresh_type="Calculate",
+                    max_parallelism=self.max_parallelism,
+                )
+            )
+
+        plan = RefreshPlan(
+            dataset_id=dataset_id, group_id=group_id, memory_budget=budget, waves=waves
+        )
+
+        logger.info(
+            "Refresh plan for dataset %s: %d objects in %d waves.",
+            dataset_id,
+            len(partitions),
+            len(waves),
+        )
+
+        return plan
+
+    def run(self, plan: RefreshPlan) -> RefreshPlan:
+        """Sends the waves of a plan one after the other.
+
+        ### Parameters
+        ----
+        plan : RefreshPlan
+            A plan made by `plan`.
+
+        ### Returns
+        ----
+        RefreshPlan
+            The plan, with the `status`, `request_id` and `duration`
+            of each wave. Waves after a failed one are `Skipped`.
+
+        ### Raises
+        ----
+        PowerBiError:
+            If a wave did not complete.
+        """
+
+        for position, wave in enumerate(plan.waves):
+            options = {
+                "refresh_type": wave.refresh_type,
+                "commit_mode": self.commit_mode,
+                "max_parallelism": wave.max_parallelism,
+            }
+            if wave.objects:
+                options["objects"] = wave.objects
+            if self.retry_count is not None:
+                options["retry_count"] = self.retry_count
+
+            result = self._orchestrator.run(
+                targets=[
+                    RefreshTarget(
+                        group_id=plan.group_id, dataset_id=plan.dataset_id, options=options
+                    )
+                ]
+            ).results[0]
+
+            wave.status = result.status
+            wave.request_id = result.request_id
+            wave.duration = result.duration
+            wave.error = result.error
+
+            if not result.succeeded:
+                for skipped in plan.waves[position + 1 :]:
+                    skipped.status = "Skipped"
+
+                raise PowerBiError(
+                    f"Wave {wave.index} of the refresh of dataset {plan.dataset_id} "
+                    f"ended with status {wave.status}: {wave.error}"
+                )
+
+        return plan
+
+    def refresh(
+        self,
+        dataset_id: str,
+        spec: Union[Dict, Iterable[Dict], Iterable[PartitionSpec]],
+        group_id: str = None,
+        sizes: Dict[str, float] = None,
+        default_size: float = None,
+        dry_run: bool = False,
+    ) -> RefreshPlan:
+        """Plans and, unless `dry_run`, runs the refresh of a model.
+
+        ### Returns
+        ----
+        RefreshPlan
+            The plan, with the outcome of each wave.
+        """
+
+        plan = self.plan(
+            dataset_id=dataset_id,
+            spec=spec,
+            group_id=group_id,
+            sizes=sizes,
+            default_size=default_size,
+        )
+
+        if dry_run:
+            return plan
+
+        return self.run(plan=plan)
@@ -0,0 +1,268 @@
+"""Retry policy used by the `PowerBiSession` for throttled requests."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import random
+import threading
+import time
+
+from dataclasses import dataclass
+from dataclasses import field
+from email.utils import parsedate_to_datetime
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import Optional
+
+_retry_policy_override: contextvars.ContextVar = contextvars.ContextVar(
+    "powerbi_retry_policy_override", default=None
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a `Retry-After` header into a number of seconds.
+
+    ### Parameters
+    ----
+    value : str
+        The header value, either delay-seconds or an HTTP-date.
+
+    ### Returns
+    ----
+    Optional[float]
+        The number of seconds to wait, or `None` if the header
+        is missing or malformed.
+    """
+
+    if not value:
+        return None
+
+    value = value.strip()
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Describes when and how long to wait before retrying a request.
+
+    ### Parameters
+    ----
+    max_retries : int (optional, Default=5)
+        The maximum number of retries for a single request. Use `0`
+        to disable retries.
+
+    status_codes : FrozenSet[int] (optional, Default={429, 503})
+        The status codes that are retried.
+
+    any_method_status_codes : FrozenSet[int] (optional, Default={429})
+        The status codes that are retried for every method. A `429`
+        means the request was rejected before it was processed, so
+        it is safe to retry even a `POST`.
+
+    idempotent_methods : FrozenSet[str] (optional)
+        The methods retried for the remaining `status_codes`.
+
+    backoff_factor : float (optional, Default=1.0)
+        The base delay in seconds, doubled on every attempt.
+
+    max_backoff : float (optional, Default=60.0)
+        The maximum delay for a single attempt.
+
+    jitter : bool (optional, Default=True)
+        If `True`, uses "full jitter" so concurrent workers do not
+        retry in lockstep.
+
+    respect_retry_after : bool (optional, Default=True)
+        If `True`, waits for the `Retry-After` header when the
+        API sends one.
+
+    max_total_wait : float (optional, Default=300.0)
+        The total number of seconds a single request may spend
+        waiting across all of its retries.
+
+    ### Usage
+    ----
+        >>> power_bi_client = PowerBiClient(
+                ...,
+                retry_policy=RetryPolicy(max_retries=10, max_total_wait=900)
+            )
+    """
+
+    max_retries: int = 5
+    status_codes: FrozenSet[int] = frozenset({429, 503})
+    any_method_status_codes: FrozenSet[int] = frozenset({429})
+    idempotent_methods: FrozenSet[str] = frozenset(
+        {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    )
+    backoff_factor: float = 1.0
+    max_backoff: float = 60.0
+    jitter: bool = True
+    respect_retry_after: bool = True
+    max_total_wait: float = 300.0
+
+    def is_retryable(self, method: str, status_code: int) -> bool:
+        """Returns whether a response may be retried.
+
+        ### Parameters
+        ----
+        method : str
+            The request method.
+
+        status_code : int
+            The response status code.
+
+        ### Returns
+        ----
+        bool
+            `True` if the status and method allow a retry.
+        """
+
+        if status_code not in self.status_codes:
+            return False
+
+        if status_code in self.any_method_status_codes:
+            return True
+
+        return method.upper() in self.idempotent_methods
+
+    def next_delay(
+        self,
+        method: str,
+        status_code: int,
+        attempt: int,
+        waited: float,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Returns how long to wait before the next attempt.
+
+        ### Parameters
+        ----
+        method : str
+            The request method.
+
+        status_code : int
+            The response status code.
+
+        attempt : int
+            The number of retries already made for the request.
+
+        waited : float
+            The number of seconds already spent waiting.
+
+        retry_after : str (optional, Default=None)
+            The raw `Retry-After` header of the response.
+
+        ### Returns
+        ----
+        Optional[float]
+            The delay in seconds, or `None` if the request should
+            not be retried.
+        """
+
+        if attempt >= self.max_retries or not self.is_retryable(method, status_code):
+            return None
+
+        delay = min(self.backoff_factor * (2**attempt), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)  # nosec B311 - not used for security
+
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+
+        if waited + delay > self.max_total_wait:
+            return None
+
+        return delay
+
+
+@dataclass
+class RetryStats:
+    """Thread-safe counters of retries made by a session."""
+
+    retries: int = 0
+    throttled_seconds: float = 0.0
+    exhausted: int = 0
+    retries_by_status: Dict[int, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_retry(self, status_code: int, delay: float) -> None:
+        """Records a retry and the time waited for it."""
+
+        with self._lock:
+            self.retries += 1
+            self.throttled_seconds += delay
+            self.retries_by_status[status_code] = (
+                self.retries_by_status.get(status_code, 0) + 1
+            )
+
+    def record_exhausted(self) -> None:
+        """Records a retryable response that was given up on."""
+
+        with self._lock:
+            self.exhausted += 1
+
+    def to_dict(self) -> Dict:
+        """Returns a snapshot of the counters.
+
+        ### Returns
+        ----
+        Dict
+            The `retries`, `throttled_seconds`, `exhausted` and
+            `retries_by_status` counters.
+        """
+
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "throttled_seconds": self.throttled_seconds,
+                "exhausted": self.exhausted,
+                "retries_by_status": dict(self.retries_by_status),
+            }
+
+
+@contextlib.contextmanager
+def use_retry_policy(policy: RetryPolicy) -> Iterator[RetryPolicy]:
+    """Overrides the session retry policy for calls made in this context.
+
+    The override is stored in a context variable, so it only applies
+    to the current thread or asyncio task.
+
+    ### Parameters
+    ----
+    policy : RetryPolicy
+        The policy to use inside the `with` block.
+
+    ### Usage
+    ----
+        >>> with use_retry_policy(RetryPolicy(max_retries=0)):
+                admin_service.get_groups(top=100)
+    """
+
+    token = _retry_policy_override.set(policy)
+    try:
+        yield policy
+    finally:
+        _retry_policy_override.reset(token)
+
+
+def current_retry_policy_override() -> Optional[RetryPolicy]:
+    """Returns the policy set by `use_retry_policy`, if any."""
+
+    return _retry_policy_override.get()
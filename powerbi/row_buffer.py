@@ -0,0 +1,287 @@
+"""Column-oriented, typed storage for push dataset rows."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import math
+
+from json.encoder import encode_basestring
+
+from array import array
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from powerbi.columnar import row_template
+from powerbi.enums import ColumnDataTypes
+
+if TYPE_CHECKING:
+    from powerbi.utils import Column
+
+_NULL = "null"
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _to_microseconds(value: object) -> int:
+    """Converts a date, datetime or ISO 8601 string to UTC epoch microseconds."""
+
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime.datetime):
+        if not isinstance(value, datetime.date):
+            raise TypeError(f"Cannot store {type(value).__name__} in a DateTime column.")
+        value = datetime.datetime.combine(value, datetime.time())
+
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _to_bool(value: object) -> int:
+    return 1 if value else 0
+
+
+def _to_str(value: object) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _encode_bool(value: int) -> str:
+    return "true" if value else "false"
+
+
+def _encode_float(value: float) -> str:
+    return repr(value) if math.isfinite(value) else _NULL
+
+
+def _encode_datetime(value: int) -> str:
+    return '"' + (_EPOCH + datetime.timedelta(microseconds=value)).isoformat() + '"'
+
+
+# How values of each column type are converted when stored and encoded when sent.
+_CODECS = {
+    ColumnDataTypes.INT64.value: ("q", int, str),
+    ColumnDataTypes.DOUBLE.value: ("d", float, _encode_float),
+    ColumnDataTypes.DECIMAL.value: ("d", float, _encode_float),
+    ColumnDataTypes.BOOLEAN.value: ("b", _to_bool, _encode_bool),
+    ColumnDataTypes.DATETIME.value: ("q", _to_microseconds, _encode_datetime),
+}
+_STRING_CODEC = (None, _to_str, encode_basestring)
+
+
+class TypedRowBuffer:
+    """Buffers rows column by column in typed arrays.
+
+    ### Overview
+    ----
+    Each column is stored according to its `Column.data_type`:
+    `Int64` and `DateTime` values as 64-bit integers, `Double` and
+    `Decimal` values as 64-bit floats, booleans as bytes and strings
+    in a list, with a null flag per value. Numeric columns take 9
+    bytes per value instead of a boxed Python object in a dictionary
+    per row, and JSON is only produced when the rows are sent.
+    """
+
+    __slots__ = (
+        "names",
+        "data_types",
+        "_names",
+        "_values",
+        "_nulls",
+        "_converters",
+        "_encoders",
+        "_strings",
+        "_template",
+        "_string_bytes",
+    )
+
+    def __init__(self, columns: Iterable[Column]) -> None:
+        """Initializes the `TypedRowBuffer` object.
+
+        ### Parameters
+        ----
+        columns : Iterable[Column]
+            The table columns, usually `Table.columns`.
+
+        ### Usage
+        ----
+            >>> buffer = TypedRowBuffer(columns=sales_table.columns)
+            >>> buffer.append({"partner_name": "Alex Reed", "partner_sales": 1000.30})
+            >>> power_bi_client.push_datasets().post_dataset_rows(
+                    dataset_id=dataset_id, table_name="sales", rows=buffer
+                )
+        """
+
+        self.names: List[str] = [column.name for column in columns]
+        self.data_types: List[str] = [column.data_type for column in columns]
+
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Duplicate column names in {self.names}.")
+
+        codecs = [_CODECS.get(data_type, _STRING_CODEC) for data_type in self.data_types]
+
+        self._names = frozenset(self.names)
+        self._values = [array(typecode) if typecode else [] for typecode, _, _ in codecs]
+        self._nulls = [bytearray() for _ in self.names]
+        self._converters = [(name, codec[1]) for name, codec in zip(self.names, codecs)]
+        self._encoders = [codec[2] for codec in codecs]
+        self._strings = [index for index, codec in enumerate(codecs) if codec[0] is None]
+        self._template = row_template(self.names)
+        self._string_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._nulls[0]) if self._nulls else 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_rows())
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate memory, in bytes, held by the buffered values."""
+
+        total = self._string_bytes
+        for values, nulls in zip(self._values, self._nulls):
+            itemsize = values.itemsize if isinstance(values, array) else 8
+            total += itemsize * len(values) + len(nulls)
+
+        return total
+
+    def append(self, row: Dict) -> None:
+        """Adds a row.
+
+        ### Parameters
+        ----
+        row : Dict
+            The row, keyed by column name. Missing columns and `None`
+            values are stored as nulls.
+
+        ### Raises
+        ----
+        KeyError:
+            If the row has a column the table does not.
+        TypeError, ValueError:
+            If a value cannot be stored in its column's type.
+        OverflowError:
+            If a value is out of range for its column's type.
+        """
+
+        if not self._names.issuperset(row):
+            unknown = sorted(set(row) - self._names)
+            raise KeyError(f"Unknown columns {unknown}.")
+
+        get = row.get
+        converted = [
+            None if (value := get(name)) is None else convert(value)
+            for name, convert in self._converters
+        ]
+
+        # Stored only once every value converted. A value can still be out
+        # of range for its typed array, so the columns already stored are
+        # rolled back and a bad row is not half added.
+        stored = 0
+        try:
+            for values, nulls, value in zip(self._values, self._nulls, converted):
+                if value is None:
+                    values.append(0 if values.__class__ is array else "")
+                    nulls.append(1)
+                else:
+                    values.append(value)
+                    nulls.append(0)
+                stored += 1
+        except (OverflowError, TypeError, ValueError):
+            for values, nulls in zip(self._values[:stored], self._nulls[:stored]):
+                values.pop()
+                nulls.pop()
+            raise
+
+        for index in self._strings:
+            if converted[index] is not None:
+                self._string_bytes += len(converted[index])
+
+    def extend(self, rows: Iterable[Dict]) -> None:
+        """Adds every row of an iterable."""
+
+        for row in rows:
+            self.append(row)
+
+    def _encode_column(self, index: int, start: int, stop: int) -> List[str]:
+        encoded = list(map(self._encoders[index], self._values[index][start:stop]))
+
+        nulls = self._nulls[index][start:stop]
+        if 1 in nulls:
+            for offset, null in enumerate(nulls):
+                if null:
+                    encoded[offset] = _NULL
+
+        return encoded
+
+    def encode_rows(self, start: int = 0, stop: int = None) -> List[bytes]:
+        """Encodes a range of rows as JSON objects.
+
+        ### Parameters
+        ----
+        start : int (optional, Default=0)
+            The first row.
+
+        stop : int (optional, Default=None)
+            The row after the last one. Defaults to the end.
+
+        ### Returns
+        ----
+        List[bytes]
+            One UTF-8 encoded JSON object per row.
+        """
+
+        stop = len(self) if stop is None else min(stop, len(self))
+        columns = [self._encode_column(index, start, stop) for index in range(len(self.names))]
+        template = self._template
+
+        return [(template % row).encode("utf-8") for row in zip(*columns)]
+
+    def to_body(self, start: int = 0, stop: int = None) -> bytes:
+        """Encodes a range of rows as a `{"rows": [...]}` request body."""
+
+        return b'{"rows":[' + b",".join(self.encode_rows(start, stop)) + b"]}"
+
+    def to_rows(self) -> List[Dict]:
+        """Materializes the buffered rows as dictionaries."""
+
+        return [json.loads(row) for row in self.encode_rows()]
+
+    def drain(self, count: int = None) -> Tuple[int, bytes]:
+        """Removes the oldest rows and returns them encoded.
+
+        ### Parameters
+        ----
+        count : int (optional, Default=None)
+            The most rows to remove. Defaults to every row.
+
+        ### Returns
+        ----
+        Tuple[int, bytes]
+            The number of rows removed and their request body.
+        """
+
+        count = len(self) if count is None else min(count, len(self))
+        body = self.to_body(0, count)
+
+        for index, values in enumerate(self._values):
+            if not isinstance(values, array):
+                self._string_bytes -= sum(map(len, values[:count]))
+            del values[:count]
+            del self._nulls[index][:count]
+
+        return count, body
+
+    def clear(self) -> None:
+        """Removes every row."""
+
+        for index, values in enumerate(self._values):
+            del values[:]
+            del self._nulls[index][:]
+        self._string_bytes = 0
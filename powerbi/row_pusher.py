@@ -0,0 +1,454 @@
+"""Batches and pushes large numbers of rows into push dataset tables."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import requests
+
+from powerbi.columnar import ColumnTypes
+from powerbi.columnar import encode_default
+from powerbi.columnar import is_columnar
+from powerbi.columnar import iter_columnar_rows
+from powerbi.push_datasets import PushDatasets
+from powerbi.rate_limit import MemoryBucketStore
+from powerbi.rate_limit import RateLimitRule
+from powerbi.serialization import get_serializer
+
+logger = logging.getLogger(__name__)
+
+_BODY_START = b'{"rows":['
+_BODY_END = b"]}"
+
+
+def encode_row(row: Dict) -> bytes:
+    """Encodes a single row as compact JSON.
+
+    ### Parameters
+    ----
+    row : Dict
+        The row, keyed by column name. Dates and times are written in
+        ISO 8601 and `Decimal` values as numbers.
+
+    ### Returns
+    ----
+    bytes
+        The UTF-8 encoded JSON object.
+    """
+
+    return get_serializer().dumps(row, default=encode_default)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Returns whether a failed row post may succeed when sent again.
+
+    Throttled (`429`) and server (`5xx`) responses and connection
+    errors are retried. Other errors, such as a `400` for rows that do
+    not match the table schema, fail the same way every time.
+    """
+
+    if isinstance(error, requests.HTTPError):
+        status_code = getattr(error.response, "status_code", None)
+        return status_code is not None and (status_code == 429 or status_code >= 500)
+
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def post_rows_with_retries(
+    push_datasets: PushDatasets,
+    dataset_id: str,
+    table_name: str,
+    group_id: Optional[str],
+    row_count: int,
+    body: bytes,
+    max_retries: int,
+    backoff_factor: float,
+    before_attempt: Callable[[], None] = None,
+    on_retry: Callable[[], None] = None,
+) -> Optional[Exception]:
+    """Posts one encoded batch, retrying transient failures with exponential backoff.
+
+    ### Parameters
+    ----
+    row_count : int
+        The number of rows in `body`, used in log messages.
+
+    body : bytes
+        The encoded `{"rows": [...]}` request body.
+
+    max_retries : int
+        Attempts made after a transient failure before giving up.
+
+    backoff_factor : float
+        The base delay between retries, doubled on every attempt.
+
+    before_attempt : Callable[[], None] (optional, Default=None)
+        Called before every attempt, for example to wait for quota.
+
+    on_retry : Callable[[], None] (optional, Default=None)
+        Called before every retry.
+
+    ### Returns
+    ----
+    Optional[Exception]
+        `None` if the batch was stored, else the error it failed with.
+    """
+
+    attempt = 0
+
+    while True:
+        if before_attempt is not None:
+            before_attempt()
+
+        try:
+            push_datasets.post_dataset_rows(
+                dataset_id=dataset_id,
+                table_name=table_name,
+                rows=body,
+                group_id=group_id,
+            )
+            return None
+        except Exception as error:  # pylint: disable=broad-except
+            if not is_retryable(error):
+                logger.error("A batch of %d rows was rejected: %s", row_count, error)
+                return error
+
+            if attempt >= max_retries:
+                logger.error("Giving up on a batch of %d rows: %s", row_count, error)
+                return error
+
+            delay = backoff_factor * (2**attempt)
+            logger.warning(
+                "Batch of %d rows failed (%s), retrying in %.1f seconds.",
+                row_count,
+                error,
+                delay,
+            )
+            if on_retry is not None:
+                on_retry()
+            time.sleep(delay)
+            attempt += 1
+
+
+@dataclass
+class FailedBatch:
+    """A batch that could not be pushed after every retry.
+
+    ### Parameters
+    ----
+    rows : int
+        The number of rows in the batch.
+
+    body : bytes
+        The encoded `{"rows": [...]}` body, so it can be resubmitted.
+
+    error : BaseException
+        The last error raised while sending it.
+    """
+
+    rows: int
+    body: bytes
+    error: BaseException
+
+
+@dataclass
+class PushReport:
+    """Progress and throughput of a `RowPusher.push` run."""
+
+    rows_sent: int = 0
+    batches_sent: int = 0
+    retries: int = 0
+    failed: List[FailedBatch] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    @property
+    def rows_failed(self) -> int:
+        """The number of rows in batches that were given up on."""
+
+        return sum(batch.rows for batch in self.failed)
+
+    @property
+    def rows_per_second(self) -> float:
+        """The number of rows pushed per second so far."""
+
+        return self.rows_sent / self.elapsed if self.elapsed else 0.0
+
+
+class RowPusher:
+    """Streams rows into a push dataset table in batches.
+
+    ### Overview
+    ----
+    Rows are encoded one at a time and cut into batches that stay
+    within both `max_rows_per_batch` and `max_batch_bytes`, so memory
+    holds at most the batches in flight no matter how long the input
+    is. Batches are sent from a thread pool, paced by per-dataset
+    sliding windows for requests per minute and rows per hour, and
+    retried with exponential backoff when they are throttled, hit a
+    server error or lose their connection. Other errors fail the
+    batch right away.
+
+    Pushing rows is not idempotent: a batch that timed out after the
+    service stored it is stored again when it is retried.
+    """
+
+    MAX_ROWS_PER_POST = 10000
+    MAX_PENDING_POSTS = 5
+
+    def __init__(
+        self,
+        push_datasets: PushDatasets,
+        dataset_id: str,
+        table_name: str,
+        group_id: str = None,
+        max_rows_per_batch: int = MAX_ROWS_PER_POST,
+        max_batch_bytes: int = 15 * 1024 * 1024,
+        max_concurrency: int = MAX_PENDING_POSTS,
+        requests_per_minute: int = 120,
+        rows_per_hour: int = 1000000,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        store: object = None,
+        progress: Callable[[PushReport], None] = None,
+    ) -> None:
+        """Initializes the `RowPusher` object.
+
+        ### Parameters
+        ----
+        push_datasets : PushDatasets
+            The `PushDatasets` service used to post the rows.
+
+        dataset_id : str
+            The dataset id.
+
+        table_name : str
+            The dataset table name you want to post rows to.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        max_rows_per_batch : int (optional, Default=10000)
+            Rows per request, at most the 10,000 the API accepts.
+
+        max_batch_bytes : int (optional, Default=15728640)
+            The largest request body, in bytes.
+
+        max_concurrency : int (optional, Default=5)
+            Requests in flight at the same time. The API allows five
+            pending row requests per dataset.
+
+        requests_per_minute : int (optional, Default=120)
+            Row requests allowed per minute for the dataset.
+
+        rows_per_hour : int (optional, Default=1000000)
+            Rows allowed per hour for the dataset.
+
+        max_retries : int (optional, Default=3)
+            Attempts made after a transient failure before a batch is
+            given up on.
+
+        backoff_factor : float (optional, Default=1.0)
+            The base delay between retries, doubled on every attempt.
+
+        store : object (optional, Default=None)
+            Where the quota windows are kept. Defaults to a
+            `MemoryBucketStore`; use a `SQLiteBucketStore` to share
+            the quotas between processes pushing to the same dataset.
+
+        progress : Callable[[PushReport], None] (optional, Default=None)
+            Called after every batch with the running report.
+
+        ### Usage
+        ----
+            >>> pusher = RowPusher(
+                    push_datasets=power_bi_client.push_datasets(),
+                    dataset_id='8ea21119-fb8f-4592-b2b8-141b824a2b7e',
+                    table_name='sales_table'
+                )
+            >>> report = pusher.push(rows=read_sales())
+            >>> report.rows_per_second
+        """
+
+        self.push_datasets = push_datasets
+        self.dataset_id = dataset_id
+        self.table_name = table_name
+        self.group_id = group_id
+
+        self.max_rows_per_batch = min(max_rows_per_batch, self.MAX_ROWS_PER_POST)
+        self.max_batch_bytes = max_batch_bytes
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.store = store or MemoryBucketStore()
+        self.progress = progress
+
+        self.request_rule = RateLimitRule(
+            name=f"push_rows_requests:{dataset_id}",
+            pattern=r"/rows$",
+            limit=requests_per_minute,
+            period=60.0,
+        )
+        self.row_rule = RateLimitRule(
+            name=f"push_rows_rows:{dataset_id}",
+            pattern=r"/rows$",
+            limit=rows_per_hour,
+        )
+
+        self._report_lock = threading.Lock()
+
+    def batches(
+        self, rows: Iterable[Dict], column_types: ColumnTypes = None
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Cuts rows into encoded request bodies.
+
+        ### Parameters
+        ----
+        rows : Iterable[Dict]
+            The rows to push, keyed by column name, or a pandas
+            `DataFrame`, pyarrow `Table` or NumPy structured array.
+
+        column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+            The Power BI type of each column of columnar input.
+
+        ### Returns
+        ----
+        Iterator[Tuple[int, bytes]]
+            The number of rows and the `{"rows": [...]}` body of
+            each batch.
+        """
+
+        overhead = len(_BODY_START) + len(_BODY_END)
+        encoded: List[bytes] = []
+        size = overhead
+
+        if is_columnar(rows):
+            items = iter_columnar_rows(
+                rows, column_types=column_types, chunk_size=self.max_rows_per_batch
+            )
+        else:
+            items = (encode_row(row) for row in rows)
+
+        for item in items:
+            # One byte for the comma separating it from the previous row.
+            if encoded and (
+                len(encoded) >= self.max_rows_per_batch
+                or size + len(item) + 1 > self.max_batch_bytes
+            ):
+                yield len(encoded), _BODY_START + b",".join(encoded) + _BODY_END
+                encoded = []
+                size = overhead
+
+            encoded.append(item)
+            size += len(item) + 1
+
+        if encoded:
+            yield len(encoded), _BODY_START + b",".join(encoded) + _BODY_END
+
+    def push(self, rows: Iterable[Dict], column_types: ColumnTypes = None) -> PushReport:
+        """Pushes every row and waits for the last batch.
+
+        ### Parameters
+        ----
+        rows : Iterable[Dict]
+            Any iterable or generator of rows. It is consumed lazily,
+            only as fast as batches can be sent. A pandas `DataFrame`,
+            pyarrow `Table` or NumPy structured array is encoded
+            column-wise without building per-row dictionaries.
+
+        column_types : Dict[str, Union[ColumnDataTypes, str]] (optional, Default=None)
+            The Power BI type of each column of columnar input.
+
+        ### Returns
+        ----
+        PushReport
+            The rows and batches sent, retries, failed batches and
+            throughput.
+        """
+
+        report = PushReport()
+        pending: set[Future] = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for row_count, body in self.batches(rows, column_types=column_types):
+                # Backpressure: stop reading rows while every worker is busy.
+                if len(pending) >= self.max_concurrency:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                pending.add(executor.submit(self._send, row_count, body, report))
+
+            wait(pending)
+
+        report.elapsed = time.monotonic() - report.started
+
+        logger.info(
+            "Pushed %d rows in %d batches (%.0f rows/s), %d rows failed.",
+            report.rows_sent,
+            report.batches_sent,
+            report.rows_per_second,
+            report.rows_failed,
+        )
+
+        return report
+
+    def _acquire(self, rule: RateLimitRule, cost: float) -> None:
+        """Waits until the rule's window has room for `cost`."""
+
+        while True:
+            delay = self.store.try_acquire(rule=rule, now=time.time(), cost=cost)
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _send(self, row_count: int, body: bytes, report: PushReport) -> None:
+        """Sends one batch, retrying transient failures with exponential backoff."""
+
+        def before_attempt() -> None:
+            self._acquire(rule=self.request_rule, cost=1.0)
+            self._acquire(rule=self.row_rule, cost=row_count)
+
+        def on_retry() -> None:
+            with self._report_lock:
+                report.retries += 1
+
+        error = post_rows_with_retries(
+            push_datasets=self.push_datasets,
+            dataset_id=self.dataset_id,
+            table_name=self.table_name,
+            group_id=self.group_id,
+            row_count=row_count,
+            body=body,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            before_attempt=before_attempt,
+            on_retry=on_retry,
+        )
+
+        if error is not None:
+            with self._report_lock:
+                report.failed.append(FailedBatch(rows=row_count, body=body, error=error))
+            return
+
+        with self._report_lock:
+            report.rows_sent += row_count
+            report.batches_sent += 1
+            report.elapsed = time.monotonic() - report.started
+
+            if self.progress is not None:
+                self.progress(report)
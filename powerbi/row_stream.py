@@ -0,0 +1,298 @@
+"""A bounded row buffer that streams rows into a push dataset table."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import Iterable
+
+from powerbi.row_buffer import TypedRowBuffer
+from powerbi.row_pusher import FailedBatch
+from powerbi.row_pusher import PushReport
+from powerbi.row_pusher import post_rows_with_retries
+
+if TYPE_CHECKING:
+    from powerbi.push_datasets import PushDatasets
+    from powerbi.utils import Column
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingRowBuffer:
+    """Buffers rows for a push dataset table and posts them in the background.
+
+    ### Overview
+    ----
+    Producers call `append` from any thread. A background thread
+    posts the buffered rows through `PushDatasets.post_dataset_rows`
+    once `flush_rows` rows or `flush_bytes` bytes are buffered, or
+    `flush_interval` seconds after the previous post, whichever
+    comes first. Rows are kept in a `TypedRowBuffer` and encoded
+    only when posted.
+
+    The buffer holds at most `max_buffered_rows` rows. When the API
+    falls behind, `append` blocks until the flusher frees space,
+    which slows producers down instead of growing memory without
+    bound.
+    """
+
+    MAX_ROWS_PER_POST = 10000
+
+    def __init__(
+        self,
+        push_datasets: PushDatasets,
+        dataset_id: str,
+        table_name: str,
+        columns: Iterable[Column],
+        group_id: str = None,
+        flush_rows: int = MAX_ROWS_PER_POST,
+        flush_bytes: int = 4 * 1024 * 1024,
+        flush_interval: float = 5.0,
+        max_buffered_rows: int = 100000,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+    ) -> None:
+        """Initializes the `StreamingRowBuffer` object and starts its flusher.
+
+        ### Parameters
+        ----
+        push_datasets : PushDatasets
+            The `PushDatasets` service used to post the rows.
+
+        dataset_id : str
+            The dataset id.
+
+        table_name : str
+            The dataset table name you want to post rows to.
+
+        columns : Iterable[Column]
+            The table columns, which decide how values are stored.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        flush_rows : int (optional, Default=10000)
+            Rows buffered before a post, at most the 10,000 the API
+            accepts per request.
+
+        flush_bytes : int (optional, Default=4194304)
+            Approximate buffered bytes before a post.
+
+        flush_interval : float (optional, Default=5.0)
+            The longest a row waits in the buffer, in seconds.
+
+        max_buffered_rows : int (optional, Default=100000)
+            Rows held before `append` blocks.
+
+        max_retries : int (optional, Default=3)
+            Attempts made after a throttled, server or connection
+            error before the rows of a post are given up on. Other
+            errors are not retried.
+
+        backoff_factor : float (optional, Default=1.0)
+            The base delay between retries, doubled on every attempt.
+
+        ### Usage
+        ----
+            >>> with sales_table.stream_to(
+                    push_datasets=power_bi_client.push_datasets(),
+                    dataset_id='8ea21119-fb8f-4592-b2b8-141b824a2b7e',
+                    flush_interval=1.0
+                ) as stream:
+                    for reading in sensor.readings():
+                        stream.append(reading)
+            >>> stream.report.rows_sent
+        """
+
+        self.push_datasets = push_datasets
+        self.dataset_id = dataset_id
+        self.table_name = table_name
+        self.group_id = group_id
+
+        self.flush_rows = min(flush_rows, self.MAX_ROWS_PER_POST)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max(max_buffered_rows, self.flush_rows)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        self.report = PushReport()
+
+        self._buffer = TypedRowBuffer(columns=columns)
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._last_flush = time.monotonic()
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"powerbi-row-stream-{table_name}", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "StreamingRowBuffer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """The number of rows buffered or being posted."""
+
+        with self._condition:
+            return len(self._buffer) + self._in_flight
+
+    def append(self, row: Dict, timeout: float = None) -> None:
+        """Adds a row, waiting while the buffer is full.
+
+        ### Parameters
+        ----
+        row : Dict
+            The row, keyed by column name.
+
+        timeout : float (optional, Default=None)
+            The longest to wait for space, in seconds. Waits as long
+            as needed if omitted.
+
+        ### Raises
+        ----
+        TimeoutError:
+            If no space was freed within `timeout` seconds.
+        RuntimeError:
+            If the buffer was closed.
+        """
+
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._closed or len(self._buffer) < self.max_buffered_rows,
+                timeout=timeout,
+            ):
+                raise TimeoutError(
+                    f"The row buffer for {self.table_name} stayed full for {timeout} seconds."
+                )
+            if self._closed:
+                raise RuntimeError(f"The row buffer for {self.table_name} is closed.")
+
+            self._buffer.append(row)
+
+            if self._should_flush():
+                self._condition.notify_all()
+
+    def extend(self, rows: Iterable[Dict], timeout: float = None) -> None:
+        """Adds every row of an iterable, see `append`."""
+
+        for row in rows:
+            self.append(row, timeout=timeout)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Posts every buffered row and waits for the posts to finish.
+
+        ### Parameters
+        ----
+        timeout : float (optional, Default=None)
+            The longest to wait, in seconds.
+
+        ### Returns
+        ----
+        bool
+            `True` if the buffer was emptied in time.
+        """
+
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+
+            return self._condition.wait_for(
+                lambda: not self._thread.is_alive()
+                or (len(self._buffer) == 0 and self._in_flight == 0),
+                timeout=timeout,
+            )
+
+    def close(self, timeout: float = None) -> PushReport:
+        """Posts the remaining rows and stops the flusher.
+
+        ### Returns
+        ----
+        PushReport
+            The rows and batches sent, retries and failed batches.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout=timeout)
+        self.report.elapsed = time.monotonic() - self.report.started
+
+        return self.report
+
+    def _should_flush(self) -> bool:
+        """Whether the flusher should post now. Called with the lock held."""
+
+        pending = len(self._buffer)
+        if not pending:
+            return False
+
+        return (
+            self._closed
+            or self._flush_requested
+            or pending >= self.flush_rows
+            or self._buffer.nbytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._should_flush():
+                    if self._closed:
+                        return
+                    if self._flush_requested and self._in_flight == 0:
+                        self._flush_requested = False
+                        self._condition.notify_all()
+
+                    remaining = self.flush_interval - (time.monotonic() - self._last_flush)
+                    self._condition.wait(timeout=max(remaining, 0.01))
+
+                row_count, body = self._buffer.drain(self.flush_rows)
+                self._in_flight = row_count
+                self._last_flush = time.monotonic()
+
+                # Producers waiting for space can carry on while the rows are posted.
+                self._condition.notify_all()
+
+            self._send(row_count=row_count, body=body)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _send(self, row_count: int, body: bytes) -> None:
+        """Posts one batch, retrying transient failures with exponential backoff."""
+
+        def on_retry() -> None:
+            self.report.retries += 1
+
+        error = post_rows_with_retries(
+            push_datasets=self.push_datasets,
+            dataset_id=self.dataset_id,
+            table_name=self.table_name,
+            group_id=self.group_id,
+            row_count=row_count,
+            body=body,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            on_retry=on_retry,
+        )
+
+        if error is not None:
+            self.report.failed.append(FailedBatch(rows=row_count, body=body, error=error))
+            return
+
+        self.report.rows_sent += row_count
+        self.report.batches_sent += 1
+        self.report.elapsed = time.monotonic() - self.report.started
@@ -0,0 +1,577 @@
+"""Orchestrates the Power BI metadata scanner (workspace info) APIs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from powerbi.admin import Admin
+from powerbi.exceptions import PowerBiError
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_ids(ids: Iterable[str], size: int) -> List[List[str]]:
+    """Splits IDs into batches of at most `size` items.
+
+    ### Parameters
+    ----
+    ids : Iterable[str]
+        The IDs to split.
+
+    size : int
+        The maximum batch size.
+
+    ### Returns
+    ----
+    List[List[str]]
+        The batches, in order.
+    """
+
+    ids = list(ids)
+    return [ids[index : index + size] for index in range(0, len(ids), size)]
+
+
+class SQLiteScanStore:
+    """Keeps the last scan snapshot and its watermark in a SQLite
+    database, so incremental scans only fetch what changed."""
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Initializes the `SQLiteScanStore` object.
+
+        ### Parameters
+        ----
+        path : str
+            The path to the SQLite database file.
+
+        timeout : float (optional, Default=30.0)
+            Seconds to wait for another process to release the
+            database lock.
+        """
+
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scan_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scan_workspaces ("
+                "id TEXT PRIMARY KEY, record TEXT NOT NULL, scanned_at TEXT NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def get_watermark(self) -> Optional[str]:
+        """Returns the start time of the last successful scan, if any."""
+
+        row = (
+            self._connection()
+            .execute("SELECT value FROM scan_state WHERE key = 'watermark'")
+            .fetchone()
+        )
+
+        return row[0] if row else None
+
+    def set_watermark(self, watermark: str) -> None:
+        """Stores the start time of a successful scan."""
+
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO scan_state (key, value) VALUES ('watermark', ?)",
+                (watermark,),
+            )
+
+    def upsert(self, records: Iterable[Dict], scanned_at: str) -> None:
+        """Adds or replaces workspace records in the snapshot.
+
+        ### Parameters
+        ----
+        records : Iterable[Dict]
+            ``WorkspaceInfo`` records, keyed by their ``id``.
+
+        scanned_at : str
+            The time of the scan that produced the records.
+        """
+
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO scan_workspaces (id, record, scanned_at) "
+                "VALUES (?, ?, ?)",
+                ((record["id"], json.dumps(record), scanned_at) for record in records),
+            )
+
+    def get(self, workspace_id: str) -> Optional[Dict]:
+        """Returns the stored record of a workspace, if any."""
+
+        row = (
+            self._connection()
+            .execute("SELECT record FROM scan_workspaces WHERE id = ?", (workspace_id,))
+            .fetchone()
+        )
+
+        return json.loads(row[0]) if row else None
+
+    def snapshot(self) -> Iterator[Dict]:
+        """Streams every stored workspace record.
+
+        ### Returns
+        ----
+        Iterator[Dict]
+            The ``WorkspaceInfo`` records, ordered by workspace ID.
+        """
+
+        cursor = self._connection().execute("SELECT record FROM scan_workspaces ORDER BY id")
+        for (record,) in cursor:
+            yield json.loads(record)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM scan_workspaces").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the current thread's database connection."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class TenantScanner:
+    """Runs tenant-wide metadata scans as a pipeline.
+
+    ### Overview
+    ----
+    Workspace IDs are split into batches of 100 and submitted through
+    `Admin.post_workspace_info`, keeping up to 16 scans in flight. Each
+    scan is polled with an interval that backs off while it runs, and
+    its result is fetched the moment it succeeds, so records stream
+    out while later batches are still being scanned.
+
+    With a `checkpoint_path`, the pending and in-flight batches are
+    saved after every change, so a crashed run can resume where it
+    left off. Records from a batch that was being yielded when the
+    crash happened are delivered again, and failed batches are
+    retried on the next run.
+    """
+
+    MAX_WORKSPACES_PER_SCAN = 100
+    MAX_CONCURRENT_SCANS = 16
+
+    # `modifiedSince` only accepts times within the last 30 days.
+    MAX_MODIFIED_SINCE_AGE = timedelta(days=30)
+
+    def __init__(
+        self,
+        admin: Admin,
+        lineage: bool = True,
+        datasource_details: bool = True,
+        dataset_schema: bool = False,
+        dataset_expressions: bool = False,
+        get_artifact_users: bool = False,
+        batch_size: int = MAX_WORKSPACES_PER_SCAN,
+        max_concurrent_scans: int = MAX_CONCURRENT_SCANS,
+        poll_interval: float = 2.0,
+        max_poll_interval: float = 30.0,
+        scan_timeout: float = 3600.0,
+        checkpoint_path: str = None,
+    ) -> None:
+        """Initializes the `TenantScanner` object.
+
+        ### Parameters
+        ----
+        admin : Admin
+            The `Admin` service used to call the scanner APIs.
+
+        lineage : bool (optional, Default=True)
+            Whether to return lineage info.
+
+        datasource_details : bool (optional, Default=True)
+            Whether to return data source details.
+
+        dataset_schema : bool (optional, Default=False)
+            Whether to return dataset schema (tables, columns, measures).
+
+        dataset_expressions : bool (optional, Default=False)
+            Whether to return dataset expressions (DAX and Mashup queries).
+
+        get_artifact_users : bool (optional, Default=False)
+            Whether to return user details for Power BI items.
+
+        batch_size : int (optional, Default=100)
+            Workspaces per scan, at most 100.
+
+        max_concurrent_scans : int (optional, Default=16)
+            Scans in flight at the same time, at most 16.
+
+        poll_interval : float (optional, Default=2.0)
+            Seconds before the first status check of a scan.
+
+        max_poll_interval : float (optional, Default=30.0)
+            The longest wait between two status checks of a scan.
+
+        scan_timeout : float (optional, Default=3600.0)
+            Seconds after which an unfinished scan is given up on.
+
+        checkpoint_path : str (optional, Default=None)
+            A JSON file used to resume an interrupted run.
+
+        ### Usage
+        ----
+            >>> scanner = TenantScanner(
+                    admin=power_bi_client.admin(),
+                    dataset_schema=True,
+                    checkpoint_path="config/scan_checkpoint.json"
+                )
+            >>> for workspace in scanner.scan():
+                    print(workspace["name"])
+        """
+
+        self.admin = admin
+        self.scan_options = {
+            "lineage": lineage,
+            "datasource_details": datasource_details,
+            "dataset_schema": dataset_schema,
+            "dataset_expressions": dataset_expressions,
+            "get_artifact_users": get_artifact_users,
+        }
+
+        self.batch_size = min(batch_size, self.MAX_WORKSPACES_PER_SCAN)
+        self.max_concurrent_scans = min(max_concurrent_scans, self.MAX_CONCURRENT_SCANS)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.scan_timeout = scan_timeout
+        self.checkpoint_path = checkpoint_path
+
+        self.failed_scans: List[Dict] = []
+
+    def workspace_ids(
+        self,
+        modified_since: str = None,
+        exclude_personal_workspaces: bool = None,
+        exclude_inactive_workspaces: bool = None,
+    ) -> List[str]:
+        """Lists the workspace IDs to scan.
+
+        ### Parameters
+        ----
+        modified_since : str (optional, Default=None)
+            Only return workspaces modified after this ISO 8601 UTC
+            date-time.
+
+        exclude_personal_workspaces : bool (optional, Default=None)
+            Whether to exclude personal workspaces.
+
+        exclude_inactive_workspaces : bool (optional, Default=None)
+            Whether to exclude inactive workspaces.
+
+        ### Returns
+        ----
+        List[str]
+            The workspace IDs.
+        """
+
+        content = self.admin.get_modified_workspaces(
+            modified_since=modified_since,
+            exclude_personal_workspaces=exclude_personal_workspaces,
+            exclude_inactive_workspaces=exclude_inactive_workspaces,
+        )
+
+        return [workspace["id"] for workspace in content or []]
+
+    def scan(
+        self,
+        workspace_ids: Iterable[str] = None,
+        modified_since: str = None,
+        exclude_personal_workspaces: bool = None,
+        exclude_inactive_workspaces: bool = None,
+    ) -> Iterator[Dict]:
+        """Scans workspaces and streams one record per workspace.
+
+        ### Parameters
+        ----
+        workspace_ids : Iterable[str] (optional, Default=None)
+            The workspaces to scan. If omitted, they are listed with
+            `Admin.get_modified_workspaces`.
+
+        modified_since : str (optional, Default=None)
+            Used when listing workspaces, see `workspace_ids`.
+
+        exclude_personal_workspaces : bool (optional, Default=None)
+            Used when listing workspaces, see `workspace_ids`.
+
+        exclude_inactive_workspaces : bool (optional, Default=None)
+            Used when listing workspaces, see `workspace_ids`.
+
+        ### Returns
+        ----
+        Iterator[Dict]
+            ``WorkspaceInfo`` records, in the order scans complete.
+        """
+
+        for result in self.scan_results(
+            workspace_ids=workspace_ids,
+            modified_since=modified_since,
+            exclude_personal_workspaces=exclude_personal_workspaces,
+            exclude_inactive_workspaces=exclude_inactive_workspaces,
+        ):
+            yield from result.get("workspaces", [])
+
+    def scan_incremental(
+        self,
+        store: SQLiteScanStore,
+        exclude_personal_workspaces: bool = None,
+        exclude_inactive_workspaces: bool = None,
+    ) -> Iterator[Dict]:
+        """Rescans the workspaces modified since the last run and merges
+        them into the stored snapshot.
+
+        ### Overview
+        ----
+        The first run, or a run whose watermark is older than the 30 days
+        `modifiedSince` accepts, scans every workspace. Later runs only
+        scan the IDs returned by `Admin.get_modified_workspaces`. The
+        watermark is the time the run started, and it only moves forward
+        once every scan has succeeded, so a failed run is picked up again
+        by the next one.
+
+        With a `checkpoint_path`, a run that resumes a failed one also
+        queues the workspaces modified since the stored watermark that
+        the checkpoint does not hold yet, so moving the watermark to the
+        new start time never skips them.
+
+        ### Parameters
+        ----
+        store : SQLiteScanStore
+            Where the snapshot and the watermark are kept.
+
+        exclude_personal_workspaces : bool (optional, Default=None)
+            Whether to exclude personal workspaces.
+
+        exclude_inactive_workspaces : bool (optional, Default=None)
+            Whether to exclude inactive workspaces.
+
+        ### Returns
+        ----
+        Iterator[Dict]
+            The ``WorkspaceInfo`` records that were rescanned. The full,
+            merged snapshot is available from `store.snapshot()`.
+
+        ### Usage
+        ----
+            >>> store = SQLiteScanStore("config/scan_snapshot.db")
+            >>> changed = list(scanner.scan_incremental(store=store))
+            >>> workspaces = list(store.snapshot())
+        """
+
+        started = datetime.now(timezone.utc)
+        watermark = store.get_watermark()
+
+        if watermark and started - _parse_watermark(watermark) > self.MAX_MODIFIED_SINCE_AGE:
+            logger.warning("Watermark %s is older than 30 days, running a full scan.", watermark)
+            watermark = None
+
+        workspace_ids = self.workspace_ids(
+            modified_since=watermark,
+            exclude_personal_workspaces=exclude_personal_workspaces,
+            exclude_inactive_workspaces=exclude_inactive_workspaces,
+        )
+        logger.info(
+            "Rescanning %d workspace(s) modified since %s.", len(workspace_ids), watermark
+        )
+
+        self._merge_checkpoint(workspace_ids=workspace_ids)
+
+        scanned_at = _format_watermark(started)
+        for result in self.scan_results(workspace_ids=workspace_ids):
+            records = result.get("workspaces", [])
+            store.upsert(records=records, scanned_at=scanned_at)
+            yield from records
+
+        store.set_watermark(scanned_at)
+
+    def scan_results(
+        self,
+        workspace_ids: Iterable[str] = None,
+        modified_since: str = None,
+        exclude_personal_workspaces: bool = None,
+        exclude_inactive_workspaces: bool = None,
+    ) -> Iterator[Dict]:
+        """Scans workspaces and streams one result per completed scan.
+
+        Unlike `scan`, every result keeps the tenant-level
+        ``datasourceInstances`` and ``misconfiguredDatasourceInstances``
+        that belong to its batch.
+
+        ### Returns
+        ----
+        Iterator[Dict]
+            ``WorkspaceInfoResponse`` resources, in the order scans
+            complete.
+        """
+
+        # Failures of an earlier run are queued in its checkpoint, not here.
+        self.failed_scans = []
+        state = self._load_checkpoint()
+
+        if state is None:
+            if workspace_ids is None:
+                workspace_ids = self.workspace_ids(
+                    modified_since=modified_since,
+                    exclude_personal_workspaces=exclude_personal_workspaces,
+                    exclude_inactive_workspaces=exclude_inactive_workspaces,
+                )
+            state = {
+                "pending": chunk_ids(workspace_ids, self.batch_size),
+                "in_flight": {},
+                "completed": 0,
+            }
+            self._save_checkpoint(state)
+        else:
+            logger.info(
+                "Resuming scan: %d pending and %d in-flight batches.",
+                len(state["pending"]),
+                len(state["in_flight"]),
+            )
+
+        # Scans restored from a checkpoint are polled right away.
+        now = time.monotonic()
+        polls = {
+            scan_id: {"next_poll": now, "interval": self.poll_interval, "started": now}
+            for scan_id in state["in_flight"]
+        }
+
+        while state["pending"] or state["in_flight"]:
+            while state["pending"] and len(state["in_flight"]) < self.max_concurrent_scans:
+                batch = state["pending"].pop(0)
+                scan = self.admin.post_workspace_info(workspaces=batch, **self.scan_options)
+                state["in_flight"][scan["id"]] = batch
+                now = time.monotonic()
+                polls[scan["id"]] = {
+                    "next_poll": now + self.poll_interval,
+                    "interval": self.poll_interval,
+                    "started": now,
+                }
+                self._save_checkpoint(state)
+
+            scan_id = min(polls, key=lambda key: polls[key]["next_poll"])
+            poll = polls[scan_id]
+
+            delay = poll["next_poll"] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            status = self.admin.get_scan_status(scan_id=scan_id).get("status")
+
+            if status == "Succeeded":
+                result = self.admin.get_scan_result(scan_id=scan_id)
+                yield result
+                del polls[scan_id]
+                del state["in_flight"][scan_id]
+                state["completed"] += 1
+                self._save_checkpoint(state)
+                continue
+
+            if status == "Failed" or time.monotonic() - poll["started"] > self.scan_timeout:
+                logger.error("Scan %s ended with status %s.", scan_id, status)
+                self.failed_scans.append(
+                    {"scan_id": scan_id, "status": status, "workspaces": state["in_flight"][scan_id]}
+                )
+                del polls[scan_id]
+                del state["in_flight"][scan_id]
+                self._save_checkpoint(state)
+                continue
+
+            poll["interval"] = min(poll["interval"] * 1.5, self.max_poll_interval)
+            poll["next_poll"] = time.monotonic() + poll["interval"]
+
+        if not self.failed_scans:
+            self._clear_checkpoint()
+            return
+
+        # Queue the failed batches, so resuming from the checkpoint retries them.
+        state["pending"] = [failed["workspaces"] for failed in self.failed_scans]
+        self._save_checkpoint(state)
+
+        raise PowerBiError(
+            f"{len(self.failed_scans)} scan(s) failed, see `failed_scans` for "
+            "the affected workspaces."
+        )
+
+    def _merge_checkpoint(self, workspace_ids: List[str]) -> None:
+        """Queues the IDs a resumed checkpoint is not scanning yet."""
+
+        state = self._load_checkpoint()
+        if state is None:
+            return
+
+        queued = {
+            workspace_id
+            for batch in state["pending"] + list(state["in_flight"].values())
+            for workspace_id in batch
+        }
+        missing = [
+            workspace_id
+            for workspace_id in dict.fromkeys(workspace_ids)
+            if workspace_id not in queued
+        ]
+        if not missing:
+            return
+
+        logger.info("Adding %d workspace(s) to the resumed scan.", len(missing))
+        state["pending"].extend(chunk_ids(missing, self.batch_size))
+        self._save_checkpoint(state)
+
+    def _load_checkpoint(self) -> Dict | None:
+        if not self.checkpoint_path or not pathlib.Path(self.checkpoint_path).exists():
+            return None
+
+        with open(file=self.checkpoint_path, mode="r", encoding="utf-8") as checkpoint:
+            return json.load(fp=checkpoint)
+
+    def _save_checkpoint(self, state: Dict) -> None:
+        if not self.checkpoint_path:
+            return
+
+        # Write then rename, so a crash never leaves a half-written file.
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(file=temp_path, mode="w", encoding="utf-8") as checkpoint:
+            json.dump(obj=state, fp=checkpoint)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        if self.checkpoint_path and pathlib.Path(self.checkpoint_path).exists():
+            os.remove(self.checkpoint_path)
+
+
+def _format_watermark(value: datetime) -> str:
+    """Formats a datetime the way `modifiedSince` expects it."""
+
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond:06d}0Z"
+
+
+def _parse_watermark(value: str) -> datetime:
+    """Parses a stored watermark into an aware UTC datetime."""
+
+    return datetime.strptime(value[:26], "%Y-%m-%dT%H:%M:%S.%f").replace(tzinfo=timezone.utc)
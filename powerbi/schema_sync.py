@@ -0,0 +1,475 @@
+"""Diffs local push dataset models against the service and syncs what changed."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from powerbi.exceptions import PowerBiError
+from powerbi.push_datasets import PushDatasets
+from powerbi.utils import Dataset
+from powerbi.utils import Table
+from powerbi.utils import to_plain_object
+
+logger = logging.getLogger(__name__)
+
+# The properties compared for each column and measure. Missing, empty
+# and `False` values are treated alike, since the service omits them.
+COLUMN_FIELDS = (
+    "dataType",
+    "formatString",
+    "dataCategory",
+    "isHidden",
+    "sortByColumn",
+    "summarizeBy",
+)
+MEASURE_FIELDS = ("expression", "formatString", "isHidden")
+
+# Spellings of the same data type used by the enums and the service.
+_DATA_TYPE_ALIASES = {"bool": "boolean"}
+
+
+def _normalize(properties: Dict, fields: Iterable[str]) -> Dict:
+    normalized = {}
+
+    for name in fields:
+        value = properties.get(name)
+        if value in (None, "", False):
+            continue
+        if name == "dataType":
+            value = str(value).lower()
+            value = _DATA_TYPE_ALIASES.get(value, value)
+        normalized[name] = value
+
+    return normalized
+
+
+def _diff_items(
+    remote: List[Dict], local: List[Dict], fields: Iterable[str]
+) -> tuple:
+    """Compares two lists of named items.
+
+    ### Returns
+    ----
+    tuple
+        The added names, the removed names, and the changed items as
+        `{name: {property: [remote, local]}}`.
+    """
+
+    remote_items = {item["name"]: _normalize(item, fields) for item in remote}
+    local_items = {item["name"]: _normalize(item, fields) for item in local}
+
+    added = [name for name in local_items if name not in remote_items]
+    removed = [name for name in remote_items if name not in local_items]
+    changed = {}
+
+    for name, local_item in local_items.items():
+        remote_item = remote_items.get(name)
+        if remote_item is None or remote_item == local_item:
+            continue
+
+        changed[name] = {
+            key: [remote_item.get(key), local_item.get(key)]
+            for key in sorted(set(remote_item) | set(local_item))
+            if remote_item.get(key) != local_item.get(key)
+        }
+
+    return added, removed, changed
+
+
+@dataclass
+class TableChange:
+    """The difference between a local table and the one in the service.
+
+    ### Parameters
+    ----
+    table : str
+        The table name.
+
+    action : str
+        `add` if the table only exists locally, `update` if its
+        schema differs, `unchanged`, or `orphan` if it only exists
+        in the service. Only `add` and `update` are sent.
+
+    reason : str (optional, Default=None)
+        Why a table is updated without a column-level diff, or what
+        it was compared with if not the schema in the service.
+    """
+
+    table: str
+    action: str
+    columns_added: List[str] = field(default_factory=list)
+    columns_removed: List[str] = field(default_factory=list)
+    columns_changed: Dict[str, Dict[str, list]] = field(default_factory=dict)
+    measures_added: List[str] = field(default_factory=list)
+    measures_removed: List[str] = field(default_factory=list)
+    measures_changed: Dict[str, Dict[str, list]] = field(default_factory=dict)
+    reason: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def needs_put(self) -> bool:
+        """Whether the table schema has to be sent."""
+
+        return self.action in ("add", "update")
+
+    @property
+    def destructive(self) -> bool:
+        """Whether the update drops a column or changes its data type,
+        which can lose the data already pushed to the table."""
+
+        return bool(self.columns_removed) or any(
+            "dataType" in properties for properties in self.columns_changed.values()
+        )
+
+    def to_dict(self) -> Dict:
+        """Returns the change as a dictionary."""
+
+        change = asdict(self)
+        change["destructive"] = self.destructive
+        return change
+
+
+@dataclass
+class SchemaPlan:
+    """The table updates needed to bring a push dataset in line with a
+    local model.
+
+    ### Parameters
+    ----
+    dataset_id : str
+        The dataset ID.
+
+    group_id : str (optional)
+        The workspace ID, `None` for "My Workspace".
+
+    changes : List[TableChange]
+        One change per local or remote table.
+    """
+
+    dataset_id: str
+    group_id: Optional[str]
+    changes: List[TableChange] = field(default_factory=list)
+
+    @property
+    def puts(self) -> List[TableChange]:
+        """The changes that send a table schema."""
+
+        return [change for change in self.changes if change.needs_put]
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any table has to be sent."""
+
+        return bool(self.puts)
+
+    def to_dict(self) -> Dict:
+        """Returns the plan as a dictionary."""
+
+        return {
+            "dataset_id": self.dataset_id,
+            "group_id": self.group_id,
+            "changes": [change.to_dict() for change in self.changes],
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """Returns the plan as a JSON string."""
+
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+class SchemaSync:
+    """Sends only the push dataset tables whose schema changed.
+
+    ### Overview
+    ----
+    `put_dataset` replaces a table schema wholesale. `SchemaSync`
+    compares the local model with `PushDatasets.get_tables`, builds a
+    `SchemaPlan` of the tables that were added or changed, and sends
+    those in parallel, so a deploy costs one request per changed
+    table instead of one per table in the model.
+
+    The Get Tables API usually returns only table names. With a
+    `snapshot_path`, `apply` stores the schema of every table it sent
+    or found unchanged, and `plan` diffs against it whenever the
+    service leaves the columns out. Without one, such tables are sent
+    on every run.
+    """
+
+    def __init__(
+        self,
+        push_datasets: PushDatasets,
+        max_workers: int = 4,
+        snapshot_path: str = None,
+    ) -> None:
+        """Initializes the `SchemaSync` object.
+
+        ### Parameters
+        ----
+        push_datasets : PushDatasets
+            The `PushDatasets` service.
+
+        max_workers : int (optional, Default=4)
+            Tables sent at the same time.
+
+        snapshot_path : str (optional, Default=None)
+            A JSON file holding the last applied schema of each table.
+
+        ### Usage
+        ----
+            >>> schema_sync = SchemaSync(
+                    push_datasets=power_bi_client.push_datasets(),
+                    snapshot_path="config/schema_snapshot.json"
+                )
+            >>> plan = schema_sync.plan(dataset_id=dataset_id, model=sales_dataset)
+            >>> print(plan.to_json())
+            >>> schema_sync.apply(plan=plan, model=sales_dataset)
+        """
+
+        self.push_datasets = push_datasets
+        self.max_workers = max_workers
+        self.snapshot_path = snapshot_path
+
+    @staticmethod
+    def _local_tables(model: Union[Dataset, Table, Iterable[Table]]) -> Dict[str, Table]:
+        if isinstance(model, Dataset):
+            tables = model.tables
+        elif isinstance(model, Table):
+            tables = [model]
+        else:
+            tables = model
+
+        return {table.name: table for table in tables}
+
+    def plan(
+        self,
+        dataset_id: str,
+        model: Union[Dataset, Table, Iterable[Table]],
+        group_id: str = None,
+    ) -> SchemaPlan:
+        """Compares a local model with the tables in the service.
+
+        ### Parameters
+        ----
+        dataset_id : str
+            The dataset ID.
+
+        model : Union[Dataset, Table, Iterable[Table]]
+            The local model. Tables of the dataset that are not part of
+            it are reported as `orphan` and left alone.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        ### Returns
+        ----
+        SchemaPlan
+            One `TableChange` per table.
+        """
+
+        local_tables = self._local_tables(model)
+        remote_tables = {
+            table["name"]: table
+            for table in self.push_datasets.get_tables(
+                dataset_id=dataset_id, group_id=group_id
+            ).get("value", [])
+        }
+
+        plan = SchemaPlan(dataset_id=dataset_id, group_id=group_id)
+        snapshot = self._load_snapshot().get(_snapshot_key(dataset_id, group_id), {})
+
+        for name, table in local_tables.items():
+            remote = remote_tables.get(name)
+            reason = None
+            if remote is None:
+                plan.changes.append(TableChange(table=name, action="add"))
+                continue
+
+            if "columns" not in remote:
+                remote = snapshot.get(name)
+                reason = "Compared with the last applied schema."
+
+            if remote is None:
+                logger.warning(
+                    "The service returned no schema for table %s, so it is sent "
+                    "without a diff. Set a `snapshot_path` to diff against the "
+                    "last applied schema instead.",
+                    name,
+                )
+                plan.changes.append(
+                    TableChange(
+                        table=name,
+                        action="update",
+                        reason="The service did not return the table schema.",
+                    )
+                )
+                continue
+
+            local = to_plain_object(table.schema())
+            columns = _diff_items(remote["columns"], local["columns"], COLUMN_FIELDS)
+            measures = _diff_items(
+                remote.get("measures", []), local["measures"], MEASURE_FIELDS
+            )
+
+            change = TableChange(
+                table=name,
+                action="update" if any(columns + measures) else "unchanged",
+                columns_added=columns[0],
+                columns_removed=columns[1],
+                columns_changed=columns[2],
+                measures_added=measures[0],
+                measures_removed=measures[1],
+                measures_changed=measures[2],
+                reason=reason,
+            )
+            plan.changes.append(change)
+
+        for name in remote_tables:
+            if name not in local_tables:
+                plan.changes.append(TableChange(table=name, action="orphan"))
+
+        logger.info(
+            "Schema plan for dataset %s: %d of %d tables to send.",
+            dataset_id,
+            len(plan.puts),
+            len(local_tables),
+        )
+
+        return plan
+
+    def apply(
+        self,
+        plan: SchemaPlan,
+        model: Union[Dataset, Table, Iterable[Table]],
+        allow_destructive: bool = True,
+    ) -> SchemaPlan:
+        """Sends the tables of a plan in parallel.
+
+        ### Parameters
+        ----
+        plan : SchemaPlan
+            A plan made by `plan` for the same model.
+
+        model : Union[Dataset, Table, Iterable[Table]]
+            The local model the plan was made for.
+
+        allow_destructive : bool (optional, Default=True)
+            If `False`, updates that drop a column or change its data
+            type are skipped.
+
+        ### Returns
+        ----
+        SchemaPlan
+            The plan, with the `status` of each change set to
+            `applied`, `failed` or `skipped`. With a `snapshot_path`,
+            the schemas of applied and unchanged tables are stored.
+
+        ### Raises
+        ----
+        PowerBiError:
+            If any table failed to update, once every other table
+            was sent.
+        """
+
+        local_tables = self._local_tables(model)
+
+        def put(change: TableChange) -> None:
+            try:
+                self.push_datasets.put_dataset(
+                    dataset_id=plan.dataset_id,
+                    table_name=change.table,
+                    table=local_tables[change.table],
+                    group_id=plan.group_id,
+                )
+                change.status = "applied"
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Updating table %s failed: %s", change.table, error)
+                change.status = "failed"
+                change.error = str(error)
+
+        to_send = []
+        for change in plan.puts:
+            if change.destructive and not allow_destructive:
+                change.status = "skipped"
+                continue
+            to_send.append(change)
+
+        if to_send:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(put, to_send))
+
+        self._save_snapshot(plan=plan, local_tables=local_tables)
+
+        failed = [change.table for change in to_send if change.status == "failed"]
+        if failed:
+            raise PowerBiError(
+                f"{len(failed)} table(s) failed to update: {', '.join(failed)}. "
+                "See the `error` of each change in the plan."
+            )
+
+        return plan
+
+    def _load_snapshot(self) -> Dict:
+        if not self.snapshot_path or not pathlib.Path(self.snapshot_path).exists():
+            return {}
+
+        with open(file=self.snapshot_path, mode="r", encoding="utf-8") as snapshot:
+            return json.load(fp=snapshot)
+
+    def _save_snapshot(self, plan: SchemaPlan, local_tables: Dict[str, Table]) -> None:
+        if not self.snapshot_path:
+            return
+
+        snapshot = self._load_snapshot()
+        tables = snapshot.setdefault(_snapshot_key(plan.dataset_id, plan.group_id), {})
+        for change in plan.changes:
+            if change.status == "applied" or change.action == "unchanged":
+                tables[change.table] = to_plain_object(local_tables[change.table].schema())
+
+        # Write then rename, so a crash never leaves a half-written file.
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(file=temp_path, mode="w", encoding="utf-8") as snapshot_file:
+            json.dump(obj=snapshot, fp=snapshot_file)
+        os.replace(temp_path, self.snapshot_path)
+
+    def sync(
+        self,
+        dataset_id: str,
+        model: Union[Dataset, Table, Iterable[Table]],
+        group_id: str = None,
+        allow_destructive: bool = True,
+        dry_run: bool = False,
+    ) -> SchemaPlan:
+        """Plans and, unless `dry_run`, applies the schema changes.
+
+        ### Returns
+        ----
+        SchemaPlan
+            The plan, with the outcome of each change.
+        """
+
+        plan = self.plan(dataset_id=dataset_id, model=model, group_id=group_id)
+
+        if dry_run:
+            return plan
+
+        return self.apply(plan=plan, model=model, allow_destructive=allow_destructive)
+
+
+def _snapshot_key(dataset_id: str, group_id: Optional[str]) -> str:
+    """Keys the snapshot by workspace and dataset, "me" being "My Workspace"."""
+
+    return f"{group_id or 'me'}/{dataset_id}"
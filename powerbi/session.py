@@ -2,21 +2,76 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
 import logging
+import time
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from typing import Dict
+from typing import Iterator
+from typing import Tuple
 
 import requests
 
+from powerbi.adapters import PowerBiHTTPAdapter
+from powerbi.adapters import keepalive_socket_options
+from powerbi.cache import MUTATING_METHODS
+from powerbi.cache import CacheEntry
+from powerbi.cache import ResponseCache
+from powerbi.rate_limit import RateLimiter
+from powerbi.retry import RetryPolicy
+from powerbi.retry import RetryStats
+from powerbi.retry import current_retry_policy_override
+from powerbi.serialization import get_serializer
+from powerbi.utils import encode_powerbi_object
+
 logger = logging.getLogger(__name__)
 
 
+def token_identity(token: str) -> str:
+    """Identifies the caller of an access token, for keying cached responses.
+
+    ### Parameters
+    ----
+    token : str
+        The access token. Azure AD tokens are JWTs, whose tenant
+        (`tid`) and object (`oid`) claims identify the user or service
+        principal across token refreshes.
+
+    ### Returns
+    ----
+    str
+        `<tid>:<oid>`, or a hash of the token if it carries no such
+        claims, which is unique to the token.
+    """
+
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return f"{claims['tid']}:{claims.get('oid') or claims['sub']}"
+    except (IndexError, KeyError, TypeError, ValueError):
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
 class PowerBiSession:
     """Serves as the Session for the Current Microsoft
     Power Bi API."""
 
-    def __init__(self, client: object) -> None:
+    def __init__(
+        self,
+        client: object,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = False,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        cache: ResponseCache = None,
+        serializer: object = None,
+    ) -> None:
         """Initializes the `PowerBiSession` client.
 
         ### Overview:
@@ -28,6 +83,36 @@ class PowerBiSession:
         ----
         client (str): The Microsoft Power BI API Python Client.
 
+        pool_connections (int): The number of host connection pools
+            to cache, by default 10.
+
+        pool_maxsize (int): The maximum number of connections kept
+            open per host, by default 10. Size it to the number of
+            threads sharing the session.
+
+        pool_block (bool): If `True`, threads wait for a pooled
+            connection instead of opening throwaway ones once
+            `pool_maxsize` is reached, by default `False`.
+
+        tcp_keepalive (bool): If `True`, enables TCP keep-alive probes
+            so idle pooled connections are not dropped by intermediate
+            network devices, by default `False`.
+
+        retry_policy (RetryPolicy): The policy used to retry throttled
+            (`429`) and unavailable (`503`) responses, by default
+            `RetryPolicy()`. Pass `RetryPolicy(max_retries=0)` to
+            disable retries.
+
+        rate_limiter (RateLimiter): Paces requests to stay within the
+            per-endpoint quotas, by default `None` (no limiting).
+
+        cache (ResponseCache): Serves repeated `GET` requests from a
+            cache, by default `None` (no caching).
+
+        serializer (object): Encodes request bodies and decodes
+            responses, by default the fastest serializer installed,
+            see `get_serializer`.
+
         ### Usage:
         ----
             >>> power_bi_session = PowerBiSession()
@@ -41,8 +126,23 @@ class PowerBiSession:
         self.resource_url = "https://api.powerbi.com/"
         self.version = "v1.0/"
 
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.serializer = serializer or get_serializer()
+        self._cache_identity: Tuple[str, str] | None = None
+
+        self._adapter = PowerBiHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            socket_options=keepalive_socket_options() if tcp_keepalive else None,
+        )
+
         self._session = requests.Session()
         self._session.verify = True
+        self._session.mount("https://", self._adapter)
 
     def build_headers(self) -> Dict:
         """Used to build the headers needed to make the request.
@@ -58,11 +158,9 @@ class PowerBiSession:
             A dictionary containing all the components.
         """
 
-        # Ensure the access token is still valid before making a request.
-        self.client._token_validation()
-
+        # The auth client refreshes the token first if it is about to expire.
         headers = {
-            "Authorization": f"Bearer {self.client.access_token}",
+            "Authorization": self.client.authorization_header(),
             "Content-Type": "application/json",
         }
 
@@ -86,6 +184,33 @@ class PowerBiSession:
 
         return url
 
+    def validate_endpoint(self, endpoint: str) -> None:
+        """Validates an endpoint for missing ID parameters.
+
+        ### Parameters
+        ----
+        endpoint : str
+            The API URL endpoint, example is 'myorg/datasets'.
+
+        ### Raises
+        ----
+        ValueError:
+            If the endpoint contains an empty or 'None' path segment.
+        """
+
+        path_part = endpoint.split("?")[0]
+        segments = path_part.lstrip("/").split("/")
+        if "" in segments:
+            raise ValueError(
+                f"Invalid endpoint '{endpoint}': contains an empty path segment. "
+                "Verify that all required ID parameters are non-empty strings."
+            )
+        if "None" in segments:
+            raise ValueError(
+                f"Invalid endpoint '{endpoint}': contains a 'None' path segment. "
+                "Verify that all required ID parameters are provided."
+            )
+
     def make_request(
         self,
         method: str,
@@ -94,6 +219,8 @@ class PowerBiSession:
         data: dict = None,
         json_payload: dict = None,
         files: dict = None,
+        retry_policy: RetryPolicy = None,
+        stream: bool = False,
     ) -> Dict:
         """Handles all the requests in the library.
 
@@ -127,25 +254,30 @@ class PowerBiSession:
             When provided, Content-Type is omitted so requests
             can set the multipart boundary automatically.
 
+        retry_policy : RetryPolicy
+            Overrides the session retry policy for this request.
+
+        stream : bool (optional, Default=False)
+            Leaves the body of a successful response unread and
+            returns the `requests.Response` itself, so large
+            payloads can be decoded chunk by chunk. Streamed
+            requests bypass the response cache, and the caller
+            must close the response.
+
         ### Returns:
         ----
             A Dictionary object containing the
             JSON values.
         """
 
-        # Validate endpoint for missing ID parameters.
-        path_part = endpoint.split("?")[0]
-        segments = path_part.lstrip("/").split("/")
-        if "" in segments:
-            raise ValueError(
-                f"Invalid endpoint '{endpoint}': contains an empty path segment. "
-                "Verify that all required ID parameters are non-empty strings."
-            )
-        if "None" in segments:
-            raise ValueError(
-                f"Invalid endpoint '{endpoint}': contains a 'None' path segment. "
-                "Verify that all required ID parameters are provided."
-            )
+        self.validate_endpoint(endpoint=endpoint)
+
+        if stream:
+            cache_key, cached = None, None
+        else:
+            cache_key, cached = self.cache_lookup(method=method, endpoint=endpoint, params=params)
+        if cached is not None and cached.fresh:
+            return cached.value
 
         url = self.build_url(endpoint=endpoint)
         headers = self.build_headers()
@@ -155,8 +287,15 @@ class PowerBiSession:
         if files:
             headers.pop("Content-Type", None)
 
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
         logger.info("URL: %s", url)
 
+        data, json_payload = self.encode_payload(
+            data=data, json_payload=json_payload, files=files
+        )
+
         prepared = requests.Request(
             method=method.upper(),
             headers=headers,
@@ -167,12 +306,264 @@ class PowerBiSession:
             files=files,
         ).prepare()
 
-        response: requests.Response = self._session.send(request=prepared)
+        policy = self.resolve_retry_policy(retry_policy=retry_policy)
+        attempt = 0
+        waited = 0.0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method=method, endpoint=endpoint)
+
+            response: requests.Response = self._session.send(request=prepared, stream=stream)
+
+            delay = self.next_retry_delay(
+                policy=policy,
+                method=method,
+                response=response,
+                attempt=attempt,
+                waited=waited,
+            )
+            if delay is None:
+                break
+
+            response.close()
+            time.sleep(delay)
+
+            attempt += 1
+            waited += delay
+
+            # The token may have been refreshed while we were waiting.
+            prepared.headers["Authorization"] = self.build_headers()["Authorization"]
+
+        if stream and response.ok:
+            return response
+
+        return self.cache_response(
+            method=method,
+            endpoint=endpoint,
+            response=response,
+            ok=response.ok,
+            cache_key=cache_key,
+            cached=cached,
+        )
+
+    def encode_payload(
+        self, data: dict = None, json_payload: dict = None, files: dict = None
+    ) -> Tuple[object, dict | None]:
+        """Encodes a JSON payload with the session serializer.
+
+        ### Overview:
+        ----
+        Model objects such as `Table` and `Dataset` may appear
+        anywhere in the payload and are encoded in the same pass.
+        Multipart uploads are left for the HTTP library to encode,
+        with the JSON payload as form fields.
+
+        ### Returns:
+        ----
+        Tuple[object, dict | None]:
+            The `data` and `json` to send with the request.
+        """
+
+        if json_payload is None or files:
+            return data, json_payload
+
+        return self.serializer.dumps(json_payload, default=encode_powerbi_object), None
+
+    def cache_lookup(
+        self, method: str, endpoint: str, params: dict = None
+    ) -> Tuple[str | None, CacheEntry | None]:
+        """Looks up the cached response of a request.
+
+        ### Parameters
+        ----
+        method : str
+            The request method, only `GET` requests are cached.
+
+        endpoint : str
+            The API URL endpoint.
+
+        params : dict (optional, Default=None)
+            The URL params for the request.
+
+        ### Returns
+        ----
+        Tuple[str | None, CacheEntry | None]:
+            The cache key, `None` when the request is not cached,
+            and the cached entry, which may be stale.
+        """
+
+        if self.cache is None or method.upper() != "GET":
+            return None, None
+
+        return self.cache.lookup(
+            endpoint=endpoint, params=params, identity=self.cache_identity()
+        )
+
+    def cache_identity(self) -> str:
+        """Returns the identity cached responses are keyed by.
+
+        ### Returns
+        ----
+        str
+            The caller of the current access token, see `token_identity`.
+        """
+
+        token = self.client.authorization_header().split(" ", 1)[-1]
+
+        # Decoded once per token, which is reused until it expires.
+        if self._cache_identity is None or self._cache_identity[0] != token:
+            self._cache_identity = (token, token_identity(token))
+
+        return self._cache_identity[1]
+
+    def cache_response(
+        self,
+        method: str,
+        endpoint: str,
+        response: object,
+        ok: bool,
+        cache_key: str = None,
+        cached: CacheEntry = None,
+    ) -> Dict:
+        """Maps a response and keeps the cache in sync with it.
+
+        ### Overview:
+        ----
+        Mutating requests invalidate the entries of overlapping paths,
+        a `304 Not Modified` refreshes the stale entry it revalidated,
+        and successful `GET` responses are stored.
+
+        ### Returns:
+        ----
+        Dict:
+            The mapped response, see `handle_response`.
+        """
+
+        if self.cache is None:
+            return self.handle_response(response=response, ok=ok)
+
+        if method.upper() in MUTATING_METHODS:
+            self.cache.invalidate(endpoint=endpoint)
+
+        if cached is not None and response.status_code == 304:
+            return self.cache.revalidate(key=cache_key, entry=cached)
+
+        content = self.handle_response(response=response, ok=ok)
+
+        if cache_key is not None:
+            self.cache.store(key=cache_key, value=content, etag=response.headers.get("ETag"))
+
+        return content
+
+    def resolve_retry_policy(self, retry_policy: RetryPolicy = None) -> RetryPolicy:
+        """Picks the retry policy that applies to a request.
+
+        ### Parameters
+        ----
+        retry_policy : RetryPolicy (optional, Default=None)
+            A policy passed directly to `make_request`.
+
+        ### Returns
+        ----
+        RetryPolicy:
+            The per-call policy, else the one set with
+            `use_retry_policy`, else the session policy.
+        """
+
+        return retry_policy or current_retry_policy_override() or self.retry_policy
+
+    def next_retry_delay(
+        self,
+        policy: RetryPolicy,
+        method: str,
+        response: object,
+        attempt: int,
+        waited: float,
+    ) -> float | None:
+        """Determines whether to retry a response and records the retry.
+
+        ### Parameters
+        ----
+        policy : RetryPolicy
+            The policy that applies to the request.
+
+        method : str
+            The request method.
+
+        response : object
+            A `requests.Response` or `httpx.Response` object.
+
+        attempt : int
+            The number of retries already made.
+
+        waited : float
+            The number of seconds already spent waiting.
+
+        ### Returns
+        ----
+        float | None:
+            The number of seconds to wait before retrying, or `None`
+            if the response should be returned as is.
+        """
+
+        if not policy.is_retryable(method=method, status_code=response.status_code):
+            return None
+
+        delay = policy.next_delay(
+            method=method,
+            status_code=response.status_code,
+            attempt=attempt,
+            waited=waited,
+            retry_after=response.headers.get("Retry-After"),
+        )
+
+        if delay is None:
+            self.retry_stats.record_exhausted()
+            return None
+
+        self.retry_stats.record_retry(status_code=response.status_code, delay=delay)
+
+        logger.warning(
+            "%s %s returned %s, retrying in %.1fs (retry %d of %d).",
+            method.upper(),
+            response.url,
+            response.status_code,
+            delay,
+            attempt + 1,
+            policy.max_retries,
+        )
+
+        return delay
+
+    def handle_response(self, response: object, ok: bool) -> Dict:
+        """Maps a raw HTTP response to the library's return values.
+
+        ### Overview:
+        ----
+        Shared by the synchronous and asynchronous sessions so both
+        raise the same errors and return the same payload shapes.
+
+        ### Arguments:
+        ----
+        response : object
+            A `requests.Response` or `httpx.Response` object.
+
+        ok : bool
+            Whether the response has a successful status code.
+
+        ### Returns:
+        ----
+            A Dictionary object containing the
+            JSON values.
+        """
 
         # --- error path ---
-        if not response.ok:
+        if not ok:
             try:
-                response_data = response.json() if response.content else ""
+                response_data = (
+                    self.serializer.loads(response.content) if response.content else ""
+                )
             except ValueError:
                 response_data = response.text
 
@@ -182,7 +573,7 @@ class PowerBiSession:
 
             error_dict = {
                 "error_code": response.status_code,
-                "response_url": response.url,
+                "response_url": str(response.url),
                 "response_body": response_data,
                 "response_request": redacted_headers,
                 "response_method": response.request.method,
@@ -190,8 +581,13 @@ class PowerBiSession:
 
             logger.error(msg=json.dumps(obj=error_dict, indent=4))
 
+            # `requests` calls it `reason`, `httpx` calls it `reason_phrase`.
+            reason = getattr(response, "reason", None) or getattr(
+                response, "reason_phrase", ""
+            )
+
             message = (
-                f"\033[91m{response.status_code} {response.reason}\033[0m\n"
+                f"\033[91m{response.status_code} {reason}\033[0m\n"
                 f"\033[93mURL:\033[0m {response.url}"
             )
             if response_data:
@@ -201,16 +597,122 @@ class PowerBiSession:
 
         # --- success path ---
         if not response.content:
-            return {
+            content = {
                 "message": "response successful",
                 "status_code": response.status_code,
             }
 
+            # Long running operations, such as refreshes, are only
+            # identified by their response headers.
+            for header, key in (("RequestId", "request_id"), ("Location", "location")):
+                value = response.headers.get(header)
+                if isinstance(value, str) and value:
+                    content[key] = value
+
+            return content
+
         content_type = response.headers.get("Content-Type", "")
         if content_type == "application/zip":
             return response.content
 
-        return response.json()
+        return self.serializer.loads(response.content)
+
+    def paginate(
+        self,
+        fetch_page: Callable[..., Dict],
+        page_size: int = 5000,
+        items_key: str = "value",
+        prefetch: bool = False,
+        max_items: int = None,
+    ) -> Iterator[Dict]:
+        """Streams the items of a `$top`/`$skip` paged endpoint.
+
+        ### Overview:
+        ----
+        Only one page is held in memory at a time (two with
+        `prefetch`), so arbitrarily large collections can be walked
+        in constant memory. Paging stops at the first page that
+        returns fewer than `page_size` items, so `page_size` must not
+        exceed the endpoint's maximum `$top`.
+
+        ### Arguments:
+        ----
+        fetch_page : Callable[..., Dict]
+            A callable accepting `top` and `skip` keyword arguments
+            that returns one page, usually a service method bound
+            with `functools.partial`.
+
+        page_size : int (optional, Default=5000)
+            The number of items requested per page.
+
+        items_key : str (optional, Default='value')
+            The key holding the items in each page.
+
+        prefetch : bool (optional, Default=False)
+            If `True`, the next page is fetched on a background
+            thread while the current page is being consumed.
+
+        max_items : int (optional, Default=None)
+            Stops after yielding this many items.
+
+        ### Returns:
+        ----
+        Iterator[Dict]:
+            The items of every page, in order.
+
+        ### Usage:
+        ----
+            >>> groups = power_bi_session.paginate(
+                    fetch_page=functools.partial(admin_service.get_groups, expand="users"),
+                    page_size=5000
+                )
+            >>> for group in groups:
+                    print(group["name"])
+        """
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        skip = 0
+        yielded = 0
+
+        try:
+            pending = executor.submit(fetch_page, top=page_size, skip=skip) if executor else None
+
+            while True:
+                page = pending.result() if executor else fetch_page(top=page_size, skip=skip)
+                items = page.get(items_key, []) if isinstance(page, dict) else []
+                last_page = len(items) < page_size
+                skip += len(items)
+
+                if executor and not last_page:
+                    pending = executor.submit(fetch_page, top=page_size, skip=skip)
+
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if max_items is not None and yielded >= max_items:
+                        return
+
+                if last_page:
+                    return
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def pool_stats(self) -> Dict:
+        """Returns statistics about the HTTP connection pools.
+
+        ### Returns
+        ----
+        Dict
+            Connections created and reused, idle connections,
+            in-flight requests and requests waiting on a connection.
+
+        ### Usage
+        ----
+            >>> power_bi_client.power_bi_session.pool_stats()
+        """
+
+        return self._adapter.pool_stats()
 
     def close(self) -> None:
         """Close the underlying requests session."""
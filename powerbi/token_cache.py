@@ -0,0 +1,147 @@
+"""Backends that persist the MSAL token cache between processes."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+
+from typing import Iterator
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+class MemoryTokenCacheBackend:
+    """Keeps the serialized token cache in memory, shared by every
+    thread in the process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._data: Optional[str] = None
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Holds the cache while it is read, used and written back."""
+
+        with self._lock:
+            yield
+
+    def load(self) -> Optional[str]:
+        """Returns the serialized cache, if any."""
+
+        return self._data
+
+    def save(self, data: str) -> None:
+        """Stores the serialized cache."""
+
+        self._data = data
+
+
+class FileTokenCacheBackend:
+    """Keeps the serialized token cache in a file, guarded by an
+    exclusive lock file so processes on the same machine can share it."""
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Initializes the `FileTokenCacheBackend` object.
+
+        ### Parameters
+        ----
+        path : str
+            The path to the token cache file. The lock is kept in
+            `<path>.lock`.
+
+        timeout : float (optional, Default=30.0)
+            Seconds to wait for another process to release the lock.
+
+        ### Usage
+        ----
+            >>> backend = FileTokenCacheBackend("config/token_cache.bin")
+        """
+
+        self.path = path
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Holds the cache while it is read, used and written back.
+
+        ### Raises
+        ----
+        TimeoutError:
+            If the lock is not released within `timeout` seconds.
+        """
+
+        with self._thread_lock:
+            with open(file=f"{self.path}.lock", mode="a+", encoding="utf-8") as lock_file:
+                deadline = time.monotonic() + self.timeout
+
+                while True:
+                    try:
+                        _lock_file(lock_file)
+                        break
+                    except OSError as error:
+                        if time.monotonic() >= deadline:
+                            raise TimeoutError(
+                                f"Timed out waiting for the token cache lock {lock_file.name}."
+                            ) from error
+                        time.sleep(0.05)
+
+                try:
+                    yield
+                finally:
+                    _unlock_file(lock_file)
+
+    def load(self) -> Optional[str]:
+        """Returns the serialized cache, if the file exists."""
+
+        if not os.path.exists(self.path):
+            return None
+
+        with open(file=self.path, mode="r", encoding="utf-8") as cache_file:
+            return cache_file.read()
+
+    def save(self, data: str) -> None:
+        """Stores the serialized cache.
+
+        The file is written then renamed, so readers never see a
+        half-written cache. It holds refresh tokens, so it is only
+        readable by its owner.
+        """
+
+        temp_path = f"{self.path}.tmp"
+
+        # A temp file left by a crash keeps its mode when reopened.
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, mode="w", encoding="utf-8") as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, self.path)
+
+
+def _lock_file(lock_file) -> None:
+    """Takes an exclusive, non-blocking lock, raising `OSError` if held."""
+
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:  # pragma: no cover - Windows
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def _unlock_file(lock_file) -> None:
+    """Releases a lock taken with `_lock_file`."""
+
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -10,6 +10,9 @@ from dataclasses import field
 from enum import Enum
 from typing import Union
 
+from powerbi.row_buffer import TypedRowBuffer
+from powerbi.serialization import get_serializer
+
 
 # Helper function to convert Enums
 def enum_to_value(value: Union[str, Enum]) -> str:
@@ -23,6 +26,88 @@ def enum_to_value(value: Union[str, Enum]) -> str:
     return value.value if isinstance(value, Enum) else value
 
 
+def encode_powerbi_object(o: object) -> object:
+    """Converts a Power BI model object to the dictionary or list it wraps.
+
+    Passed as the `default` of a serializer, so models nested in
+    other models are encoded without an intermediate copy.
+
+    ### Parameters
+    ----
+    o : object
+        A `Column`, `Measure`, `Table`, `Dataset`, `Relationship`,
+        `DataSource` or one of their collections.
+
+    ### Raises
+    ----
+    TypeError:
+        If `o` is not a Power BI model object.
+    """
+
+    if isinstance(o, Columns):
+        return o.columns
+    if isinstance(o, Measures):
+        return o.measures
+    if isinstance(o, Column):
+        return o.column
+    if isinstance(o, Measure):
+        return o.measure
+    if isinstance(o, Dataset):
+        return o.push_dataset
+    if isinstance(o, Tables):
+        return o.tables
+    if isinstance(o, Table):
+        return o.table
+    if isinstance(o, Relationships):
+        return o.relationships
+    if isinstance(o, Relationship):
+        return o.relationship
+    if isinstance(o, DataSources):
+        return o.datasources
+    if isinstance(o, DataSource):
+        return o.data_source
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def to_plain_object(value: object) -> object:
+    """Converts Power BI model objects to plain dictionaries and lists.
+
+    ### Overview
+    ----
+    Walks the object graph once, copying containers and unwrapping
+    models and enums, instead of encoding it to JSON and parsing it
+    back. Table rows are copied shallowly, so their values are shared
+    with the original rows.
+
+    ### Parameters
+    ----
+    value : object
+        A model object, or a dictionary or list that contains them.
+
+    ### Returns
+    ----
+    object
+        The same structure built from `dict`, `list` and scalars.
+    """
+
+    if isinstance(value, dict):
+        return {key: to_plain_object(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain_object(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Table):
+        return value.to_dict()
+
+    try:
+        wrapped = encode_powerbi_object(value)
+    except TypeError:
+        return value
+
+    return to_plain_object(wrapped)
+
+
 class PowerBiEncoder(json.JSONEncoder):
     """Custom JSON Encoder for PowerBi objects."""
 
@@ -30,31 +115,12 @@ class PowerBiEncoder(json.JSONEncoder):
         super().__init__(*args, **kwargs)
 
     def default(self, o):
-        if isinstance(o, Columns):
-            return o.columns
-        if isinstance(o, Measures):
-            return o.measures
-        if isinstance(o, Column):
-            return o.column
-        if isinstance(o, Measure):
-            return o.measure
-        if isinstance(o, Dataset):
-            return o.push_dataset
-        if isinstance(o, Tables):
-            return o.tables
-        if isinstance(o, Table):
-            return o.table
-        if isinstance(o, Relationships):
-            return o.relationships
-        if isinstance(o, Relationship):
-            return o.relationship
-        if isinstance(o, DataSources):
-            return o.datasources
-        if isinstance(o, DataSource):
-            return o.data_source
-        else:
+        try:
+            return encode_powerbi_object(o)
+        except TypeError:
             return super().default(o)
 
+
 class Column:
     """
     ### Overview
@@ -63,6 +129,8 @@ class Column:
     object.
     """
 
+    __slots__ = ("column", "_owners")
+
     def __init__(self, name: str, data_type: Union[str, Enum]) -> None:
         """Initializes a new `Column` object.
 
@@ -78,6 +146,7 @@ class Column:
         if isinstance(data_type, Enum):
             data_type = data_type.value
 
+        self._owners = []
         self.column = {
             "name": name,
             "dataType": data_type,
@@ -109,6 +178,7 @@ class Column:
             The name you want the column to be.
         """
 
+        _rename_in_owners(item=self, name=name)
         self.column.update({"name": name})
 
     @property
@@ -306,6 +376,8 @@ class Measure:
     object.
     """
 
+    __slots__ = ("measure", "_owners")
+
     def __init__(self, name: str, expression: str) -> None:
         """Initializes a new `Measure` object.
 
@@ -318,6 +390,7 @@ class Measure:
             A valid DAX expression.
         """
 
+        self._owners = []
         self.measure = {
             "name": name,
             "expression": expression,
@@ -346,6 +419,7 @@ class Measure:
             The name you want the measure to be.
         """
 
+        _rename_in_owners(item=self, name=name)
         self.measure.update({"name": name})
 
     @property
@@ -458,6 +532,8 @@ class Relationship:
     object.
     """
 
+    __slots__ = ("relationship", "_owners")
+
     def __init__(
         self,
         name: str,
@@ -486,6 +562,7 @@ class Relationship:
             Name of the primary key column.
         """
 
+        self._owners = []
         self.relationship = {
             "name": name,
             "fromColumn": from_column,
@@ -517,6 +594,7 @@ class Relationship:
             to be.
         """
 
+        _rename_in_owners(item=self, name=name)
         self.relationship.update({"name": name})
 
     @property
@@ -654,67 +732,160 @@ class Relationship:
         return f"Relationship(name={self.name!r}, {self.from_table!r}.{self.from_column!r} -> {self.to_table!r}.{self.to_column!r})"
 
 
-class Columns:
+def _rename_in_owners(item: object, name: str) -> None:
+    """Re-keys an item in every collection holding it, before it is renamed.
+
+    ### Raises
+    ----
+    ValueError:
+        If one of the collections already has an item named `name`.
+    """
+
+    for owner in item._owners:
+        owner._check_name(item=item, name=name)
+
+    for owner in item._owners:
+        owner._reindex(item=item, old_name=item.name, new_name=name)
+
+
+class _NamedCollection:
     """
     ### Overview
     ----
-    Represents a collection of `Column` objects
-    that are found inside of a `PowerBiTable` object.
+    Base of the collections whose items are identified by
+    name. Items are kept in order, with a name index that is
+    updated when items are added, deleted or renamed, so
+    lookups and duplicate checks take constant time.
     """
 
+    __slots__ = ("_items", "_index")
+
+    kind = "item"
+
     def __init__(self) -> None:
-        self.columns = []
+        self._items = []
+        self._index = {}
 
-    def __setitem__(self, index: int, data: Column) -> None:
-        self.columns.append(data)
+    def __setitem__(self, index: int, data: object) -> None:
+        self.add(data)
 
-    def __getitem__(self, index: int) -> Column:
-        return self.columns[index]
+    def __getitem__(self, index: int) -> object:
+        return self._items[index]
 
     def __delitem__(self, index: int) -> None:
-        del self.columns[index]
+        removed = self._items[index]
+        del self._items[index]
+
+        for item in removed if isinstance(index, slice) else [removed]:
+            del self._index[item.name]
+            item._owners.remove(self)
 
     def __len__(self) -> int:
-        return len(self.columns)
+        return len(self._items)
 
     def __iter__(self):
-        return iter(self.columns)
+        return iter(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        """Checks for an item, or for an item with a given name."""
+
+        if isinstance(item, str):
+            return item in self._index
+
+        return self._index.get(getattr(item, "name", None)) is item
 
     def __repr__(self) -> str:
-        return f"Columns({self.columns!r})"
+        return f"{type(self).__name__}({self._items!r})"
+
+    def add(self, item: object) -> None:
+        """Appends an item.
+
+        ### Parameters
+        ----
+        item : object
+            The item to add.
+
+        ### Raises
+        ----
+        ValueError:
+            If the collection already has an item with the same name.
+        """
+
+        self._check_name(item=item, name=item.name)
+        self._items.append(item)
+        self._index[item.name] = item
+        item._owners.append(self)
+
+    def get_by_name(self, name: str, default: object = None) -> object:
+        """Returns the item with a given name.
+
+        ### Parameters
+        ----
+        name : str
+            The item name.
+
+        default : object (optional, Default=None)
+            Returned if no item has that name.
+
+        ### Usage
+        ----
+            >>> sales_table.columns.get_by_name('partner_sales')
+        """
+
+        return self._index.get(name, default)
+
+    def names(self) -> list:
+        """Returns the item names, in order."""
 
+        return [item.name for item in self._items]
 
-class Measures:
+    def _check_name(self, item: object, name: str) -> None:
+        existing = self._index.get(name)
+        if existing is not None and existing is not item:
+            raise ValueError(f"A {self.kind} named {name!r} already exists.")
+
+    def _reindex(self, item: object, old_name: str, new_name: str) -> None:
+        del self._index[old_name]
+        self._index[new_name] = item
+
+
+class Columns(_NamedCollection):
     """
     ### Overview
     ----
-    Represents a collection of `Measure` objects
+    Represents a collection of `Column` objects
     that are found inside of a `PowerBiTable` object.
     """
 
-    def __init__(self) -> None:
-        self.measures = []
+    __slots__ = ()
 
-    def __setitem__(self, index: int, data: Measure) -> None:
-        self.measures.append(data)
+    kind = "column"
 
-    def __getitem__(self, index: int) -> Measure:
-        return self.measures[index]
+    @property
+    def columns(self) -> list:
+        """The `Column` objects, in order."""
+        return self._items
 
-    def __delitem__(self, index: int) -> None:
-        del self.measures[index]
 
-    def __len__(self) -> int:
-        return len(self.measures)
+class Measures(_NamedCollection):
+    """
+    ### Overview
+    ----
+    Represents a collection of `Measure` objects
+    that are found inside of a `PowerBiTable` object.
+    """
 
-    def __iter__(self):
-        return iter(self.measures)
+    __slots__ = ()
 
-    def __repr__(self) -> str:
-        return f"Measures({self.measures!r})"
+    kind = "measure"
+
+    @property
+    def measures(self) -> list:
+        """The `Measure` objects, in order."""
+        return self._items
 
 
-class Relationships:
+class Relationships(_NamedCollection):
     """
     ### Overview
     ----
@@ -722,29 +893,17 @@ class Relationships:
     that are found inside of a `PowerBiDataset` object.
     """
 
-    def __init__(self) -> None:
-        self.relationships = []
-
-    def __setitem__(self, index: int, data: Relationship) -> None:
-        self.relationships.append(data)
+    __slots__ = ()
 
-    def __getitem__(self, index: int) -> Relationship:
-        return self.relationships[index]
-
-    def __delitem__(self, index: int) -> None:
-        del self.relationships[index]
-
-    def __len__(self) -> int:
-        return len(self.relationships)
-
-    def __iter__(self):
-        return iter(self.relationships)
+    kind = "relationship"
 
-    def __repr__(self) -> str:
-        return f"Relationships({self.relationships!r})"
+    @property
+    def relationships(self) -> list:
+        """The `Relationship` objects, in order."""
+        return self._items
 
 
-class Tables:
+class Tables(_NamedCollection):
     """
     ### Overview
     ----
@@ -753,26 +912,14 @@ class Tables:
     object.
     """
 
-    def __init__(self) -> None:
-        self.tables = []
-
-    def __setitem__(self, index: int, data: "Table") -> None:
-        self.tables.append(data)
-
-    def __getitem__(self, index: int) -> "Table":
-        return self.tables[index]
-
-    def __delitem__(self, index: int) -> None:
-        del self.tables[index]
-
-    def __len__(self) -> int:
-        return len(self.tables)
+    __slots__ = ()
 
-    def __iter__(self):
-        return iter(self.tables)
+    kind = "table"
 
-    def __repr__(self) -> str:
-        return f"Tables({self.tables!r})"
+    @property
+    def tables(self) -> list:
+        """The `Table` objects, in order."""
+        return self._items
 
 
 class DataSources:
@@ -784,6 +931,8 @@ class DataSources:
     object.
     """
 
+    __slots__ = ("datasources",)
+
     def __init__(self) -> None:
         self.datasources = []
 
@@ -811,6 +960,8 @@ class Table:
     dataset.
     """
 
+    __slots__ = ("_columns", "_measures", "table", "_owners")
+
     def __init__(self, name: str) -> None:
         """Initializes the `Table` object.
 
@@ -822,6 +973,7 @@ class Table:
             of the table.
         """
 
+        self._owners = []
         self._columns = Columns()
         self._measures = Measures()
 
@@ -878,6 +1030,7 @@ class Table:
             of the table.
         """
 
+        _rename_in_owners(item=self, name=name)
         self.table.update({"name": name})
 
     @property
@@ -1041,13 +1194,112 @@ class Table:
 
         return self.table.get("rows", [])[index]
 
+    def row_buffer(self) -> TypedRowBuffer:
+        """Creates a typed, column-oriented buffer for rows of this table.
+
+        ### Overview
+        ----
+        The buffer stores each column in an array typed by its
+        `Column.data_type`, using several times less memory than
+        `add_row`, and is passed to `post_dataset_rows` as is.
+
+        ### Returns
+        ----
+        TypedRowBuffer
+            An empty buffer with the table's current columns.
+
+        ### Usage
+        ----
+            >>> buffer = sales_table.row_buffer()
+            >>> buffer.extend(read_sales())
+            >>> push_datasets_service.post_dataset_rows(
+                    dataset_id=dataset_id, table_name=sales_table.name, rows=buffer
+                )
+        """
+
+        return TypedRowBuffer(columns=self._columns)
+
+    def stream_to(
+        self,
+        push_datasets: object,
+        dataset_id: str,
+        group_id: str = None,
+        **kwargs,
+    ) -> object:
+        """Creates a buffer that posts rows of this table in the background.
+
+        ### Parameters
+        ----
+        push_datasets : PushDatasets
+            The `PushDatasets` service used to post the rows.
+
+        dataset_id : str
+            The dataset id.
+
+        group_id : str (optional, Default=None)
+            The workspace id. If not provided, uses "My Workspace".
+
+        **kwargs :
+            Any other `StreamingRowBuffer` argument, such as
+            `flush_interval` or `max_buffered_rows`.
+
+        ### Returns
+        ----
+        StreamingRowBuffer
+            A started buffer. Close it, or use it as a context
+            manager, to post the last rows.
+
+        ### Usage
+        ----
+            >>> with sales_table.stream_to(
+                    push_datasets=power_bi_client.push_datasets(),
+                    dataset_id='8ea21119-fb8f-4592-b2b8-141b824a2b7e'
+                ) as stream:
+                    stream.append({'partner_name': 'Alex Reed', 'partner_sales': 1000.30})
+        """
+
+        from powerbi.row_stream import (  # pylint: disable=import-outside-toplevel
+            StreamingRowBuffer,
+        )
+
+        return StreamingRowBuffer(
+            push_datasets=push_datasets,
+            dataset_id=dataset_id,
+            table_name=self.name,
+            columns=self._columns,
+            group_id=group_id,
+            **kwargs,
+        )
+
     def to_dict(self) -> dict:
         """Returns the table properties as a dictionary."""
-        return json.loads(s=json.dumps(obj=self.table, cls=PowerBiEncoder))
+        return {
+            key: [dict(row) for row in value] if key == "rows" else to_plain_object(value)
+            for key, value in self.table.items()
+        }
+
+    def schema(self) -> dict:
+        """Returns the table without its rows, as sent to the API.
+
+        ### Overview
+        ----
+        The view shares the table's columns and measures rather than
+        copying them, and is encoded by the session serializer in a
+        single pass when passed as a request payload.
+
+        ### Returns
+        ----
+        dict
+            The table properties except `rows`.
+        """
+
+        return {key: value for key, value in self.table.items() if key != "rows"}
 
     def to_json(self) -> str:
         """Returns the table properties as a JSON formatted string."""
-        return json.dumps(obj=self.table, cls=PowerBiEncoder)
+        return get_serializer().dumps(
+            self.table, default=encode_powerbi_object
+        ).decode("utf-8")
 
 
 class Dataset:
@@ -1059,6 +1311,8 @@ class Dataset:
     sources.
     """
 
+    __slots__ = ("_tables", "_relationships", "_data_sources", "push_dataset")
+
     def __init__(self, name: str, tables: Tables) -> None:
         """Initializes the `Dataset` object.
 
@@ -1321,18 +1575,22 @@ class Dataset:
         copy_push_dataset = self.push_dataset.copy()
         del copy_push_dataset["datasources"]
 
-        for table in copy_push_dataset["tables"]:
-            del table["rows"]
+        copy_push_dataset["tables"] = [
+            table.schema() if isinstance(table, Table) else table
+            for table in copy_push_dataset["tables"]
+        ]
 
         return copy_push_dataset
 
     def to_dict(self) -> dict:
         """Converts the Object to dict."""
-        return json.loads(s=json.dumps(obj=self.push_dataset, cls=PowerBiEncoder))
+        return to_plain_object(self.push_dataset)
 
     def to_json(self) -> str:
         """Converts the Object to JSON string."""
-        return json.dumps(obj=self.push_dataset, cls=PowerBiEncoder)
+        return get_serializer().dumps(
+            self.push_dataset, default=encode_powerbi_object
+        ).decode("utf-8")
 
 
 class DataSource:
@@ -1343,6 +1601,8 @@ class DataSource:
     of a `PowerBiDataset` object.
     """
 
+    __slots__ = ("data_source",)
+
     def __init__(self, data_source_type: Union[str, Enum]) -> None:
         """Initializes the `DataSource` object.
 
@@ -1429,7 +1689,9 @@ class DataSource:
             The resource itself as a JSON string.
         """
 
-        return json.dumps(obj=self.data_source, cls=PowerBiEncoder)
+        return get_serializer().dumps(
+            self.data_source, default=encode_powerbi_object
+        ).decode("utf-8")
 
 
 @dataclass
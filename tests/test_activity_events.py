@@ -0,0 +1,81 @@
+"""Tests for streaming activity events across multiple UTC days."""
+
+import json
+from datetime import date
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.admin import Admin, utc_day_windows
+from powerbi.concurrency import iter_concurrently
+
+
+class TestUtcDayWindows:
+    def test_splits_range_on_day_boundaries(self):
+        windows = utc_day_windows("2024-01-01T10:00:00Z", "2024-01-02T05:00:00Z")
+        assert windows == [
+            ("'2024-01-01T10:00:00.000Z'", "'2024-01-01T23:59:59.999Z'"),
+            ("'2024-01-02T00:00:00.000Z'", "'2024-01-02T05:00:00.000Z'"),
+        ]
+
+    def test_date_end_is_inclusive(self):
+        windows = utc_day_windows(date(2024, 1, 1), date(2024, 1, 28))
+        assert len(windows) == 28
+        assert windows[-1][1] == "'2024-01-28T23:59:59.999Z'"
+
+
+class TestIterConcurrently:
+    def test_yields_every_item(self):
+        producers = [lambda n=n: range(n * 10, n * 10 + 5) for n in range(6)]
+        items = sorted(iter_concurrently(producers, max_workers=3, buffer_size=2))
+        assert items == sorted(i for n in range(6) for i in range(n * 10, n * 10 + 5))
+
+    def test_reraises_producer_errors(self):
+        def broken():
+            yield 1
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(iter_concurrently([broken]))
+
+
+class TestIterActivityEvents:
+    def _admin(self):
+        def get_activity_events(start_date_time=None, end_date_time=None,
+                                continuation_token=None, filter_by=None):
+            if continuation_token is None:
+                day = start_date_time[1:11]
+                return {
+                    "activityEventEntities": [{"day": day, "n": 0}],
+                    "continuationToken": f"{day}-token",
+                    "lastResultSet": False,
+                }
+            day = continuation_token[1:11]
+            return {
+                "activityEventEntities": [{"day": day, "n": 1}],
+                "continuationToken": None,
+                "lastResultSet": True,
+            }
+
+        admin = Admin(session=MagicMock())
+        admin.get_activity_events = MagicMock(side_effect=get_activity_events)
+        return admin
+
+    def test_follows_continuation_tokens_per_day(self):
+        admin = self._admin()
+        events = list(admin.iter_activity_events(date(2024, 1, 1), date(2024, 1, 3)))
+
+        assert len(events) == 6
+        for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+            assert [e["n"] for e in events if e["day"] == day] == [0, 1]
+        admin.get_activity_events.assert_any_call(continuation_token="'2024-01-01-token'")
+
+    def test_writes_ndjson(self, tmp_path):
+        admin = self._admin()
+        path = tmp_path / "events.ndjson"
+        events = list(
+            admin.iter_activity_events(date(2024, 1, 1), date(2024, 1, 1), ndjson_path=str(path))
+        )
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == events
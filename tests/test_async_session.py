@@ -0,0 +1,163 @@
+"""Tests for the AsyncPowerBiSession and AsyncPowerBiClient classes."""
+
+import asyncio
+
+import pytest
+import requests
+from unittest.mock import patch
+
+httpx = pytest.importorskip("httpx")
+
+from powerbi.async_client import AsyncPowerBiClient
+from powerbi.async_session import AsyncPowerBiSession
+from powerbi.auth import PowerBiAuth
+from powerbi.cache import ResponseCache
+from powerbi.datasets import Datasets
+
+
+def _session_with_transport(mock_auth, handler):
+    session = AsyncPowerBiSession(client=mock_auth)
+    session._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return session
+
+
+class TestAsyncMakeRequest:
+    """Tests for AsyncPowerBiSession.make_request()."""
+
+    def test_returns_json(self, mock_auth):
+        def handler(request):
+            assert request.headers["Authorization"] == "Bearer fake-access-token"
+            return httpx.Response(200, json={"value": [{"id": "ds-1"}]})
+
+        session = _session_with_transport(mock_auth, handler)
+        result = asyncio.run(session.make_request(method="get", endpoint="myorg/datasets"))
+        assert result == {"value": [{"id": "ds-1"}]}
+
+    def test_empty_response_returns_success_dict(self, mock_auth):
+        session = _session_with_transport(mock_auth, lambda request: httpx.Response(200))
+        result = asyncio.run(session.make_request(method="delete", endpoint="myorg/datasets/x"))
+        assert result["status_code"] == 200
+
+    def test_drops_none_params(self, mock_auth):
+        def handler(request):
+            assert dict(request.url.params) == {"$top": "5"}
+            return httpx.Response(200, json={})
+
+        session = _session_with_transport(mock_auth, handler)
+        asyncio.run(
+            session.make_request(
+                method="get", endpoint="myorg/groups", params={"$top": 5, "$skip": None}
+            )
+        )
+
+    def test_serves_cached_gets(self, mock_auth):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"value": []})
+
+        session = _session_with_transport(mock_auth, handler)
+        session.cache = ResponseCache()
+
+        async def run():
+            await session.make_request(method="get", endpoint="myorg/groups")
+            return await session.make_request(method="get", endpoint="myorg/groups")
+
+        assert asyncio.run(run()) == {"value": []}
+        assert len(calls) == 1
+
+    def test_rejects_invalid_endpoint_eagerly(self, mock_auth):
+        session = AsyncPowerBiSession(client=mock_auth)
+        with pytest.raises(ValueError, match="'None' path segment"):
+            session.make_request(method="get", endpoint="myorg/datasets/None")
+
+    def test_raises_http_error(self, mock_auth):
+        session = _session_with_transport(
+            mock_auth, lambda request: httpx.Response(404, json={"error": "not found"})
+        )
+        with pytest.raises(requests.HTTPError) as exc_info:
+            asyncio.run(session.make_request(method="get", endpoint="myorg/datasets/bad"))
+        assert exc_info.value.response.status_code == 404
+
+    def test_stream_returns_the_unread_response(self, mock_auth):
+        session = _session_with_transport(
+            mock_auth, lambda request: httpx.Response(200, content=b'{"results":[]}')
+        )
+
+        async def run():
+            response = await session.make_request(
+                method="post", endpoint="myorg/datasets/x/executeQueries", stream=True
+            )
+            body = b"".join([chunk async for chunk in response.aiter_bytes()])
+            await response.aclose()
+            return body
+
+        assert asyncio.run(run()) == b'{"results":[]}'
+
+    def test_stream_raises_http_error(self, mock_auth):
+        session = _session_with_transport(
+            mock_auth, lambda request: httpx.Response(400, json={"error": "bad query"})
+        )
+        with pytest.raises(requests.HTTPError):
+            asyncio.run(
+                session.make_request(
+                    method="post", endpoint="myorg/datasets/x/executeQueries", stream=True
+                )
+            )
+
+    def test_pool_stats_reports_the_httpx_pool(self, mock_auth):
+        session = AsyncPowerBiSession(client=mock_auth, max_connections=4)
+
+        stats = session.pool_stats()
+
+        assert stats["max_connections"] == 4
+        assert stats["connections"] == 0
+        assert stats["in_flight"] == 0
+        assert stats["waiting"] == 0
+
+    def test_pool_stats_counts_requests_in_flight(self, mock_auth):
+        seen = []
+
+        def handler(request):
+            seen.append(session.pool_stats()["in_flight"])
+            return httpx.Response(200, json={})
+
+        session = _session_with_transport(mock_auth, handler)
+        asyncio.run(session.make_request(method="get", endpoint="myorg/groups"))
+
+        assert seen == [1]
+        assert session.pool_stats()["in_flight"] == 0
+        assert session.pool_stats()["peak_in_flight"] == 1
+
+
+class TestAsyncPowerBiClient:
+    """Tests for the AsyncPowerBiClient facade."""
+
+    def test_services_share_async_session(self):
+        with patch.object(PowerBiAuth, "login"):
+            client = AsyncPowerBiClient(
+                client_id="test-client-id",
+                client_secret="test-client-secret",
+                redirect_uri="https://localhost:44300/",
+                scope=["https://analysis.windows.net/powerbi/api/.default"],
+            )
+
+        assert isinstance(client.power_bi_session, AsyncPowerBiSession)
+        assert isinstance(client.datasets(), Datasets)
+        assert client.datasets().power_bi_session is client.power_bi_session
+        asyncio.run(client.close())
+
+    def test_sync_with_is_rejected(self):
+        with patch.object(PowerBiAuth, "login"):
+            client = AsyncPowerBiClient(
+                client_id="test-client-id",
+                client_secret="test-client-secret",
+                redirect_uri="https://localhost:44300/",
+                scope=["https://analysis.windows.net/powerbi/api/.default"],
+            )
+
+        with pytest.raises(TypeError, match="async with"):
+            with client:
+                pass
+        asyncio.run(client.close())
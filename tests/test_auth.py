@@ -1,6 +1,7 @@
 """Tests for the PowerBiAuth class."""
 
 import json
+import threading
 import time
 
 import pytest
@@ -170,6 +171,62 @@ class TestGrabRefreshToken:
             auth.grab_refresh_token()
 
 
+class TestTokenValidation:
+    """Tests for single-flight and background token refresh."""
+
+    def _expire(self, auth):
+        auth.access_token = "old-access"
+        auth.refresh_token = "refresh"
+        auth.token_dict = {"expires_in": time.time(), "ext_expires_in": time.time() + 7200}
+
+    def _refresh(self, auth):
+        auth.access_token = "new-access"
+        auth.token_dict = {
+            "expires_in": time.time() + 3600,
+            "ext_expires_in": time.time() + 7200,
+        }
+
+    def test_valid_token_is_not_refreshed(self, auth):
+        self._refresh(auth)
+        with patch.object(auth, "grab_refresh_token") as mock_refresh:
+            assert auth.authorization_header() == "Bearer new-access"
+            mock_refresh.assert_not_called()
+
+    def test_concurrent_threads_refresh_once(self, auth):
+        self._expire(auth)
+        calls = []
+
+        def slow_refresh():
+            calls.append(1)
+            time.sleep(0.05)
+            self._refresh(auth)
+
+        with patch.object(auth, "grab_refresh_token", side_effect=slow_refresh):
+            threads = [threading.Thread(target=auth._token_validation) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+        assert auth.access_token == "new-access"
+
+    def test_background_refresher_renews_ahead_of_expiry(self, auth):
+        self._expire(auth)
+        refreshed = threading.Event()
+
+        def refresh():
+            self._refresh(auth)
+            refreshed.set()
+
+        with patch.object(auth, "grab_refresh_token", side_effect=refresh):
+            auth.start_token_refresher(refresh_margin=300, check_interval=0.01)
+            assert refreshed.wait(timeout=2)
+            auth.stop_token_refresher(timeout=2)
+
+        assert auth._refresher is None
+
+
 class TestLoadOrSaveCredentials:
     """Tests for PowerBiAuth._load_or_save_credentials()."""
 
@@ -0,0 +1,155 @@
+"""Tests for the response cache in powerbi/cache.py."""
+
+import base64
+import json
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from powerbi.cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+from powerbi.session import token_identity
+
+
+def _response(status_code=200, json_body=None, headers=None):
+    response = MagicMock(spec=requests.Response)
+    response.ok = status_code < 400
+    response.status_code = status_code
+    response.reason = "OK"
+    response.headers = {"Content-Type": "application/json", **(headers or {})}
+    response.content = json.dumps(json_body).encode() if json_body is not None else b""
+    response.json.return_value = json_body
+    response.url = "https://api.powerbi.com/v1.0/myorg/groups"
+    response.text = ""
+    return response
+
+
+def _token(tenant_id, object_id):
+    claims = json.dumps({"tid": tenant_id, "oid": object_id}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip("=")
+    return f"eyJhbGciOiJSUzI1NiJ9.{payload}.signature"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(max_entries=2)
+    return SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+
+
+class TestBackends:
+    def test_evicts_least_recently_used(self, backend):
+        backend.set("a", "1", 0.0, None)
+        backend.set("b", "2", 0.0, None)
+        backend.get("a")
+
+        assert backend.set("c", "3", 0.0, None) == 1
+        assert backend.get("b") is None
+        assert backend.get("a") is not None
+        assert len(backend) == 2
+
+
+class TestResponseCache:
+    def test_per_endpoint_ttls(self):
+        cache = ResponseCache(default_ttl=60, ttls={r"/refreshes$": 0, r"^myorg/groups$": 600})
+        assert cache.ttl_for("myorg/groups") == 600
+        assert cache.ttl_for("myorg/datasets/1/refreshes") == 0
+        assert cache.ttl_for("myorg/reports") == 60
+
+    def test_key_ignores_param_order_and_none(self):
+        cache = ResponseCache()
+        assert cache.make_key("myorg/groups", {"$top": 10, "$skip": 0}) == cache.make_key(
+            "myorg/groups", {"$skip": 0, "$top": 10, "$filter": None}
+        )
+
+    def test_invalidates_overlapping_paths(self):
+        cache = ResponseCache()
+        for key in ("myorg/groups/1/datasets", "myorg/groups/1/datasets/a", "myorg/groups/2/reports"):
+            cache.store(key=key, value={"value": []})
+
+        assert cache.invalidate("myorg/groups/1/datasets/a") == 2
+        assert cache.lookup("myorg/groups/2/reports")[1] is not None
+
+    def test_stale_entries_are_returned_but_not_fresh(self):
+        cache = ResponseCache(default_ttl=10)
+        cache.store(key="myorg/groups", value={"value": []}, etag='"v1"')
+
+        with patch("powerbi.cache.time.time", return_value=10**12):
+            _, entry = cache.lookup("myorg/groups")
+            assert not entry.fresh
+
+        assert cache.stats()["misses"] == 1
+        assert entry.etag == '"v1"'
+
+
+class TestSessionCache:
+    def test_serves_repeated_gets_from_cache(self, mock_session):
+        mock_session.cache = ResponseCache()
+        mock_session._session.send.return_value = _response(json_body={"value": [1]})
+
+        first = mock_session.make_request(method="get", endpoint="myorg/groups")
+        first["value"].append(2)
+        second = mock_session.make_request(method="get", endpoint="myorg/groups")
+
+        assert second == {"value": [1]}
+        assert mock_session._session.send.call_count == 1
+        assert mock_session.cache.stats()["hits"] == 1
+
+    def test_mutation_invalidates_cached_reads(self, mock_session):
+        mock_session.cache = ResponseCache()
+        mock_session._session.send.side_effect = [
+            _response(json_body={"value": []}),
+            _response(json_body={"id": "new"}),
+            _response(json_body={"value": [{"id": "new"}]}),
+        ]
+
+        mock_session.make_request(method="get", endpoint="myorg/groups")
+        mock_session.make_request(method="post", endpoint="myorg/groups", json_payload={})
+        result = mock_session.make_request(method="get", endpoint="myorg/groups")
+
+        assert result == {"value": [{"id": "new"}]}
+        assert mock_session.cache.stats()["invalidated"] == 1
+
+    def test_revalidates_stale_entries_with_etag(self, mock_session):
+        mock_session.cache = ResponseCache()
+        mock_session._session.send.side_effect = [
+            _response(json_body={"value": [1]}, headers={"ETag": '"v1"'}),
+            _response(status_code=304),
+        ]
+
+        mock_session.make_request(method="get", endpoint="myorg/groups")
+        # Expire the entry.
+        (key,) = mock_session.cache.backend.keys()
+        mock_session.cache.backend.set(key, '{"value": [1]}', 0.0, '"v1"')
+        result = mock_session.make_request(method="get", endpoint="myorg/groups")
+
+        prepared = mock_session._session.send.call_args.kwargs["request"]
+        assert prepared.headers["If-None-Match"] == '"v1"'
+        assert result == {"value": [1]}
+        assert mock_session.cache.stats()["revalidated"] == 1
+
+    def test_token_identity_reads_tenant_and_object_ids(self):
+        assert token_identity(_token("tenant-1", "user-1")) == "tenant-1:user-1"
+        assert token_identity("opaque-token") != token_identity("other-token")
+
+    def test_shared_backend_is_keyed_by_identity(self, mock_session, tmp_path):
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        mock_session.cache = ResponseCache(backend=backend)
+        mock_session._session.send.side_effect = [
+            _response(json_body={"value": ["alice"]}),
+            _response(json_body={"value": ["bob"]}),
+        ]
+
+        with patch.object(
+            mock_session.client, "authorization_header", return_value="Bearer " + _token("t", "alice")
+        ):
+            mock_session.make_request(method="get", endpoint="myorg/groups")
+        with patch.object(
+            mock_session.client, "authorization_header", return_value="Bearer " + _token("t", "bob")
+        ):
+            result = mock_session.make_request(method="get", endpoint="myorg/groups")
+
+        assert result == {"value": ["bob"]}
+        assert mock_session._session.send.call_count == 2
+        assert sorted(backend.keys()) == ["myorg/groups#t:alice", "myorg/groups#t:bob"]
+        backend.close()
@@ -0,0 +1,146 @@
+"""Tests for the columnar row encoders in powerbi/columnar.py."""
+
+import datetime
+import decimal
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.columnar import (
+    _encode_generic,
+    encode_columnar_body,
+    is_columnar,
+    iter_columnar_rows,
+)
+from powerbi.enums import ColumnDataTypes
+from powerbi.push_datasets import PushDatasets
+
+np = pytest.importorskip("numpy")
+
+
+def _rows(body):
+    return json.loads(body)["rows"]
+
+
+class TestIsColumnar:
+    def test_rejects_plain_rows(self):
+        assert not is_columnar([{"a": 1}])
+        assert not is_columnar(np.array([1, 2]))
+
+    def test_accepts_structured_arrays(self):
+        assert is_columnar(np.zeros(2, dtype=[("a", "i8")]))
+
+
+class TestNumpy:
+    def test_encodes_structured_array(self):
+        data = np.array(
+            [(1, 2.5, True, b"x"), (2, np.nan, False, b"y")],
+            dtype=[("id", "i8"), ("amount", "f8"), ("flag", "?"), ("code", "S1")],
+        )
+        assert _rows(encode_columnar_body(data)) == [
+            {"id": 1, "amount": 2.5, "flag": True, "code": "x"},
+            {"id": 2, "amount": None, "flag": False, "code": "y"},
+        ]
+
+    def test_datetimes_are_iso_strings(self):
+        data = np.array(
+            [(np.datetime64("2024-01-02T03:04:05"),), (np.datetime64("NaT"),)],
+            dtype=[("at", "M8[s]")],
+        )
+        assert _rows(encode_columnar_body(data)) == [
+            {"at": "2024-01-02T03:04:05.000"},
+            {"at": None},
+        ]
+
+    def test_column_types_coerce_values(self):
+        data = np.array([(1.0,), (np.nan,)], dtype=[("count", "f8")])
+        body = encode_columnar_body(data, column_types={"count": ColumnDataTypes.INT64})
+        assert body == b'{"rows":[{"count":1},{"count":null}]}'
+
+    def test_streams_in_chunks(self):
+        data = np.zeros(25, dtype=[("a", "i8")])
+        rows = list(iter_columnar_rows(data, chunk_size=10))
+        assert len(rows) == 25
+        assert rows[0] == b'{"a":0}'
+
+
+class TestPandas:
+    def test_encodes_dataframe(self):
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame(
+            {
+                "name": ['say "hi"', None],
+                "count": pd.array([1, None], dtype="Int64"),
+                "at": pd.to_datetime(["2024-01-01T00:00:00Z", None], utc=True),
+                "price": [decimal.Decimal("1.25"), decimal.Decimal("2")],
+            }
+        )
+        assert _rows(encode_columnar_body(frame)) == [
+            {"name": 'say "hi"', "count": 1, "at": "2024-01-01T00:00:00.000", "price": 1.25},
+            {"name": None, "count": None, "at": None, "price": 2.0},
+        ]
+
+    def test_encodes_nullable_string_columns(self):
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame(
+            {
+                "name": pd.array(["a", None], dtype="string"),
+                "code": pd.Series(["x", pd.NA], dtype=object),
+            }
+        )
+        assert _rows(encode_columnar_body(frame)) == [
+            {"name": "a", "code": "x"},
+            {"name": None, "code": None},
+        ]
+
+    def test_pandas_na_without_a_mask_is_null(self):
+        pd = pytest.importorskip("pandas")
+        assert _encode_generic(pd.NA) == "null"
+
+
+class TestArrow:
+    def test_encodes_table(self):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table(
+            {
+                "id": pa.array([1, None, 3]),
+                "day": pa.array([datetime.date(2024, 1, 1), None, None]),
+                "name": ["a", "b", None],
+            }
+        )
+        assert _rows(encode_columnar_body(table)) == [
+            {"id": 1, "day": "2024-01-01T00:00:00.000", "name": "a"},
+            {"id": None, "day": None, "name": "b"},
+            {"id": 3, "day": None, "name": None},
+        ]
+
+
+class TestPostDatasetRows:
+    def test_columnar_rows_are_sent_as_encoded_body(self):
+        session = MagicMock()
+        data = np.array([(1,)], dtype=[("id", "i8")])
+
+        PushDatasets(session=session).post_dataset_rows(
+            dataset_id="ds-1", table_name="sales", rows=data
+        )
+
+        assert session.make_request.call_args.kwargs["data"] == b'{"rows":[{"id":1}]}'
+
+
+class TestRowPusher:
+    def test_batches_columnar_input(self):
+        from powerbi.row_pusher import RowPusher
+
+        pusher = RowPusher(
+            push_datasets=MagicMock(),
+            dataset_id="ds-1",
+            table_name="sales",
+            max_rows_per_batch=10,
+        )
+        data = np.array([(value,) for value in range(25)], dtype=[("id", "i8")])
+
+        batches = list(pusher.batches(data))
+
+        assert [count for count, _ in batches] == [10, 10, 5]
+        assert _rows(batches[2][1]) == [{"id": value} for value in range(20, 25)]
@@ -0,0 +1,81 @@
+"""Tests for lazy imports and lazy login."""
+
+import subprocess
+import sys
+
+from unittest.mock import MagicMock, patch
+
+from powerbi.auth import PowerBiAuth
+from powerbi.client import PowerBiClient
+
+# `import powerbi` must stay well under this many microseconds.
+IMPORT_BUDGET_US = 50_000
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImports:
+    def test_import_powerbi_loads_no_dependencies(self):
+        loaded = _run(
+            "import sys, powerbi; "
+            "print(sorted(m for m in ('requests', 'msal', 'powerbi.client', 'powerbi.admin') "
+            "if m in sys.modules))"
+        )
+        assert loaded == "[]"
+
+    def test_service_modules_load_on_first_accessor_call(self):
+        loaded = _run(
+            "import sys; from powerbi import PowerBiClient; "
+            "print('powerbi.admin' in sys.modules, 'powerbi.datasets' in sys.modules)"
+        )
+        assert loaded == "False False"
+
+    def test_public_names_resolve(self):
+        import powerbi
+
+        assert powerbi.PowerBiClient is PowerBiClient
+        assert all(hasattr(powerbi, name) for name in powerbi.__all__)
+
+    def test_import_time_budget(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import powerbi"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        line = next(line for line in result.stderr.splitlines() if line.endswith("| powerbi"))
+        cumulative_us = int(line.split("|")[1])
+
+        assert cumulative_us < IMPORT_BUDGET_US
+
+
+class TestLazyLogin:
+    def test_login_is_deferred_to_first_request(self):
+        with patch.object(PowerBiAuth, "login") as mock_login:
+            client = PowerBiClient(
+                client_id="test-client-id",
+                client_secret="test-client-secret",
+                redirect_uri="https://localhost:44300/",
+                scope=["https://analysis.windows.net/powerbi/api/.default"],
+                lazy=True,
+            )
+            mock_login.assert_not_called()
+
+            def login():
+                client.power_bi_auth_client.access_token = "token"
+                client.power_bi_auth_client.token_dict = {
+                    "expires_in": 10**12,
+                    "ext_expires_in": 10**12,
+                }
+
+            mock_login.side_effect = login
+            client.power_bi_session._session = MagicMock()
+            client.power_bi_session.build_headers()
+            client.power_bi_session.build_headers()
+
+        assert mock_login.call_count == 1
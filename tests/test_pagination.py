@@ -0,0 +1,88 @@
+"""Tests for $top/$skip pagination in PowerBiSession and Admin."""
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.admin import Admin
+
+
+def _pages(total, page_size):
+    """Return a fetch_page callable serving `total` numbered items."""
+    calls = []
+
+    def fetch_page(top, skip, **kwargs):
+        calls.append({"top": top, "skip": skip, **kwargs})
+        return {"value": [{"id": i} for i in range(skip, min(skip + top, total))]}
+
+    return fetch_page, calls
+
+
+class TestPaginate:
+    def test_streams_all_items(self, mock_session):
+        fetch_page, calls = _pages(total=7, page_size=3)
+        items = list(mock_session.paginate(fetch_page=fetch_page, page_size=3))
+        assert [item["id"] for item in items] == list(range(7))
+        assert [call["skip"] for call in calls] == [0, 3, 6]
+
+    def test_exact_multiple_needs_one_empty_page(self, mock_session):
+        fetch_page, calls = _pages(total=6, page_size=3)
+        assert len(list(mock_session.paginate(fetch_page=fetch_page, page_size=3))) == 6
+        assert [call["skip"] for call in calls] == [0, 3, 6]
+
+    def test_is_lazy(self, mock_session):
+        fetch_page, calls = _pages(total=100, page_size=10)
+        iterator = mock_session.paginate(fetch_page=fetch_page, page_size=10)
+        assert calls == []
+        next(iterator)
+        assert len(calls) == 1
+
+    def test_max_items(self, mock_session):
+        fetch_page, calls = _pages(total=100, page_size=10)
+        items = list(mock_session.paginate(fetch_page=fetch_page, page_size=10, max_items=15))
+        assert len(items) == 15
+        assert len(calls) == 2
+
+    def test_prefetch_yields_same_items(self, mock_session):
+        fetch_page, _ = _pages(total=25, page_size=10)
+        items = list(mock_session.paginate(fetch_page=fetch_page, page_size=10, prefetch=True))
+        assert [item["id"] for item in items] == list(range(25))
+
+
+class TestAdminIterators:
+    def test_iter_groups_passes_filters_to_each_page(self, mock_session):
+        admin = Admin(session=mock_session)
+        mock_session.make_request = MagicMock(
+            side_effect=[{"value": [{"id": "a"}, {"id": "b"}]}, {"value": [{"id": "c"}]}]
+        )
+
+        items = list(admin.iter_groups(filter_by="state eq 'Active'", page_size=2))
+
+        assert [item["id"] for item in items] == ["a", "b", "c"]
+        second_params = mock_session.make_request.call_args_list[1].kwargs["params"]
+        assert second_params["$skip"] == 2
+        assert second_params["$top"] == 2
+        assert second_params["$filter"] == "state eq 'Active'"
+
+
+class TestAsyncPaginate:
+    def test_streams_all_items(self, mock_auth):
+        pytest.importorskip("httpx")
+        from powerbi.async_session import AsyncPowerBiSession
+
+        session = AsyncPowerBiSession(client=mock_auth)
+        fetch_page, _ = _pages(total=7, page_size=3)
+
+        async def async_fetch_page(top, skip):
+            return fetch_page(top=top, skip=skip)
+
+        async def collect():
+            return [
+                item
+                async for item in session.paginate(
+                    fetch_page=async_fetch_page, page_size=3, prefetch=True
+                )
+            ]
+
+        assert [item["id"] for item in asyncio.run(collect())] == list(range(7))
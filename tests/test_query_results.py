@@ -0,0 +1,158 @@
+"""Tests for the streaming query result decoder in powerbi/query_results.py."""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.datasets import Datasets
+from powerbi.exceptions import PowerBiError
+from powerbi.query_results import (
+    column_names,
+    iter_query_batches,
+    read_query_result,
+    split_key,
+)
+
+ROWS = [
+    {"Sales[Region]": "North {east}", "Sales[Amount]": 10.5, "Sales[Date]": "2024-01-01T00:00:00"},
+    {"Sales[Region]": 'Say "hi" \\ ]', "Sales[Amount]": 3, "Sales[Date]": "2024-01-02T00:00:00"},
+    {"Sales[Region]": "South", "Sales[Date]": "2024-01-03T00:00:00"},
+]
+
+
+def _response(rows, **extra):
+    table = {"rows": rows}
+    result = {"tables": [table]}
+    result.update(extra)
+    return json.dumps(
+        {"results": [result], "informationProtectionLabel": {"name": "General"}},
+        indent=1,
+    ).encode("utf-8")
+
+
+def _chunks(body, size):
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+class TestKeys:
+    def test_split_key(self):
+        assert split_key("Sales[Amount]") == ("Sales", "Amount")
+        assert split_key("[Total Sales]") == ("", "Total Sales")
+        assert split_key("Plain") == ("", "Plain")
+
+    def test_column_names_keep_duplicates_whole(self):
+        assert column_names(["Sales[Date]", "Date[Date]", "[Total]"]) == [
+            "Sales[Date]",
+            "Date[Date]",
+            "Total",
+        ]
+        assert column_names(["Sales[Date]"], strip_table=False) == ["Sales[Date]"]
+
+
+class TestIterQueryBatches:
+    @pytest.mark.parametrize("size", [1, 7, 64, 100000])
+    def test_decodes_across_chunk_boundaries(self, size):
+        batches = list(iter_query_batches(_chunks(_response(ROWS), size), batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [row for batch in batches for row in batch.rows] == ROWS
+        assert batches[1].keys == ["Sales[Region]", "Sales[Amount]", "Sales[Date]"]
+
+    @pytest.mark.parametrize("size", [1, 2, 100000])
+    def test_skips_a_byte_order_mark(self, size):
+        body = b"\xef\xbb\xbf" + _response(ROWS)
+
+        batches = list(iter_query_batches(_chunks(body, size)))
+
+        assert [row for batch in batches for row in batch.rows] == ROWS
+
+    def test_numbers_each_table(self):
+        body = json.dumps(
+            {"results": [{"tables": [{"rows": [{"A[x]": 1}]}, {"rows": []}, {"rows": [{"B[y]": 2}]}]}]}
+        ).encode("utf-8")
+
+        batches = list(iter_query_batches([body]))
+
+        assert [(batch.table, batch.rows) for batch in batches] == [
+            (0, [{"A[x]": 1}]),
+            (2, [{"B[y]": 2}]),
+        ]
+
+    def test_raises_query_errors(self):
+        body = _response([], error={"code": "DatasetExecuteQueriesError"})
+
+        with pytest.raises(PowerBiError, match="DatasetExecuteQueriesError"):
+            list(iter_query_batches(_chunks(body, 5)))
+
+    def test_rejects_truncated_results(self):
+        body = _response(ROWS)
+
+        with pytest.raises(ValueError, match="inside a `rows` array"):
+            list(iter_query_batches([body[:60]]))
+
+
+class TestConversions:
+    def test_to_columns_fills_left_out_values(self):
+        batch = next(iter_query_batches([_response(ROWS)]))
+
+        assert batch.to_columns() == {
+            "Region": ["North {east}", 'Say "hi" \\ ]', "South"],
+            "Amount": [10.5, 3, None],
+            "Date": ["2024-01-01T00:00:00", "2024-01-02T00:00:00", "2024-01-03T00:00:00"],
+        }
+
+    def test_to_pandas_parses_dates(self):
+        pytest.importorskip("pandas")
+        batch = next(iter_query_batches([_response(ROWS)]))
+
+        frame = batch.to_pandas()
+
+        assert list(frame.columns) == ["Region", "Amount", "Date"]
+        assert str(frame["Date"].dtype).startswith("datetime64")
+
+    def test_to_arrow_parses_dates(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        batch = next(iter_query_batches([_response(ROWS)]))
+
+        table = batch.to_arrow()
+
+        assert table.schema.field("Date").type == pyarrow.timestamp("ms")
+        assert table.column("Amount").to_pylist() == [10.5, 3.0, None]
+
+    def test_read_query_result_promotes_blank_columns(self):
+        pytest.importorskip("pyarrow")
+        rows = [{"T[a]": 1}, {"T[a]": 2, "T[b]": "x"}, {"T[a]": 3, "T[b]": "y"}]
+
+        table = read_query_result(iter_query_batches([_response(rows)], batch_size=1))
+
+        assert table.to_pydict() == {"a": [1, 2, 3], "b": [None, "x", "y"]}
+
+    def test_read_query_result_as_columns(self):
+        rows = [{"T[a]": 1}, {"T[a]": 2, "T[b]": "x"}]
+
+        columns = read_query_result(
+            iter_query_batches([_response(rows)], batch_size=1), output="columns"
+        )
+
+        assert columns == {"a": [1, 2], "b": [None, "x"]}
+
+
+class TestExecuteQueriesStream:
+    def test_streams_the_response(self):
+        session = MagicMock()
+        session.serializer = None
+        response = session.make_request.return_value
+        response.iter_content.return_value = _chunks(_response(ROWS), 16)
+
+        datasets = Datasets(session=session)
+        batches = datasets.execute_queries_stream(
+            dataset_id="ds", query="EVALUATE Sales", include_nulls=True, group_id="ws"
+        )
+
+        assert sum(len(batch) for batch in batches) == 3
+        kwargs = session.make_request.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["endpoint"] == "myorg/groups/ws/datasets/ds/executeQueries"
+        assert kwargs["json_payload"]["serializerSettings"] == {"includeNulls": True}
+        response.close.assert_called_once()
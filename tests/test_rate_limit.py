@@ -0,0 +1,131 @@
+"""Tests for the client-side rate limiter in powerbi/rate_limit.py."""
+
+import threading
+
+from unittest.mock import MagicMock, patch
+
+from powerbi.rate_limit import (
+    DEFAULT_RATE_LIMITS,
+    MemoryBucketStore,
+    RateLimiter,
+    RateLimitRule,
+    SQLiteBucketStore,
+)
+
+
+class TestRateLimitRule:
+    def test_matches_endpoint_family(self):
+        limiter = RateLimiter()
+        assert limiter.rule_for("get", "myorg/admin/groups").name == "admin_groups"
+        assert limiter.rule_for("post", "myorg/admin/workspaces/getInfo").name == "admin_workspace_info"
+        assert limiter.rule_for("get", "myorg/admin/workspaces/scanResult/abc").name == "admin_scan_result"
+        assert limiter.rule_for("get", "myorg/admin/capacities").name == "admin"
+
+    def test_unmatched_endpoints_are_not_limited(self):
+        limiter = RateLimiter()
+        assert limiter.rule_for("get", "myorg/datasets") is None
+        assert limiter.try_acquire("get", "myorg/datasets") == (None, 0.0)
+
+    def test_overrides_replace_rules_by_name(self):
+        limiter = RateLimiter().with_overrides(
+            RateLimitRule(name="admin_groups", pattern=r"^myorg/admin/groups$", limit=5)
+        )
+        assert limiter.rule_for("get", "myorg/admin/groups").limit == 5
+        assert len(limiter.rules) == len(DEFAULT_RATE_LIMITS)
+
+
+class TestBucketStores:
+    def _rule(self):
+        return RateLimitRule(name="test", pattern=r"^x$", limit=2, period=10.0)
+
+    def test_memory_store_allows_burst_then_waits(self):
+        store = MemoryBucketStore()
+        rule = self._rule()
+        assert store.try_acquire(rule, now=100.0) == 0.0
+        assert store.try_acquire(rule, now=100.0) == 0.0
+        assert store.try_acquire(rule, now=100.0) == 10.0
+        assert store.try_acquire(rule, now=105.0) == 5.0
+        assert store.try_acquire(rule, now=110.0) == 0.0
+
+    def test_no_window_exceeds_the_limit(self):
+        store = MemoryBucketStore()
+        rule = RateLimitRule(name="groups", pattern=r"^x$", limit=50, period=3600.0)
+        granted = []
+
+        now = 0.0
+        while now < 2 * 3600.0:
+            wait = store.try_acquire(rule, now=now)
+            if wait == 0.0:
+                granted.append(now)
+            now += wait or 1.0
+
+        assert len([at for at in granted if at < 3600.0]) == 50
+        for start in granted:
+            assert len([at for at in granted if start <= at < start + 3600.0]) <= 50
+
+    def test_costs_leave_the_window_oldest_first(self):
+        store = MemoryBucketStore()
+        rule = RateLimitRule(name="rows", pattern=r"^x$", limit=100, period=10.0)
+        assert store.try_acquire(rule, now=100.0, cost=60) == 0.0
+        assert store.try_acquire(rule, now=104.0, cost=30) == 0.0
+        assert store.try_acquire(rule, now=105.0, cost=50) == 5.0
+        assert store.try_acquire(rule, now=110.0, cost=50) == 0.0
+
+    def test_sqlite_store_shares_buckets_between_instances(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        rule = self._rule()
+        first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+        assert first.try_acquire(rule, now=100.0) == 0.0
+        assert second.try_acquire(rule, now=100.0) == 0.0
+        assert first.try_acquire(rule, now=100.0) == 10.0
+        assert second.try_acquire(rule, now=110.0) == 0.0
+        first.close()
+        second.close()
+
+    def test_memory_store_is_thread_safe(self):
+        store = MemoryBucketStore()
+        rule = RateLimitRule(name="test", pattern=r"^x$", limit=50, period=3600.0)
+        granted = []
+
+        def worker():
+            for _ in range(20):
+                if store.try_acquire(rule, now=100.0) == 0.0:
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(granted) == 50
+
+
+class TestRateLimiter:
+    def test_acquire_sleeps_until_the_window_has_room(self):
+        limiter = RateLimiter(
+            rules=[RateLimitRule(name="test", pattern=r"^x$", limit=1, period=10.0)]
+        )
+        with patch("powerbi.rate_limit.time.sleep") as mock_sleep, patch(
+            "powerbi.rate_limit.time.time", side_effect=[100.0, 100.0, 110.0]
+        ):
+            assert limiter.acquire("get", "x") == 0.0
+            assert limiter.acquire("get", "x") == 10.0
+
+        mock_sleep.assert_called_once_with(10.0)
+        assert limiter.stats()["test"] == {
+            "requests": 2,
+            "delayed": 1,
+            "waited_seconds": 10.0,
+        }
+
+    def test_session_acquires_before_sending(self, mock_session):
+        limiter = MagicMock()
+        mock_session.rate_limiter = limiter
+        response = MagicMock(ok=True, status_code=200, content=b"")
+        response.headers = {}
+        mock_session._session.send.return_value = response
+
+        mock_session.make_request(method="get", endpoint="myorg/admin/groups")
+
+        limiter.acquire.assert_called_once_with(method="get", endpoint="myorg/admin/groups")
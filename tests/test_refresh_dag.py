@@ -0,0 +1,200 @@
+"""Tests for the RefreshScheduler in powerbi/refresh_dag.py."""
+
+import pytest
+from unittest.mock import patch
+
+from powerbi.refresh_dag import RefreshGraph, RefreshNode, RefreshScheduler
+
+
+class FakeServices:
+    """Datasets and Dataflows services whose refreshes finish after a few polls.
+
+    `polls` maps an object ID to the number of status checks its refresh
+    stays in progress for, `fail` lists the refreshes that fail.
+    """
+
+    def __init__(self, dataflows=None, upstream=None, links=None, polls=None, fail=()):
+        self._dataflows = dataflows or {}
+        self._upstream = upstream or {}
+        self._links = links or {}
+        self.polls = polls or {}
+        self.fail = set(fail)
+        self.log = []
+        self.running = 0
+        self.peak = 0
+        self._transactions = {}
+        self._left = {}
+
+    # Dataflows
+    def get_dataflows(self, group_id):
+        return {"value": [{"objectId": dataflow_id} for dataflow_id in self._dataflows.get(group_id, [])]}
+
+    def get_upstream_dataflows_in_group(self, group_id, dataflow_id):
+        return {"value": self._upstream.get(dataflow_id, [])}
+
+    def refresh_dataflow(self, group_id, dataflow_id, notify_option):
+        self._begin(dataflow_id)
+        self._transactions.setdefault(dataflow_id, []).insert(
+            0, {"id": f"tx-{dataflow_id}", "status": "InProgress"}
+        )
+
+    def get_dataflow_transactions(self, group_id, dataflow_id):
+        transactions = self._transactions.setdefault(
+            dataflow_id, [{"id": "tx-old", "status": "Success"}]
+        )
+        if transactions[0]["status"] == "InProgress" and self._done(dataflow_id):
+            transactions[0] = {
+                "id": transactions[0]["id"],
+                "status": "Failed" if dataflow_id in self.fail else "Success",
+                "startTime": "2024-05-01T01:00:00Z",
+                "endTime": "2024-05-01T01:05:00Z",
+            }
+        return {"value": list(transactions)}
+
+    # Datasets
+    def get_dataset_to_dataflows_links_in_group(self, group_id):
+        return {"value": self._links.get(group_id, [])}
+
+    def refresh_dataset(self, dataset_id, group_id=None, **options):
+        self._begin(dataset_id)
+        return {"status_code": 202, "request_id": f"refresh-{dataset_id}"}
+
+    def get_refresh_execution_details(self, dataset_id, refresh_id, group_id=None):
+        if not self._done(dataset_id):
+            return {"status": "InProgress"}
+        return {"status": "Failed" if dataset_id in self.fail else "Completed"}
+
+    def _begin(self, object_id):
+        self.log.append(("start", object_id))
+        self._left[object_id] = self.polls.get(object_id, 1)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+
+    def _done(self, object_id):
+        if self._left[object_id] > 0:
+            self._left[object_id] -= 1
+            return False
+        if self._left[object_id] == 0:
+            self._left[object_id] = -1
+            self.running -= 1
+            self.log.append(("end", object_id))
+        return True
+
+
+def _scheduler(services, **kwargs):
+    return RefreshScheduler(datasets=services, dataflows=services, **kwargs)
+
+
+def _dataflow(object_id, group_id="ws"):
+    return RefreshNode("dataflow", group_id, object_id)
+
+
+def _dataset(object_id, group_id="ws"):
+    return RefreshNode("dataset", group_id, object_id)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("powerbi.refresh_dag.time.sleep"), patch("powerbi.refresh_orchestrator.time.sleep"):
+        yield
+
+
+class TestRefreshGraph:
+    def test_levels_are_topological(self):
+        graph = RefreshGraph()
+        graph.add_edge(_dataflow("raw"), _dataflow("clean"))
+        graph.add_edge(_dataflow("clean"), _dataset("sales"))
+        graph.add_edge(_dataflow("raw"), _dataset("sales"))
+        graph.add_node(_dataset("other"))
+
+        assert graph.levels() == [
+            [_dataflow("raw"), _dataset("other")],
+            [_dataflow("clean")],
+            [_dataset("sales")],
+        ]
+        assert set(graph.descendants(_dataflow("raw"))) == {_dataflow("clean"), _dataset("sales")}
+
+    def test_cycles_are_rejected(self):
+        graph = RefreshGraph()
+        graph.add_edge(_dataflow("a"), _dataflow("b"))
+        graph.add_edge(_dataflow("b"), _dataflow("a"))
+
+        with pytest.raises(ValueError, match="cycle"):
+            graph.levels()
+
+
+class TestDiscover:
+    def test_builds_the_lineage_graph(self):
+        services = FakeServices(
+            dataflows={"ws-1": ["raw", "clean"], "ws-2": ["mart"]},
+            upstream={
+                "clean": [{"targetDataflowId": "raw", "groupId": "ws-1"}],
+                "mart": [
+                    {"targetDataflowId": "clean", "groupId": "ws-1"},
+                    {"targetDataflowId": "elsewhere", "groupId": "ws-9"},
+                ],
+            },
+            links={
+                "ws-2": [
+                    {"datasetObjectId": "sales", "dataflowObjectId": "mart", "workspaceObjectId": "ws-2"},
+                    {"datasetObjectId": "sales", "dataflowObjectId": "raw", "workspaceObjectId": "ws-1"},
+                ]
+            },
+        )
+
+        graph = _scheduler(services).discover(group_ids=["ws-1", "ws-2"])
+
+        assert len(graph) == 4
+        assert graph.upstream(_dataflow("mart", "ws-2")) == [_dataflow("clean", "ws-1")]
+        assert graph.upstream(_dataset("sales", "ws-2")) == [
+            _dataflow("mart", "ws-2"),
+            _dataflow("raw", "ws-1"),
+        ]
+        assert [len(level) for level in graph.levels()] == [1, 1, 1, 1]
+
+
+class TestRun:
+    def test_downstream_starts_when_its_inputs_finish(self):
+        graph = RefreshGraph()
+        graph.add_edge(_dataflow("slow"), _dataset("a"))
+        graph.add_edge(_dataflow("fast"), _dataset("b"))
+        services = FakeServices(polls={"slow": 5, "fast": 1})
+
+        report = _scheduler(services).run(graph)
+
+        assert report.summary() == {"Completed": 4}
+        log = services.log
+        assert log.index(("end", "fast")) < log.index(("start", "b")) < log.index(("end", "slow"))
+        assert log.index(("end", "slow")) < log.index(("start", "a"))
+        assert [result.level for result in report.results] == [0, 0, 1, 1]
+        assert report.results[0].duration == 300.0
+
+    def test_failures_skip_downstream_nodes(self):
+        graph = RefreshGraph()
+        graph.add_edge(_dataflow("raw"), _dataflow("clean"))
+        graph.add_edge(_dataflow("clean"), _dataset("sales"))
+        graph.add_edge(_dataflow("other"), _dataset("finance"))
+        services = FakeServices(fail={"raw"})
+
+        report = _scheduler(services).run(graph)
+
+        statuses = {result.object_id: result.status for result in report.results}
+        assert statuses == {
+            "raw": "Failed",
+            "other": "Completed",
+            "clean": "Skipped",
+            "finance": "Completed",
+            "sales": "Skipped",
+        }
+        assert ("start", "clean") not in services.log
+
+    def test_limits_parallel_refreshes(self):
+        graph = RefreshGraph()
+        for index in range(6):
+            graph.add_edge(_dataflow(f"df-{index}"), _dataset(f"ds-{index}"))
+        services = FakeServices(polls={f"df-{index}": 2 for index in range(6)})
+
+        report = _scheduler(services, max_parallel=3).run(graph)
+
+        assert len(report.succeeded) == 12
+        assert services.peak == 3
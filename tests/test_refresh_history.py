@@ -0,0 +1,226 @@
+"""Tests for the RefreshHistoryHarvester in powerbi/refresh_history.py."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.refresh_history import (
+    RefreshHistoryHarvester,
+    SQLiteRefreshHistoryStore,
+    normalize_refresh,
+)
+
+
+def _entry(request_id, hour, minutes=10, status="Completed", refresh_type="Scheduled"):
+    entry = {
+        "requestId": request_id,
+        "refreshType": refresh_type,
+        "status": status,
+        "startTime": f"2024-05-01T{hour:02d}:00:00.000Z",
+    }
+    if status != "Unknown":
+        entry["endTime"] = f"2024-05-01T{hour:02d}:{minutes:02d}:00.000Z"
+    if status == "Failed":
+        entry["serviceExceptionJson"] = '{"errorCode":"ModelRefreshFailed"}'
+    return entry
+
+
+class FakeDatasets:
+    """A Datasets service serving a refresh history per dataset, newest first."""
+
+    def __init__(self, history, datasets=None):
+        self.history = history
+        self._datasets = datasets or {}
+        self.calls = []
+
+    def get_datasets(self, group_id=None):
+        return {"value": self._datasets.get(group_id, [])}
+
+    def get_refresh_history(self, dataset_id, top=None, group_id=None):
+        self.calls.append((dataset_id, top))
+        entries = self.history[dataset_id]
+        if isinstance(entries, Exception):
+            raise entries
+        return {"value": entries[: top or 60]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteRefreshHistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+class TestNormalizeRefresh:
+    def test_flattens_an_entry(self):
+        entry = _entry("r-1", hour=2, minutes=30, status="Failed")
+        entry["refreshAttempts"] = [{"attemptId": 1}, {"attemptId": 2}]
+
+        row = normalize_refresh(entry, group_id="ws", dataset_id="ds", harvested_at="now")
+
+        assert row["request_id"] == "r-1"
+        assert row["start_time"] == "2024-05-01T02:00:00+00:00"
+        assert row["duration"] == 1800.0
+        assert row["attempts"] == 2
+        assert row["error"] == '{"errorCode":"ModelRefreshFailed"}'
+
+    def test_running_refreshes_have_no_duration(self):
+        row = normalize_refresh(_entry("r-1", hour=2, status="Unknown"), "ws", "ds", "now")
+
+        assert row["end_time"] is None
+        assert row["duration"] is None
+
+
+class TestHarvest:
+    def test_harvests_every_dataset(self, store):
+        datasets = FakeDatasets(
+            history={
+                "ds-1": [_entry("a-2", hour=3), _entry("a-1", hour=2)],
+                "ds-2": [_entry("b-1", hour=1, status="Failed")],
+            }
+        )
+        harvester = RefreshHistoryHarvester(datasets=datasets, store=store)
+
+        report = harvester.harvest(targets=[("ws", "ds-1"), ("ws", "ds-2")])
+
+        assert (report.datasets, report.rows, report.requests) == (2, 3, 2)
+        assert len(store) == 3
+        assert store.get_watermark("ds-1") == "2024-05-01T03:00:00+00:00"
+
+    def test_only_keeps_refreshes_after_the_watermark(self, store):
+        history = {"ds": [_entry("r-2", hour=2), _entry("r-1", hour=1)]}
+        datasets = FakeDatasets(history=history)
+        harvester = RefreshHistoryHarvester(datasets=datasets, store=store)
+        harvester.harvest(targets=[("ws", "ds")])
+
+        history["ds"] = [_entry("r-4", hour=4), _entry("r-3", hour=3)] + history["ds"]
+        report = harvester.harvest(targets=[("ws", "ds")])
+
+        # The refresh at the watermark is read again, older ones are not.
+        assert report.rows == 3
+        assert [row["request_id"] for row in store.rows()] == ["r-1", "r-2", "r-3", "r-4"]
+
+    def test_running_refreshes_hold_the_watermark(self, store):
+        history = {"ds": [_entry("r-2", hour=2, status="Unknown"), _entry("r-1", hour=1)]}
+        harvester = RefreshHistoryHarvester(datasets=FakeDatasets(history=history), store=store)
+        harvester.harvest(targets=[("ws", "ds")])
+
+        assert store.get_watermark("ds") == "2024-05-01T02:00:00+00:00"
+
+        history["ds"][0] = _entry("r-2", hour=2, status="Completed")
+        harvester.harvest(targets=[("ws", "ds")])
+
+        assert [row["status"] for row in store.rows()] == ["Completed", "Completed"]
+
+    def test_reads_the_full_history_when_every_entry_is_new(self, store):
+        history = {"ds": [_entry(f"r-{hour}", hour=hour) for hour in range(23, 0, -1)]}
+        datasets = FakeDatasets(history=history)
+        harvester = RefreshHistoryHarvester(datasets=datasets, store=store, top=5)
+
+        report = harvester.harvest(targets=[("ws", "ds")])
+
+        assert datasets.calls == [("ds", 5), ("ds", None)]
+        assert report.rows == 23
+
+        history["ds"].insert(0, _entry("r-late", hour=23, minutes=30))
+        datasets.calls.clear()
+        harvester.harvest(targets=[("ws", "ds")])
+
+        assert datasets.calls == [("ds", 5)]
+
+    def test_records_failures_and_carries_on(self, store):
+        datasets = FakeDatasets(
+            history={"ds-1": RuntimeError("boom"), "ds-2": [_entry("r-1", hour=1)]}
+        )
+        harvester = RefreshHistoryHarvester(datasets=datasets, store=store)
+
+        report = harvester.harvest(targets=[("ws", "ds-1"), ("ws", "ds-2")])
+
+        assert report.failed == {"ds-1": "boom"}
+        assert report.rows == 1
+
+    def test_lists_refreshable_datasets_of_workspaces(self, store):
+        groups = MagicMock()
+        groups.get_groups.return_value = {"value": [{"id": "ws-1"}, {"id": "ws-2"}]}
+        datasets = FakeDatasets(
+            history={},
+            datasets={
+                "ws-1": [{"id": "ds-1", "isRefreshable": True}, {"id": "ds-2", "isRefreshable": False}],
+                "ws-2": [{"id": "ds-3"}],
+            },
+        )
+        harvester = RefreshHistoryHarvester(datasets=datasets, store=store, groups=groups)
+
+        assert harvester.targets() == [("ws-1", "ds-1"), ("ws-2", "ds-3")]
+
+    def test_paces_requests_with_the_rate_limiter(self, store):
+        rate_limiter = MagicMock()
+        datasets = FakeDatasets(history={"ds-1": [], "ds-2": []})
+        harvester = RefreshHistoryHarvester(
+            datasets=datasets, store=store, rate_limiter=rate_limiter
+        )
+
+        harvester.harvest(targets=[("ws", "ds-1"), ("ws", "ds-2")])
+
+        assert rate_limiter.acquire.call_count == 2
+        assert rate_limiter.acquire.call_args.kwargs["endpoint"].endswith("/refreshes")
+
+    def test_builds_a_rate_limiter_from_a_request_rate(self, store):
+        harvester = RefreshHistoryHarvester(
+            datasets=FakeDatasets(history={}), store=store, max_requests_per_second=0.5
+        )
+
+        rule = harvester.rate_limiter.rule_for("get", "myorg/groups/ws/datasets/ds/refreshes")
+        assert rule.rate == 0.5
+
+
+class TestQueries:
+    @pytest.fixture
+    def filled(self, store):
+        rows = [
+            _entry("a-1", hour=1, minutes=10),
+            _entry("a-2", hour=2, minutes=20),
+            _entry("a-3", hour=3, minutes=30),
+            _entry("a-4", hour=4, minutes=40, status="Failed"),
+            _entry("a-5", hour=5, status="Unknown"),
+        ]
+        store.upsert(normalize_refresh(entry, "ws", "ds-a", "now") for entry in rows)
+        store.upsert(
+            normalize_refresh(entry, "ws", "ds-b", "now")
+            for entry in [_entry("b-1", hour=1, minutes=5, refresh_type="OnDemand")]
+        )
+        return store
+
+    def test_duration_percentiles(self, filled):
+        results = filled.duration_percentiles(percentiles=(50, 90))
+
+        assert results == [
+            {"dataset_id": "ds-a", "count": 3, "p50": 1200.0, "p90": 1680.0},
+            {"dataset_id": "ds-b", "count": 1, "p50": 300.0, "p90": 300.0},
+        ]
+
+    def test_duration_percentiles_overall_and_since(self, filled):
+        results = filled.duration_percentiles(
+            percentiles=(50,), by=None, since="2024-05-01T02:00:00Z", status=None
+        )
+
+        assert results == [{"count": 3, "p50": 1800.0}]
+
+    def test_failure_rates(self, filled):
+        assert filled.failure_rates() == [
+            {"dataset_id": "ds-a", "refreshes": 4, "failed": 1, "failure_rate": 0.25},
+            {"dataset_id": "ds-b", "refreshes": 1, "failed": 0, "failure_rate": 0.0},
+        ]
+        assert filled.failure_rates(by="refresh_type")[1]["refresh_type"] == "OnDemand"
+
+    def test_rejects_unknown_group_columns(self, filled):
+        with pytest.raises(ValueError, match="Cannot group by"):
+            filled.failure_rates(by="status; DROP TABLE refresh_history")
+
+    def test_export_parquet(self, filled, tmp_path):
+        parquet = pytest.importorskip("pyarrow.parquet")
+
+        written = filled.export_parquet(str(tmp_path / "history.parquet"))
+
+        table = parquet.read_table(str(tmp_path / "history.parquet"))
+        assert written == table.num_rows == 6
+        assert "duration" in table.column_names
@@ -0,0 +1,214 @@
+"""Tests for the RefreshOrchestrator in powerbi/refresh_orchestrator.py."""
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from powerbi.refresh_orchestrator import (
+    RefreshOrchestrator,
+    RefreshTarget,
+    _parse_time,
+)
+
+
+def _http_error(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+class FakeDatasets:
+    """A Datasets service whose refreshes finish after `polls` status checks."""
+
+    def __init__(self, polls=1, capacity_of=None, submit_errors=None, final="Completed"):
+        self.polls = polls
+        self.capacity_of = capacity_of or {}
+        self.submit_errors = dict(submit_errors or {})
+        self.final = final
+        self.refreshes = {}
+        self.running = {}
+        self.peak = {}
+        self.calls = []
+
+    def refresh_dataset(self, dataset_id, group_id=None, **options):
+        self.calls.append((dataset_id, options))
+        errors = self.submit_errors.get(dataset_id)
+        if errors:
+            raise errors.pop(0)
+
+        capacity = self.capacity_of.get(dataset_id, "shared")
+        self.running[capacity] = self.running.get(capacity, 0) + 1
+        self.peak[capacity] = max(self.peak.get(capacity, 0), self.running[capacity])
+
+        request_id = f"refresh-{dataset_id}"
+        self.refreshes[request_id] = {"dataset_id": dataset_id, "left": self.polls}
+        return {"message": "response successful", "status_code": 202, "request_id": request_id}
+
+    def get_refresh_execution_details(self, dataset_id, refresh_id, group_id=None):
+        refresh = self.refreshes[refresh_id]
+        if refresh["left"] > 0:
+            refresh["left"] -= 1
+            return {"status": "InProgress"}
+
+        capacity = self.capacity_of.get(dataset_id, "shared")
+        if refresh["left"] == 0:
+            self.running[capacity] -= 1
+            refresh["left"] = -1
+
+        details = {
+            "status": self.final,
+            "extendedStatus": self.final,
+            "startTime": "2024-05-01T02:00:00.1234567Z",
+            "endTime": "2024-05-01T02:01:30.1234567Z",
+        }
+        if self.final == "Failed":
+            details["messages"] = [{"code": "ModelingServiceError", "message": "Out of memory."}]
+        return details
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("powerbi.refresh_orchestrator.time.sleep"):
+        yield
+
+
+class TestRefreshOrchestrator:
+    def test_refreshes_every_target(self):
+        datasets = FakeDatasets(polls=2)
+        orchestrator = RefreshOrchestrator(datasets=datasets)
+
+        report = orchestrator.run([("ws-1", "ds-1"), ("ws-1", "ds-2")])
+
+        assert report.summary() == {"Completed": 2}
+        assert [result.request_id for result in report.results] == [
+            "refresh-ds-1",
+            "refresh-ds-2",
+        ]
+        assert report.results[0].duration == 90.0
+        assert report.results[0].start_time.isoformat() == "2024-05-01T02:00:00.123456+00:00"
+        assert datasets.calls[0] == ("ds-1", {"refresh_type": "Full"})
+
+    def test_caps_concurrent_refreshes_per_capacity(self):
+        capacity_of = {f"ds-{i}": "cap-a" if i % 2 else "cap-b" for i in range(10)}
+        datasets = FakeDatasets(polls=3, capacity_of=capacity_of)
+        orchestrator = RefreshOrchestrator(
+            datasets=datasets,
+            max_concurrent_per_capacity=2,
+            capacity_limits={"cap-b": 1},
+        )
+
+        report = orchestrator.run(
+            RefreshTarget(group_id="ws", dataset_id=dataset_id, capacity_id=capacity)
+            for dataset_id, capacity in capacity_of.items()
+        )
+
+        assert len(report.succeeded) == 10
+        assert datasets.peak == {"cap-a": 2, "cap-b": 1}
+
+    def test_looks_up_capacities_through_groups(self):
+        groups = MagicMock()
+        groups.get_groups.return_value = {
+            "value": [{"id": "ws-1", "capacityId": "cap-1"}, {"id": "ws-2"}]
+        }
+        orchestrator = RefreshOrchestrator(datasets=FakeDatasets(), groups=groups)
+
+        report = orchestrator.run([("ws-1", "ds-1"), ("ws-2", "ds-2")])
+
+        assert [result.capacity_id for result in report.results] == ["cap-1", "shared"]
+
+    def test_retries_transient_submit_errors(self):
+        datasets = FakeDatasets(submit_errors={"ds-1": [_http_error(503)]})
+        orchestrator = RefreshOrchestrator(datasets=datasets)
+
+        report = orchestrator.run([("ws", "ds-1")])
+
+        assert report.results[0].status == "Completed"
+        assert report.results[0].attempts == 2
+
+    def test_does_not_retry_other_submit_errors(self):
+        datasets = FakeDatasets(submit_errors={"ds-1": [_http_error(400)]})
+        orchestrator = RefreshOrchestrator(datasets=datasets)
+
+        report = orchestrator.run([("ws", "ds-1"), ("ws", "ds-2")])
+
+        assert report.summary() == {"Failed": 1, "Completed": 1}
+        assert report.results[0].attempts == 1
+        assert "400" in report.results[0].error
+
+    def test_gives_up_after_max_retries(self):
+        errors = [_http_error(429) for _ in range(5)]
+        datasets = FakeDatasets(submit_errors={"ds-1": errors})
+        orchestrator = RefreshOrchestrator(datasets=datasets, max_retries=2)
+
+        report = orchestrator.run([("ws", "ds-1")])
+
+        assert report.results[0].status == "Failed"
+        assert report.results[0].attempts == 3
+
+    def test_reports_failure_messages(self):
+        orchestrator = RefreshOrchestrator(datasets=FakeDatasets(final="Failed"))
+
+        report = orchestrator.run([("ws", "ds-1")])
+
+        assert report.failed[0].error == "Out of memory."
+
+    def test_falls_back_to_refresh_history(self):
+        datasets = MagicMock()
+        datasets.refresh_dataset.return_value = {
+            "message": "response successful",
+            "status_code": 202,
+            "request_id": "r-2",
+        }
+        datasets.get_refresh_execution_details.side_effect = _http_error(404)
+        datasets.get_refresh_history.side_effect = [
+            {"value": [{"requestId": "r-2", "status": "Unknown"}]},
+            {
+                "value": [
+                    {"requestId": "r-2", "status": "Completed", "startTime": "2024-05-01T02:00:00Z",
+                     "endTime": "2024-05-01T02:00:10Z"},
+                    {"requestId": "r-1", "status": "Failed"},
+                ]
+            },
+        ]
+        orchestrator = RefreshOrchestrator(datasets=datasets, refresh_options={})
+
+        report = orchestrator.run([("ws", "ds-1")])
+
+        assert report.results[0].status == "Completed"
+        assert report.results[0].duration == 10.0
+        assert datasets.get_refresh_execution_details.call_count == 1
+
+    def test_times_out_long_refreshes(self):
+        orchestrator = RefreshOrchestrator(datasets=FakeDatasets(polls=100), refresh_timeout=0)
+
+        report = orchestrator.run([("ws", "ds-1")])
+
+        assert report.results[0].status == "TimedOut"
+
+    def test_skips_capacities_without_slots(self):
+        orchestrator = RefreshOrchestrator(
+            datasets=FakeDatasets(), capacity_limits={"cap-x": 0}
+        )
+
+        report = orchestrator.run(
+            [RefreshTarget("ws", "ds-1", capacity_id="cap-x"), ("ws", "ds-2")]
+        )
+
+        assert report.summary() == {"Skipped": 1, "Completed": 1}
+
+    def test_report_rows(self):
+        report = RefreshOrchestrator(datasets=FakeDatasets()).run([("ws", "ds-1")])
+
+        rows = report.to_rows()
+        assert rows[0]["dataset_id"] == "ds-1"
+        assert rows[0]["duration"] == 90.0
+        assert rows[0]["status"] == "Completed"
+
+
+class TestParseTime:
+    def test_parses_seven_fractional_digits(self):
+        assert _parse_time("2024-05-01T02:00:00.1234567Z").microsecond == 123456
+
+    def test_returns_none_for_missing_values(self):
+        assert _parse_time(None) is None
+        assert _parse_time("not a time") is None
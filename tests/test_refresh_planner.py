@@ -0,0 +1,198 @@
+"""Tests for the PartitionRefreshPlanner in powerbi/refresh_planner.py."""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from powerbi.exceptions import PowerBiError
+from powerbi.refresh_planner import PartitionRefreshPlanner, PartitionSpec, partitions_from_spec
+
+GB = 1024**3
+
+SCANNED_DATASET = {
+    "id": "cfafbeb1-8037-4d0c-896e-a46fb27ff229",
+    "name": "Sales",
+    "tables": [
+        {"name": "Sales", "columns": [], "measures": []},
+        {"name": "Customer", "columns": [], "measures": []},
+        {"name": "Date", "columns": [], "measures": []},
+    ],
+}
+
+LOCAL_SPEC = {
+    "tables": [
+        {
+            "name": "Sales",
+            "partitions": [
+                {"name": "2022", "size": 6 * GB},
+                {"name": "2023", "size": 7 * GB},
+                {"name": "2024", "size": 8 * GB},
+            ],
+        },
+        {"name": "Customer", "size": 2 * GB},
+        {"name": "Date", "size": 0.1 * GB},
+    ]
+}
+
+
+def _datasets(statuses):
+    """Return a mocked Datasets service whose refreshes end with `statuses`."""
+    datasets = MagicMock()
+    refreshes = iter(range(100))
+    datasets.refresh_dataset.side_effect = lambda **kwargs: {
+        "status_code": 202,
+        "request_id": f"refresh-{next(refreshes)}",
+    }
+    datasets.get_refresh_execution_details.side_effect = [
+        {"status": status} for status in statuses
+    ]
+    return datasets
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("powerbi.refresh_orchestrator.time.sleep"):
+        yield
+
+
+class TestPartitionsFromSpec:
+    def test_reads_scanner_datasets_with_size_overrides(self):
+        partitions = partitions_from_spec(
+            SCANNED_DATASET, sizes={"Sales": 10 * GB}, default_size=GB
+        )
+
+        assert [(item.table, item.partition, item.size) for item in partitions] == [
+            ("Sales", None, 10 * GB),
+            ("Customer", None, GB),
+            ("Date", None, GB),
+        ]
+
+    def test_reads_partitions_from_a_local_spec(self):
+        partitions = partitions_from_spec(LOCAL_SPEC, sizes={"Sales/2024": 9 * GB})
+
+        assert [item.key for item in partitions] == [
+            "Sales/2022",
+            "Sales/2023",
+            "Sales/2024",
+            "Customer",
+            "Date",
+        ]
+        assert partitions[2].size == 9 * GB
+        assert partitions[0].to_object() == {"table": "Sales", "partition": "2022"}
+
+    def test_scanner_datasets_need_sizes(self):
+        with pytest.raises(ValueError, match="No size is known for Customer, Date"):
+            partitions_from_spec(SCANNED_DATASET, sizes={"Sales": 10 * GB})
+
+
+class TestPlan:
+    def test_packs_partitions_into_waves_within_the_budget(self):
+        planner = PartitionRefreshPlanner(datasets=MagicMock(), memory_limit=40 * GB)
+
+        plan = planner.plan(dataset_id="ds", spec=LOCAL_SPEC)
+
+        # The model takes 23.1 GB, which leaves 16.9 GB per wave.
+        data_waves = plan.waves[:-1]
+        assert [wave.objects for wave in data_waves] == [
+            [{"table": "Sales", "partition": "2024"}, {"table": "Sales", "partition": "2023"},
+             {"table": "Date"}],
+            [{"table": "Sales", "partition": "2022"}, {"table": "Customer"}],
+        ]
+        assert all(wave.size <= plan.memory_budget for wave in data_waves)
+        assert [wave.max_parallelism for wave in data_waves] == [3, 2]
+        assert {wave.refresh_type for wave in data_waves} == {"DataOnly"}
+        assert plan.waves[-1].refresh_type == "Calculate"
+        assert plan.waves[-1].objects == []
+
+    def test_limits_objects_and_parallelism(self):
+        planner = PartitionRefreshPlanner(
+            datasets=MagicMock(),
+            memory_limit=100 * GB,
+            max_objects_per_wave=2,
+            max_parallelism=1,
+            final_calculate=False,
+        )
+
+        plan = planner.plan(dataset_id="ds", spec=LOCAL_SPEC)
+
+        assert [len(wave.objects) for wave in plan.waves] == [2, 2, 1]
+        assert {wave.max_parallelism for wave in plan.waves} == {1}
+        assert {wave.refresh_type for wave in plan.waves} == {"Full"}
+
+    def test_flags_objects_larger_than_the_budget(self):
+        planner = PartitionRefreshPlanner(
+            datasets=MagicMock(), memory_limit=30 * GB, model_size=20 * GB
+        )
+
+        plan = planner.plan(
+            dataset_id="ds",
+            spec=[PartitionSpec("Sales", size=12 * GB), PartitionSpec("Date", size=GB)],
+        )
+
+        assert plan.waves[0].oversized
+        assert plan.waves[0].objects == [{"table": "Sales"}]
+        assert plan.waves[1].objects == [{"table": "Date"}]
+
+    def test_rejects_models_that_fill_the_memory_limit(self):
+        planner = PartitionRefreshPlanner(datasets=MagicMock(), memory_limit=10 * GB)
+
+        with pytest.raises(ValueError, match="leaves none"):
+            planner.plan(dataset_id="ds", spec=LOCAL_SPEC)
+
+    def test_rejects_specs_without_any_size(self):
+        planner = PartitionRefreshPlanner(datasets=MagicMock(), memory_limit=40 * GB)
+
+        with pytest.raises(ValueError, match="No size is known"):
+            planner.plan(dataset_id="ds", spec=SCANNED_DATASET)
+        with pytest.raises(ValueError, match="No table or partition has a size"):
+            planner.plan(dataset_id="ds", spec=[PartitionSpec("Sales"), PartitionSpec("Date")])
+
+    def test_plan_is_json_serializable(self):
+        planner = PartitionRefreshPlanner(datasets=MagicMock(), memory_limit=40 * GB)
+
+        plan = json.loads(planner.plan(dataset_id="ds", spec=LOCAL_SPEC).to_json())
+
+        assert plan["dataset_id"] == "ds"
+        assert len(plan["waves"]) == 3
+
+
+class TestRun:
+    def test_sends_each_wave_and_records_its_outcome(self):
+        datasets = _datasets(["InProgress", "Completed", "Completed", "Completed"])
+        planner = PartitionRefreshPlanner(datasets=datasets, memory_limit=40 * GB, retry_count=2)
+
+        plan = planner.refresh(dataset_id="ds", spec=LOCAL_SPEC, group_id="ws")
+
+        assert [wave.status for wave in plan.waves] == ["Completed"] * 3
+        assert [wave.request_id for wave in plan.waves] == ["refresh-0", "refresh-1", "refresh-2"]
+
+        first, _, last = [call.kwargs for call in datasets.refresh_dataset.call_args_list]
+        assert first["refresh_type"] == "DataOnly"
+        assert first["max_parallelism"] == 3
+        assert first["commit_mode"] == "transactional"
+        assert first["retry_count"] == 2
+        assert first["group_id"] == "ws"
+        assert len(first["objects"]) == 3
+        assert last["refresh_type"] == "Calculate"
+        assert "objects" not in last
+
+    def test_stops_at_the_first_failed_wave(self):
+        datasets = _datasets(["Failed"])
+        planner = PartitionRefreshPlanner(datasets=datasets, memory_limit=40 * GB)
+        plan = planner.plan(dataset_id="ds", spec=LOCAL_SPEC)
+
+        with pytest.raises(PowerBiError, match="Wave 0"):
+            planner.run(plan)
+
+        assert [wave.status for wave in plan.waves] == ["Failed", "Skipped", "Skipped"]
+        assert datasets.refresh_dataset.call_count == 1
+
+    def test_dry_run_sends_nothing(self):
+        datasets = MagicMock()
+        planner = PartitionRefreshPlanner(datasets=datasets, memory_limit=40 * GB)
+
+        plan = planner.refresh(dataset_id="ds", spec=LOCAL_SPEC, dry_run=True)
+
+        assert plan.waves
+        datasets.refresh_dataset.assert_not_called()
@@ -0,0 +1,125 @@
+"""Tests for the retry policy in powerbi/retry.py."""
+
+import json
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from powerbi.retry import RetryPolicy, RetryStats, parse_retry_after, use_retry_policy
+
+
+class TestParseRetryAfter:
+    def test_parses_seconds(self):
+        assert parse_retry_after("30") == 30.0
+
+    def test_parses_http_date(self):
+        value = formatdate(time.time() + 20, usegmt=True)
+        assert 15 <= parse_retry_after(value) <= 20
+
+    def test_returns_none_for_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestRetryPolicy:
+    def test_429_is_retried_for_any_method(self):
+        policy = RetryPolicy()
+        assert policy.is_retryable("post", 429)
+        assert policy.is_retryable("get", 429)
+
+    def test_503_is_only_retried_for_idempotent_methods(self):
+        policy = RetryPolicy()
+        assert policy.is_retryable("get", 503)
+        assert not policy.is_retryable("post", 503)
+
+    def test_other_statuses_are_not_retried(self):
+        assert not RetryPolicy().is_retryable("get", 500)
+
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(jitter=False, backoff_factor=2.0, max_backoff=10.0)
+        delays = [policy.next_delay("get", 503, attempt, 0.0) for attempt in range(4)]
+        assert delays == [2.0, 4.0, 8.0, 10.0]
+
+    def test_honours_retry_after(self):
+        policy = RetryPolicy(jitter=False, backoff_factor=1.0)
+        assert policy.next_delay("get", 429, 0, 0.0, retry_after="45") == 45.0
+
+    def test_stops_after_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.next_delay("get", 429, 2, 0.0) is None
+
+    def test_stops_when_total_wait_budget_exceeded(self):
+        policy = RetryPolicy(max_total_wait=60.0)
+        assert policy.next_delay("get", 429, 0, 30.0, retry_after="45") is None
+
+
+class TestRetryStats:
+    def test_records_retries(self):
+        stats = RetryStats()
+        stats.record_retry(429, 2.5)
+        stats.record_retry(429, 1.5)
+        stats.record_exhausted()
+        assert stats.to_dict() == {
+            "retries": 2,
+            "throttled_seconds": 4.0,
+            "exhausted": 1,
+            "retries_by_status": {429: 2},
+        }
+
+
+def _response(status_code, headers=None, json_body=None):
+    response = MagicMock(spec=requests.Response)
+    response.ok = status_code < 400
+    response.status_code = status_code
+    response.reason = "Too Many Requests" if status_code == 429 else "OK"
+    response.headers = {"Content-Type": "application/json", **(headers or {})}
+    response.content = json.dumps(json_body).encode() if json_body is not None else b""
+    response.json.return_value = json_body
+    response.url = "https://api.powerbi.com/v1.0/myorg/admin/groups"
+    response.text = ""
+    response.request = MagicMock()
+    response.request.headers = {"Authorization": "Bearer secret"}
+    response.request.method = "GET"
+    return response
+
+
+class TestSessionRetries:
+    def test_retries_429_then_succeeds(self, mock_session):
+        mock_session._session.send.side_effect = [
+            _response(429, headers={"Retry-After": "3"}),
+            _response(200, json_body={"value": []}),
+        ]
+
+        with patch("powerbi.session.time.sleep") as mock_sleep:
+            result = mock_session.make_request(method="get", endpoint="myorg/admin/groups")
+
+        assert result == {"value": []}
+        assert mock_session._session.send.call_count == 2
+        assert mock_sleep.call_args[0][0] >= 3
+        assert mock_session.retry_stats.to_dict()["retries"] == 1
+
+    def test_raises_when_retries_exhausted(self, mock_session):
+        mock_session._session.send.return_value = _response(429)
+
+        with patch("powerbi.session.time.sleep"):
+            with pytest.raises(requests.HTTPError):
+                mock_session.make_request(
+                    method="get",
+                    endpoint="myorg/admin/groups",
+                    retry_policy=RetryPolicy(max_retries=2),
+                )
+
+        assert mock_session._session.send.call_count == 3
+        assert mock_session.retry_stats.to_dict()["exhausted"] == 1
+
+    def test_context_override_disables_retries(self, mock_session):
+        mock_session._session.send.return_value = _response(429)
+
+        with use_retry_policy(RetryPolicy(max_retries=0)):
+            with pytest.raises(requests.HTTPError):
+                mock_session.make_request(method="get", endpoint="myorg/admin/groups")
+
+        assert mock_session._session.send.call_count == 1
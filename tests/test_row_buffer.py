@@ -0,0 +1,123 @@
+"""Tests for the TypedRowBuffer in powerbi/row_buffer.py."""
+
+import datetime
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.push_datasets import PushDatasets
+from powerbi.row_buffer import TypedRowBuffer
+from powerbi.utils import Column, Table
+
+
+def _table():
+    table = Table(name="sales")
+    for name, data_type in (
+        ("id", "Int64"),
+        ("amount", "Double"),
+        ("shipped", "bool"),
+        ("ordered_at", "DateTime"),
+        ("product", "string"),
+    ):
+        table.add_column(Column(name=name, data_type=data_type))
+    return table
+
+
+class TestTypedRowBuffer:
+    def test_round_trips_rows(self):
+        buffer = _table().row_buffer()
+        buffer.append(
+            {
+                "id": 1,
+                "amount": 2.5,
+                "shipped": True,
+                "ordered_at": datetime.datetime(2024, 1, 2, 3, 4, 5),
+                "product": 'say "hi"',
+            }
+        )
+
+        assert buffer.to_rows() == [
+            {
+                "id": 1,
+                "amount": 2.5,
+                "shipped": True,
+                "ordered_at": "2024-01-02T03:04:05",
+                "product": 'say "hi"',
+            }
+        ]
+
+    def test_missing_and_invalid_values_are_null(self):
+        buffer = _table().row_buffer()
+        buffer.append({"id": None, "amount": float("nan")})
+
+        assert json.loads(buffer.to_body()) == {
+            "rows": [
+                {"id": None, "amount": None, "shipped": None, "ordered_at": None, "product": None}
+            ]
+        }
+
+    def test_datetimes_are_stored_in_utc(self):
+        buffer = _table().row_buffer()
+        buffer.append({"ordered_at": "2024-01-02T03:00:00+02:00"})
+        buffer.append({"ordered_at": datetime.date(2024, 1, 3)})
+
+        assert [row["ordered_at"] for row in buffer.to_rows()] == [
+            "2024-01-02T01:00:00",
+            "2024-01-03T00:00:00",
+        ]
+
+    def test_rejects_unknown_columns(self):
+        buffer = _table().row_buffer()
+        with pytest.raises(KeyError, match="Unknown columns"):
+            buffer.append({"id": 1, "region": "EU"})
+
+    def test_bad_row_is_not_half_added(self):
+        buffer = _table().row_buffer()
+        with pytest.raises(ValueError):
+            buffer.append({"id": 1, "amount": "lots"})
+        assert len(buffer) == 0
+
+    def test_out_of_range_row_is_rolled_back(self):
+        buffer = TypedRowBuffer(
+            [Column(name="name", data_type="string"), Column(name="n", data_type="Int64")]
+        )
+        with pytest.raises(OverflowError):
+            buffer.append({"name": "x", "n": 2**70})
+
+        buffer.append({"name": "y", "n": 1})
+        assert buffer.to_rows() == [{"name": "y", "n": 1}]
+
+    def test_drain_removes_oldest_rows(self):
+        buffer = _table().row_buffer()
+        buffer.extend({"id": index, "product": "p"} for index in range(5))
+
+        count, body = buffer.drain(3)
+
+        assert count == 3
+        assert [row["id"] for row in json.loads(body)["rows"]] == [0, 1, 2]
+        assert [row["id"] for row in buffer] == [3, 4]
+
+    def test_uses_less_memory_than_dicts(self):
+        buffer = TypedRowBuffer(columns=[Column("id", "Int64"), Column("amount", "Double")])
+        buffer.extend({"id": index, "amount": index * 0.5} for index in range(1000))
+
+        assert buffer.nbytes == 1000 * (8 + 1) * 2
+
+    def test_post_dataset_rows_sends_encoded_body(self):
+        session = MagicMock()
+        buffer = TypedRowBuffer(columns=[Column("id", "Int64")])
+        buffer.append({"id": 7})
+
+        PushDatasets(session=session).post_dataset_rows(
+            dataset_id="ds-1", table_name="sales", rows=buffer
+        )
+
+        assert session.make_request.call_args.kwargs["data"] == b'{"rows":[{"id":7}]}'
+
+
+class TestSlots:
+    def test_models_have_no_instance_dict(self):
+        table = _table()
+        for obj in (table, table.get_column(0), table.columns):
+            assert not hasattr(obj, "__dict__")
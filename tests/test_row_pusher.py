@@ -0,0 +1,158 @@
+"""Tests for the RowPusher in powerbi/row_pusher.py."""
+
+import datetime
+import decimal
+import json
+import threading
+import time
+
+import requests
+from unittest.mock import MagicMock, patch
+
+from powerbi.push_datasets import PushDatasets
+from powerbi.row_pusher import RowPusher, encode_row
+
+
+def _pusher(**kwargs):
+    push_datasets = MagicMock()
+    return RowPusher(
+        push_datasets=push_datasets, dataset_id="ds-1", table_name="sales", **kwargs
+    )
+
+
+def _bodies(pusher):
+    calls = pusher.push_datasets.post_dataset_rows.call_args_list
+    return [json.loads(call.kwargs["rows"]) for call in calls]
+
+
+class TestEncodeRow:
+    def test_encodes_dates_and_decimals(self):
+        row = {"day": datetime.date(2024, 1, 2), "amount": decimal.Decimal("1.50")}
+        assert encode_row(row) == b'{"day":"2024-01-02","amount":1.5}'
+
+
+class TestBatches:
+    def test_respects_row_limit(self):
+        pusher = _pusher(max_rows_per_batch=3)
+        batches = list(pusher.batches({"id": i} for i in range(7)))
+        assert [count for count, _ in batches] == [3, 3, 1]
+        assert json.loads(batches[0][1]) == {"rows": [{"id": 0}, {"id": 1}, {"id": 2}]}
+
+    def test_respects_payload_size(self):
+        pusher = _pusher(max_batch_bytes=50)
+        batches = list(pusher.batches({"name": "x" * 10} for _ in range(5)))
+        assert all(len(body) <= 50 for _, body in batches)
+        assert sum(count for count, _ in batches) == 5
+
+    def test_caps_rows_at_api_limit(self):
+        assert _pusher(max_rows_per_batch=50000).max_rows_per_batch == 10000
+
+
+class TestPush:
+    def test_pushes_every_row(self):
+        pusher = _pusher(max_rows_per_batch=100)
+        report = pusher.push({"id": i} for i in range(1050))
+
+        assert report.rows_sent == 1050
+        assert report.batches_sent == 11
+        ids = sorted(row["id"] for body in _bodies(pusher) for row in body["rows"])
+        assert ids == list(range(1050))
+        assert report.rows_per_second > 0
+
+    def test_limits_requests_in_flight(self):
+        pusher = _pusher(max_rows_per_batch=1, max_concurrency=2)
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def post(**kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+        pusher.push_datasets.post_dataset_rows.side_effect = post
+        pusher.push({"id": i} for i in range(10))
+
+        assert max(peak) <= 2
+
+    def test_retries_failed_batches(self):
+        pusher = _pusher(backoff_factor=0)
+        pusher.push_datasets.post_dataset_rows.side_effect = [requests.ConnectionError(), None]
+
+        report = pusher.push([{"id": 1}])
+
+        assert report.rows_sent == 1
+        assert report.retries == 1
+
+    def test_reports_batches_that_keep_failing(self):
+        pusher = _pusher(backoff_factor=0, max_retries=1)
+        pusher.push_datasets.post_dataset_rows.side_effect = requests.HTTPError("500")
+
+        report = pusher.push([{"id": 1}, {"id": 2}])
+
+        assert report.rows_sent == 0
+        assert report.rows_failed == 2
+        assert json.loads(report.failed[0].body) == {"rows": [{"id": 1}, {"id": 2}]}
+
+    def test_retries_server_errors(self):
+        pusher = _pusher(backoff_factor=0)
+        pusher.push_datasets.post_dataset_rows.side_effect = [
+            requests.HTTPError(response=MagicMock(status_code=503)),
+            requests.HTTPError(response=MagicMock(status_code=429)),
+            None,
+        ]
+
+        report = pusher.push([{"id": 1}])
+
+        assert report.rows_sent == 1
+        assert report.retries == 2
+
+    def test_permanent_errors_fail_fast(self):
+        pusher = _pusher(backoff_factor=0, max_retries=3)
+        pusher.store = MagicMock()
+        pusher.store.try_acquire.return_value = 0.0
+        pusher.push_datasets.post_dataset_rows.side_effect = requests.HTTPError(
+            response=MagicMock(status_code=400)
+        )
+
+        report = pusher.push([{"id": 1}])
+
+        assert report.rows_failed == 1
+        assert report.retries == 0
+        assert pusher.push_datasets.post_dataset_rows.call_count == 1
+        # Only the first attempt spent quota.
+        assert pusher.store.try_acquire.call_count == 2
+
+    def test_waits_for_quota(self):
+        store = MagicMock()
+        store.try_acquire.side_effect = [0.0, 2.5, 0.0]
+        pusher = _pusher(store=store)
+
+        with patch("powerbi.row_pusher.time.sleep") as mock_sleep:
+            pusher.push([{"id": 1}, {"id": 2}])
+
+        mock_sleep.assert_called_once_with(2.5)
+        row_call = store.try_acquire.call_args_list[-1]
+        assert row_call.kwargs["rule"].name == "push_rows_rows:ds-1"
+        assert row_call.kwargs["cost"] == 2
+
+    def test_calls_progress(self):
+        reports = []
+        pusher = _pusher(
+            max_rows_per_batch=2, progress=lambda report: reports.append(report.rows_sent)
+        )
+        pusher.push({"id": i} for i in range(4))
+        assert sorted(reports) == [2, 4]
+
+
+class TestPostDatasetRowsBody:
+    def test_encoded_body_is_sent_as_is(self):
+        session = MagicMock()
+        PushDatasets(session=session).post_dataset_rows(
+            dataset_id="ds-1", table_name="sales", rows=b'{"rows":[]}'
+        )
+        assert session.make_request.call_args.kwargs["data"] == b'{"rows":[]}'
+        assert "json_payload" not in session.make_request.call_args.kwargs
@@ -0,0 +1,145 @@
+"""Tests for the StreamingRowBuffer in powerbi/row_stream.py."""
+
+import json
+import threading
+import time
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from powerbi.utils import Column, Table
+
+
+def _table():
+    table = Table(name="telemetry")
+    table.add_column(Column(name="id", data_type="Int64"))
+    return table
+
+
+def _posted_ids(push_datasets):
+    ids = []
+    for call in push_datasets.post_dataset_rows.call_args_list:
+        ids.extend(row["id"] for row in json.loads(call.kwargs["rows"])["rows"])
+    return ids
+
+
+class TestStreamingRowBuffer:
+    def test_flushes_on_row_count(self):
+        push_datasets = MagicMock()
+        stream = _table().stream_to(
+            push_datasets=push_datasets, dataset_id="ds-1", flush_rows=3, flush_interval=60
+        )
+
+        stream.extend({"id": index} for index in range(3))
+        assert stream.flush(timeout=5)
+
+        assert push_datasets.post_dataset_rows.call_count == 1
+        assert push_datasets.post_dataset_rows.call_args.kwargs["table_name"] == "telemetry"
+        stream.close()
+
+    def test_flushes_on_interval(self):
+        push_datasets = MagicMock()
+        posted = threading.Event()
+        push_datasets.post_dataset_rows.side_effect = lambda **kwargs: posted.set()
+
+        stream = _table().stream_to(
+            push_datasets=push_datasets, dataset_id="ds-1", flush_interval=0.05
+        )
+        stream.append({"id": 1})
+
+        assert posted.wait(timeout=5)
+        stream.close()
+
+    def test_flushes_on_bytes(self):
+        push_datasets = MagicMock()
+        posted = threading.Event()
+        push_datasets.post_dataset_rows.side_effect = lambda **kwargs: posted.set()
+
+        stream = _table().stream_to(
+            push_datasets=push_datasets, dataset_id="ds-1", flush_bytes=18, flush_interval=60
+        )
+        stream.append({"id": 1})
+        stream.append({"id": 2})
+
+        assert posted.wait(timeout=5)
+        stream.close()
+
+    def test_close_posts_remaining_rows_in_order(self):
+        push_datasets = MagicMock()
+        with _table().stream_to(
+            push_datasets=push_datasets, dataset_id="ds-1", flush_rows=4, flush_interval=60
+        ) as stream:
+            stream.extend({"id": index} for index in range(10))
+
+        assert _posted_ids(push_datasets) == list(range(10))
+        assert stream.report.rows_sent == 10
+        assert len(stream) == 0
+
+    def test_blocks_producers_when_full(self):
+        push_datasets = MagicMock()
+        release = threading.Event()
+        push_datasets.post_dataset_rows.side_effect = lambda **kwargs: release.wait(5)
+
+        stream = _table().stream_to(
+            push_datasets=push_datasets,
+            dataset_id="ds-1",
+            flush_rows=2,
+            max_buffered_rows=2,
+            flush_interval=60,
+        )
+        # Two rows go out and stall in the post, two more fill the buffer.
+        stream.extend([{"id": 1}, {"id": 2}])
+        deadline = time.monotonic() + 5
+        while push_datasets.post_dataset_rows.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stream.extend([{"id": 3}, {"id": 4}])
+
+        with pytest.raises(TimeoutError):
+            stream.append({"id": 5}, timeout=0.05)
+
+        release.set()
+        stream.append({"id": 5}, timeout=5)
+        stream.close()
+
+        assert _posted_ids(push_datasets) == [1, 2, 3, 4, 5]
+
+    def test_records_batches_that_keep_failing(self):
+        push_datasets = MagicMock()
+        push_datasets.post_dataset_rows.side_effect = requests.ConnectionError("boom")
+
+        stream = _table().stream_to(
+            push_datasets=push_datasets,
+            dataset_id="ds-1",
+            max_retries=1,
+            backoff_factor=0,
+        )
+        stream.append({"id": 1})
+        report = stream.close()
+
+        assert report.retries == 1
+        assert report.rows_failed == 1
+        assert report.rows_sent == 0
+
+    def test_permanent_errors_are_not_retried(self):
+        push_datasets = MagicMock()
+        push_datasets.post_dataset_rows.side_effect = requests.HTTPError(
+            response=MagicMock(status_code=404)
+        )
+
+        stream = _table().stream_to(
+            push_datasets=push_datasets, dataset_id="ds-1", max_retries=3, backoff_factor=0
+        )
+        stream.append({"id": 1})
+        report = stream.close()
+
+        assert report.retries == 0
+        assert report.rows_failed == 1
+        assert push_datasets.post_dataset_rows.call_count == 1
+
+    def test_rejects_rows_after_close(self):
+        stream = _table().stream_to(push_datasets=MagicMock(), dataset_id="ds-1")
+        stream.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            stream.append({"id": 1})
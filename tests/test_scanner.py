@@ -0,0 +1,192 @@
+"""Tests for the TenantScanner in powerbi/scanner.py."""
+
+import json
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from powerbi.exceptions import PowerBiError
+from powerbi.scanner import SQLiteScanStore, TenantScanner, _format_watermark, chunk_ids
+
+
+def _admin(workspace_ids, statuses=None):
+    """Return a mocked Admin service whose scans succeed after `statuses`."""
+    admin = MagicMock()
+    admin.get_modified_workspaces.return_value = [{"id": i} for i in workspace_ids]
+    scans = {}
+
+    def post_workspace_info(workspaces, **kwargs):
+        scan_id = f"scan-{len(scans)}"
+        scans[scan_id] = {"workspaces": workspaces, "statuses": list(statuses or [])}
+        return {"id": scan_id, "status": "NotStarted"}
+
+    def get_scan_status(scan_id):
+        pending = scans.get(scan_id, {}).get("statuses")
+        return {"id": scan_id, "status": pending.pop(0) if pending else "Succeeded"}
+
+    def get_scan_result(scan_id):
+        return {
+            "workspaces": [{"id": i} for i in scans[scan_id]["workspaces"]],
+            "datasourceInstances": [],
+        }
+
+    admin.post_workspace_info.side_effect = post_workspace_info
+    admin.get_scan_status.side_effect = get_scan_status
+    admin.get_scan_result.side_effect = get_scan_result
+    return admin
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("powerbi.scanner.time.sleep"):
+        yield
+
+
+class TestChunkIds:
+    def test_chunks(self):
+        assert chunk_ids(range(5), 2) == [[0, 1], [2, 3], [4]]
+
+
+class TestTenantScanner:
+    def test_scans_every_workspace_in_batches(self):
+        ids = [f"ws-{i}" for i in range(250)]
+        admin = _admin(ids, statuses=["Running"])
+        scanner = TenantScanner(admin=admin, dataset_schema=True)
+
+        records = list(scanner.scan())
+
+        assert sorted(record["id"] for record in records) == sorted(ids)
+        assert admin.post_workspace_info.call_count == 3
+        assert admin.post_workspace_info.call_args.kwargs["dataset_schema"] is True
+
+    def test_limits_scans_in_flight(self):
+        ids = [f"ws-{i}" for i in range(10)]
+        admin = _admin(ids, statuses=["Running", "Running"])
+        scanner = TenantScanner(admin=admin, batch_size=1, max_concurrent_scans=3)
+
+        in_flight = []
+        original = admin.get_scan_result.side_effect
+
+        def get_scan_result(scan_id):
+            in_flight.append(admin.post_workspace_info.call_count)
+            return original(scan_id)
+
+        admin.get_scan_result.side_effect = get_scan_result
+        list(scanner.scan(workspace_ids=ids))
+
+        # Only three scans may be submitted before the first result arrives.
+        assert in_flight[0] == 3
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        checkpoint = tmp_path / "scan.json"
+        checkpoint.write_text(
+            json.dumps({"pending": [["ws-2"]], "in_flight": {"old-scan": ["ws-1"]}, "completed": 4})
+        )
+        admin = _admin([])
+        admin.get_scan_result.side_effect = lambda scan_id: {
+            "workspaces": [{"id": "ws-1"}] if scan_id == "old-scan" else [{"id": "ws-2"}]
+        }
+
+        scanner = TenantScanner(admin=admin, checkpoint_path=str(checkpoint))
+        records = list(scanner.scan())
+
+        assert sorted(record["id"] for record in records) == ["ws-1", "ws-2"]
+        admin.get_modified_workspaces.assert_not_called()
+        assert not checkpoint.exists()
+
+    def test_failed_scans_are_kept_for_retry(self, tmp_path):
+        checkpoint = tmp_path / "scan.json"
+        admin = _admin(["ws-1"], statuses=["Failed"])
+        scanner = TenantScanner(admin=admin, checkpoint_path=str(checkpoint))
+
+        with pytest.raises(PowerBiError):
+            list(scanner.scan())
+
+        assert scanner.failed_scans[0]["workspaces"] == ["ws-1"]
+        assert json.loads(checkpoint.read_text())["pending"] == [["ws-1"]]
+
+    def test_reused_scanner_forgets_earlier_failures(self, tmp_path):
+        checkpoint = tmp_path / "scan.json"
+        admin = _admin(["ws-1"], statuses=["Failed"])
+        scanner = TenantScanner(admin=admin, checkpoint_path=str(checkpoint))
+        with pytest.raises(PowerBiError):
+            list(scanner.scan())
+
+        admin.get_scan_status.side_effect = lambda scan_id: {"status": "Succeeded"}
+        records = list(scanner.scan())
+
+        assert [record["id"] for record in records] == ["ws-1"]
+        assert scanner.failed_scans == []
+        assert not checkpoint.exists()
+
+
+class TestIncrementalScan:
+    def test_first_run_scans_everything_and_sets_watermark(self, tmp_path):
+        store = SQLiteScanStore(str(tmp_path / "snapshot.db"))
+        admin = _admin(["ws-1", "ws-2"])
+        scanner = TenantScanner(admin=admin)
+
+        records = list(scanner.scan_incremental(store=store))
+
+        assert len(records) == 2
+        assert len(store) == 2
+        assert store.get_watermark().endswith("Z")
+        assert admin.get_modified_workspaces.call_args.kwargs["modified_since"] is None
+
+    def test_later_runs_merge_modified_workspaces(self, tmp_path):
+        store = SQLiteScanStore(str(tmp_path / "snapshot.db"))
+        store.upsert([{"id": "ws-1", "name": "old"}, {"id": "ws-2"}], scanned_at="x")
+        watermark = _format_watermark(datetime.now(timezone.utc) - timedelta(days=1))
+        store.set_watermark(watermark)
+
+        admin = _admin(["ws-1"])
+        admin.get_scan_result.side_effect = lambda scan_id: {
+            "workspaces": [{"id": "ws-1", "name": "new"}]
+        }
+        list(TenantScanner(admin=admin).scan_incremental(store=store))
+
+        assert admin.get_modified_workspaces.call_args.kwargs["modified_since"] == watermark
+        assert store.get("ws-1")["name"] == "new"
+        assert [record["id"] for record in store.snapshot()] == ["ws-1", "ws-2"]
+        assert store.get_watermark() > watermark
+
+    def test_stale_watermark_falls_back_to_full_scan(self, tmp_path):
+        store = SQLiteScanStore(str(tmp_path / "snapshot.db"))
+        store.set_watermark("2020-01-01T00:00:00.0000000Z")
+        admin = _admin(["ws-1"])
+
+        list(TenantScanner(admin=admin).scan_incremental(store=store))
+
+        assert admin.get_modified_workspaces.call_args.kwargs["modified_since"] is None
+
+    def test_failed_run_keeps_watermark(self, tmp_path):
+        store = SQLiteScanStore(str(tmp_path / "snapshot.db"))
+        admin = _admin(["ws-1"], statuses=["Failed"])
+
+        with pytest.raises(PowerBiError):
+            list(TenantScanner(admin=admin).scan_incremental(store=store))
+
+        assert store.get_watermark() is None
+
+    def test_resumed_run_scans_workspaces_modified_since_the_failure(self, tmp_path):
+        store = SQLiteScanStore(str(tmp_path / "snapshot.db"))
+        checkpoint = str(tmp_path / "scan.json")
+        admin = _admin(["ws-a", "ws-b"])
+        admin.get_scan_status.side_effect = lambda scan_id: {
+            "status": "Failed" if scan_id == "scan-1" else "Succeeded"
+        }
+        scanner = TenantScanner(admin=admin, batch_size=1, checkpoint_path=checkpoint)
+
+        with pytest.raises(PowerBiError):
+            list(scanner.scan_incremental(store=store))
+        assert store.get_watermark() is None
+
+        admin = _admin(["ws-b", "ws-c"])
+        scanner = TenantScanner(admin=admin, batch_size=1, checkpoint_path=checkpoint)
+        records = list(scanner.scan_incremental(store=store))
+
+        assert sorted(record["id"] for record in records) == ["ws-b", "ws-c"]
+        assert [record["id"] for record in store.snapshot()] == ["ws-a", "ws-b", "ws-c"]
+        assert store.get_watermark() is not None
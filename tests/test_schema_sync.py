@@ -0,0 +1,160 @@
+"""Tests for the SchemaSync in powerbi/schema_sync.py."""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from powerbi.exceptions import PowerBiError
+from powerbi.schema_sync import SchemaSync
+from powerbi.utils import Column, Dataset, Measure, Table, Tables
+
+
+def _table(name, columns, measures=()):
+    table = Table(name=name)
+    for column_name, data_type in columns:
+        table.add_column(Column(name=column_name, data_type=data_type))
+    for measure_name, expression in measures:
+        table.add_measure(Measure(name=measure_name, expression=expression))
+    return table
+
+
+def _dataset(*tables):
+    collection = Tables()
+    for table in tables:
+        collection.add(table)
+    return Dataset(name="Sales", tables=collection)
+
+
+def _sync(remote_tables):
+    push_datasets = MagicMock()
+    push_datasets.get_tables.return_value = {"value": remote_tables}
+    return SchemaSync(push_datasets=push_datasets)
+
+
+REMOTE = [
+    {
+        "name": "orders",
+        "columns": [
+            {"name": "id", "dataType": "Int64"},
+            {"name": "paid", "dataType": "Boolean"},
+        ],
+        "measures": [{"name": "total", "expression": "COUNTROWS(orders)"}],
+    },
+    {"name": "legacy", "columns": [{"name": "id", "dataType": "Int64"}]},
+]
+
+
+class TestPlan:
+    def test_unchanged_tables_are_not_sent(self):
+        sync = _sync(REMOTE)
+        model = _dataset(
+            _table(
+                "orders",
+                [("id", "Int64"), ("paid", "bool")],
+                [("total", "COUNTROWS(orders)")],
+            )
+        )
+
+        plan = sync.plan(dataset_id="ds-1", model=model)
+
+        assert not plan.has_changes
+        assert [(change.table, change.action) for change in plan.changes] == [
+            ("orders", "unchanged"),
+            ("legacy", "orphan"),
+        ]
+
+    def test_reports_column_and_measure_changes(self):
+        sync = _sync(REMOTE)
+        model = _dataset(
+            _table(
+                "orders",
+                [("id", "string"), ("amount", "Double")],
+                [("total", "SUM(orders[amount])")],
+            ),
+            _table("customers", [("id", "Int64")]),
+        )
+
+        plan = sync.plan(dataset_id="ds-1", model=model)
+        orders, customers = plan.puts
+
+        assert orders.columns_added == ["amount"]
+        assert orders.columns_removed == ["paid"]
+        assert orders.columns_changed == {"id": {"dataType": ["int64", "string"]}}
+        assert orders.measures_changed == {
+            "total": {"expression": ["COUNTROWS(orders)", "SUM(orders[amount])"]}
+        }
+        assert orders.destructive
+        assert customers.action == "add"
+
+    def test_plan_is_machine_readable(self):
+        sync = _sync(REMOTE)
+        plan = sync.plan(dataset_id="ds-1", model=_table("orders", [("id", "Int64")]))
+
+        document = json.loads(plan.to_json())
+        assert document["dataset_id"] == "ds-1"
+        assert document["changes"][0]["columns_removed"] == ["paid"]
+        assert document["changes"][0]["destructive"] is True
+
+    def test_tables_without_a_remote_schema_are_updated(self, caplog):
+        sync = _sync([{"name": "orders"}])
+        plan = sync.plan(dataset_id="ds-1", model=_table("orders", [("id", "Int64")]))
+        assert plan.puts[0].reason
+        assert "sent without a diff" in caplog.text
+
+    def test_names_only_tables_are_diffed_against_the_snapshot(self, tmp_path):
+        sync = _sync([{"name": "orders"}])
+        sync.snapshot_path = str(tmp_path / "schema.json")
+        orders = _table("orders", [("id", "Int64")])
+
+        sync.sync(dataset_id="ds-1", model=orders)
+        second = sync.sync(dataset_id="ds-1", model=orders)
+        changed = _table("orders", [("id", "Int64"), ("note", "string")])
+        third = sync.sync(dataset_id="ds-1", model=changed)
+
+        assert sync.push_datasets.put_dataset.call_count == 2
+        assert second.changes[0].action == "unchanged"
+        assert third.puts[0].columns_added == ["note"]
+        assert list(json.loads((tmp_path / "schema.json").read_text())) == ["me/ds-1"]
+
+
+class TestApply:
+    def test_sends_only_changed_tables(self):
+        sync = _sync(REMOTE)
+        orders = _table("orders", [("id", "Int64"), ("paid", "bool"), ("note", "string")])
+        unchanged = _table("legacy", [("id", "Int64")])
+        model = _dataset(orders, unchanged)
+
+        plan = sync.sync(dataset_id="ds-1", model=model, group_id="g-1")
+
+        sync.push_datasets.put_dataset.assert_called_once_with(
+            dataset_id="ds-1", table_name="orders", table=orders, group_id="g-1"
+        )
+        assert plan.puts[0].status == "applied"
+
+    def test_skips_destructive_changes_when_asked(self):
+        sync = _sync(REMOTE)
+        model = _table("orders", [("id", "Int64")])
+
+        plan = sync.sync(dataset_id="ds-1", model=model, allow_destructive=False)
+
+        sync.push_datasets.put_dataset.assert_not_called()
+        assert plan.puts[0].status == "skipped"
+
+    def test_dry_run_sends_nothing(self):
+        sync = _sync([])
+        sync.sync(dataset_id="ds-1", model=_table("orders", [("id", "Int64")]), dry_run=True)
+        sync.push_datasets.put_dataset.assert_not_called()
+
+    def test_failures_are_recorded_then_raised(self):
+        sync = _sync([])
+        sync.push_datasets.put_dataset.side_effect = [RuntimeError("boom"), {}]
+        model = [_table("a", [("id", "Int64")]), _table("b", [("id", "Int64")])]
+        sync.max_workers = 1
+
+        plan = sync.plan(dataset_id="ds-1", model=model)
+        with pytest.raises(PowerBiError, match="1 table"):
+            sync.apply(plan=plan, model=model)
+
+        assert [change.status for change in plan.puts] == ["failed", "applied"]
+        assert plan.puts[0].error == "boom"
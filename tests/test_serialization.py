@@ -0,0 +1,142 @@
+"""Tests for the JSON serializers in powerbi/serialization.py."""
+
+import datetime
+import json
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from powerbi import serialization
+from powerbi.serialization import (
+    OrjsonSerializer,
+    StdlibSerializer,
+    get_serializer,
+    make_serializer,
+    set_serializer,
+)
+from powerbi.utils import Column, Table
+
+SERIALIZERS = ["json", "orjson", "ujson"]
+
+
+@pytest.fixture(params=SERIALIZERS)
+def serializer(request):
+    pytest.importorskip(request.param)
+    return make_serializer(request.param)
+
+
+@pytest.fixture
+def restore_default():
+    previous = serialization._serializer
+    yield
+    serialization._serializer = previous
+
+
+class TestSerializers:
+    def test_round_trips(self, serializer):
+        value = {"name": "Sälës", "values": [1, 2.5, None, True], "path": "a/b"}
+        encoded = serializer.dumps(value)
+
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == value
+        assert serializer.loads(encoded) == value
+        assert serializer.loads(encoded.decode("utf-8")) == value
+
+    def test_calls_default(self, serializer):
+        encoded = serializer.dumps(
+            {"day": datetime.date(2024, 1, 2)}, default=lambda value: value.isoformat()
+        )
+        assert json.loads(encoded) == {"day": "2024-01-02"}
+
+    def test_skips_a_byte_order_mark(self, serializer):
+        assert serializer.loads(b'\xef\xbb\xbf{"value":[]}') == {"value": []}
+        assert serializer.loads('\ufeff{"value":[]}') == {"value": []}
+
+    def test_invalid_json_raises_value_error(self, serializer):
+        with pytest.raises(ValueError):
+            serializer.loads(b"{not json")
+
+
+class TestDefaultSerializer:
+    def test_prefers_orjson(self, restore_default):
+        pytest.importorskip("orjson")
+        set_serializer(None)
+        assert isinstance(get_serializer(), OrjsonSerializer)
+
+    def test_set_by_name(self, restore_default):
+        set_serializer("json")
+        assert isinstance(get_serializer(), StdlibSerializer)
+
+    def test_rejects_unknown_names(self):
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            make_serializer("yaml")
+
+
+class TestSession:
+    def test_encodes_bodies_and_decodes_responses(self, mock_session):
+        serializer = MagicMock(wraps=StdlibSerializer())
+        mock_session.serializer = serializer
+
+        response = MagicMock(spec=requests.Response)
+        response.ok = True
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        response.content = b'{"id":"ds-1"}'
+        mock_session._session.send.return_value = response
+
+        result = mock_session.make_request(
+            method="post", endpoint="myorg/datasets", json_payload={"name": "Sales"}
+        )
+
+        prepared = mock_session._session.send.call_args.kwargs["request"]
+        assert prepared.body == b'{"name":"Sales"}'
+        assert prepared.headers["Content-Type"] == "application/json"
+        assert result == {"id": "ds-1"}
+        serializer.loads.assert_called_once_with(b'{"id":"ds-1"}')
+
+    def test_decodes_responses_with_a_byte_order_mark(self, mock_session, serializer):
+        mock_session.serializer = serializer
+
+        response = MagicMock(spec=requests.Response)
+        response.ok = True
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json; charset=utf-8"}
+        response.content = b'\xef\xbb\xbf{"value":[{"id":"ds-1"}]}'
+        mock_session._session.send.return_value = response
+
+        result = mock_session.make_request(method="get", endpoint="myorg/datasets")
+
+        assert result == {"value": [{"id": "ds-1"}]}
+
+
+class TestModels:
+    def test_table_to_dict_uses_serializer(self, serializer, restore_default):
+        set_serializer(serializer)
+        table = Table(name="sales")
+        table.add_column(Column(name="id", data_type="Int64"))
+
+        columns = table.to_dict()["columns"]
+        assert [(column["name"], column["dataType"]) for column in columns] == [("id", "Int64")]
+        assert json.loads(table.to_json())["name"] == "sales"
+
+    def test_dataset_payload_is_serialized_once(self, mock_session):
+        from powerbi.utils import Dataset, Tables
+
+        response = MagicMock(spec=requests.Response)
+        response.ok = True
+        response.status_code = 201
+        response.headers = {"Content-Type": "application/json"}
+        response.content = b'{"id":"ds-1"}'
+        mock_session._session.send.return_value = response
+
+        tables = Tables()
+        tables[0] = Table(name="sales")
+        dataset = Dataset(name="Sales", tables=tables)
+
+        mock_session.make_request(
+            method="post", endpoint="myorg/datasets", json_payload=dataset.prep_for_post()
+        )
+
+        prepared = mock_session._session.send.call_args.kwargs["request"]
+        assert json.loads(prepared.body)["tables"][0]["name"] == "sales"
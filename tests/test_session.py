@@ -6,6 +6,9 @@ import pytest
 import requests
 from unittest.mock import MagicMock
 
+import socket
+
+from powerbi.adapters import PowerBiHTTPAdapter, keepalive_socket_options
 from powerbi.session import PowerBiSession
 
 
@@ -68,7 +71,7 @@ class TestMakeRequestSuccess:
         response = MagicMock(spec=requests.Response)
         response.ok = True
         response.status_code = status_code
-        response.content = content
+        response.content = json.dumps(json_body).encode() if json_body is not None else content
         response.headers = {"Content-Type": content_type}
         response.json.return_value = json_body
         return response
@@ -89,6 +92,30 @@ class TestMakeRequestSuccess:
         result = mock_session.make_request(method="delete", endpoint="myorg/datasets/x")
         assert result["message"] == "response successful"
         assert result["status_code"] == 200
+        assert "request_id" not in result
+
+    def test_empty_response_keeps_request_id(self, mock_session):
+        response = self._mock_response(content=b"", status_code=202)
+        response.headers = {
+            "RequestId": "87f31ef7-1e3a-4006-9b0b-191693e79e9e",
+            "Location": "https://api.powerbi.com/v1.0/myorg/datasets/x/refreshes/87f31ef7",
+        }
+        mock_session._session.send.return_value = response
+
+        result = mock_session.make_request(method="post", endpoint="myorg/datasets/x/refreshes")
+        assert result["status_code"] == 202
+        assert result["request_id"] == "87f31ef7-1e3a-4006-9b0b-191693e79e9e"
+        assert result["location"].endswith("/refreshes/87f31ef7")
+
+    def test_stream_returns_the_unread_response(self, mock_session):
+        response = self._mock_response(content=b'{"results":[]}')
+        mock_session._session.send.return_value = response
+
+        result = mock_session.make_request(
+            method="post", endpoint="myorg/datasets/x/executeQueries", stream=True
+        )
+        assert result is response
+        assert mock_session._session.send.call_args.kwargs["stream"] is True
 
     def test_zip_response_returns_bytes(self, mock_session):
         zip_bytes = b"PK\x03\x04fakecontent"
@@ -193,6 +220,39 @@ class TestMakeRequestErrors:
         assert response.request.headers["Authorization"] == "Bearer real-secret-token"
 
 
+class TestConnectionPool:
+    """Tests for the connection pool configuration and statistics."""
+
+    def test_mounts_adapter_with_pool_sizes(self, mock_auth):
+        session = PowerBiSession(
+            client=mock_auth, pool_connections=4, pool_maxsize=64, pool_block=True
+        )
+        adapter = session._session.get_adapter("https://api.powerbi.com/")
+        assert isinstance(adapter, PowerBiHTTPAdapter)
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+
+    def test_tcp_keepalive_sets_socket_options(self, mock_auth):
+        session = PowerBiSession(client=mock_auth, tcp_keepalive=True)
+        assert session._adapter.socket_options == keepalive_socket_options()
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in session._adapter.socket_options
+        pool = session._adapter.poolmanager.connection_from_url("https://api.powerbi.com/")
+        assert pool.conn_kw["socket_options"] == session._adapter.socket_options
+
+    def test_pool_stats_counts_connections(self, mock_auth):
+        session = PowerBiSession(client=mock_auth, pool_maxsize=2)
+        pool = session._adapter.poolmanager.connection_from_url("https://api.powerbi.com/")
+        pool.num_connections = 2
+        pool.num_requests = 10
+
+        stats = session.pool_stats()
+        assert stats["pools"] == 1
+        assert stats["connections_created"] == 2
+        assert stats["connections_reused"] == 8
+        assert stats["in_flight"] == 0
+        assert stats["waiting"] == 0
+
+
 class TestClose:
     """Tests for PowerBiSession.close()."""
 
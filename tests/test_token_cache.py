@@ -0,0 +1,130 @@
+"""Tests for ServicePrincipalAuth and the token cache backends."""
+
+import os
+import stat
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from powerbi.auth import ServicePrincipalAuth
+from powerbi.client import PowerBiClient
+from powerbi.token_cache import FileTokenCacheBackend, MemoryTokenCacheBackend
+
+
+def _token(source="identity_provider"):
+    return {
+        "access_token": "app-token",
+        "token_type": "Bearer",
+        "expires_in": 3599,
+        "token_source": source,
+    }
+
+
+@pytest.fixture
+def msal_app():
+    with patch("powerbi.auth.msal.ConfidentialClientApplication") as mock_app:
+        yield mock_app
+
+
+class TestFileTokenCacheBackend:
+    def test_round_trips_data(self, tmp_path):
+        backend = FileTokenCacheBackend(str(tmp_path / "cache.bin"))
+        assert backend.load() is None
+
+        with backend.lock():
+            backend.save('{"AccessToken": {}}')
+
+        assert backend.load() == '{"AccessToken": {}}'
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+    def test_file_is_only_readable_by_its_owner(self, tmp_path):
+        path = tmp_path / "cache.bin"
+        (tmp_path / "cache.bin.tmp").write_text("stale")
+        os.chmod(tmp_path / "cache.bin.tmp", 0o644)
+        backend = FileTokenCacheBackend(str(path))
+
+        backend.save('{"RefreshToken": {}}')
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert backend.load() == '{"RefreshToken": {}}'
+
+    def test_lock_is_exclusive_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.bin")
+        holder = FileTokenCacheBackend(path)
+        waiter = FileTokenCacheBackend(path, timeout=0.1)
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with holder.lock():
+                acquired.set()
+                release.wait(timeout=2)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait(timeout=2)
+
+        with pytest.raises(TimeoutError):
+            with waiter.lock():
+                pass
+
+        release.set()
+        thread.join()
+
+
+class TestServicePrincipalAuth:
+    def test_requires_one_credential(self, msal_app):
+        with pytest.raises(ValueError):
+            ServicePrincipalAuth(client_id="id", tenant_id="tenant")
+
+    def test_login_uses_client_credentials(self, msal_app):
+        msal_app.return_value.acquire_token_for_client.return_value = _token()
+
+        auth = ServicePrincipalAuth(client_id="id", tenant_id="tenant", client_secret="secret")
+        auth.login()
+
+        assert auth.authorization_header() == "Bearer app-token"
+        assert msal_app.call_args.kwargs["authority"].endswith("/tenant")
+        assert msal_app.call_args.kwargs["token_cache"] is auth.token_cache
+
+    def test_certificate_credential_is_passed_to_msal(self, msal_app):
+        certificate = {"private_key": "pem", "thumbprint": "abc"}
+        ServicePrincipalAuth(client_id="id", tenant_id="tenant", client_certificate=certificate)
+
+        assert msal_app.call_args.kwargs["client_credential"] == certificate
+
+    def test_shares_cache_through_backend(self, msal_app):
+        backend = MemoryTokenCacheBackend()
+        backend.save('{"AccessToken": {}}')
+        msal_app.return_value.acquire_token_for_client.return_value = _token(source="cache")
+
+        auth = ServicePrincipalAuth(
+            client_id="id", tenant_id="tenant", client_secret="secret", token_cache=backend
+        )
+        auth.token_cache = MagicMock(has_state_changed=True, serialize=lambda: "updated")
+        auth.login()
+
+        auth.token_cache.deserialize.assert_called_once_with('{"AccessToken": {}}')
+        assert backend.load() == "updated"
+
+    def test_failed_request_raises(self, msal_app):
+        msal_app.return_value.acquire_token_for_client.return_value = {
+            "error": "invalid_client"
+        }
+
+        auth = ServicePrincipalAuth(client_id="id", tenant_id="tenant", client_secret="bad")
+        with pytest.raises(PermissionError):
+            auth.login()
+
+
+class TestFromServicePrincipal:
+    def test_builds_logged_in_client(self, msal_app):
+        msal_app.return_value.acquire_token_for_client.return_value = _token()
+
+        client = PowerBiClient.from_service_principal(
+            client_id="id", tenant_id="tenant", client_secret="secret"
+        )
+
+        assert isinstance(client.power_bi_auth_client, ServicePrincipalAuth)
+        assert client.power_bi_session.build_headers()["Authorization"] == "Bearer app-token"
@@ -20,6 +20,7 @@ from powerbi.utils import (
     Dataset,
     DataSource,
     CredentialDetails,
+    to_plain_object,
 )
 
 
@@ -208,6 +209,56 @@ class TestColumns:
         names = [c.name for c in cols]
         assert names == ["A", "B"]
 
+    def test_get_by_name(self):
+        cols = Columns()
+        col = Column("A", "String")
+        cols[0] = col
+        assert cols.get_by_name("A") is col
+        assert cols.get_by_name("B") is None
+        assert "A" in cols
+        assert col in cols
+        assert Column("A", "String") not in cols
+
+    def test_rejects_duplicate_names(self):
+        cols = Columns()
+        cols[0] = Column("A", "String")
+        with pytest.raises(ValueError, match="column named 'A' already exists"):
+            cols[1] = Column("A", "Int64")
+        assert len(cols) == 1
+
+    def test_delete_updates_index(self):
+        cols = Columns()
+        cols[0] = Column("A", "String")
+        cols[1] = Column("B", "String")
+        del cols[0]
+        assert "A" not in cols
+        assert cols.names() == ["B"]
+        cols[1] = Column("A", "Int64")
+        assert cols.names() == ["B", "A"]
+
+    def test_rename_updates_index(self):
+        cols = Columns()
+        col = Column("A", "String")
+        cols[0] = col
+        cols[1] = Column("B", "String")
+
+        col.name = "C"
+        assert cols.get_by_name("C") is col
+        assert "A" not in cols
+
+        with pytest.raises(ValueError, match="already exists"):
+            col.name = "B"
+        assert col.name == "C"
+
+    def test_deleted_item_can_be_renamed_freely(self):
+        cols = Columns()
+        col = Column("A", "String")
+        cols[0] = col
+        cols[1] = Column("B", "String")
+        del cols[0]
+        col.name = "B"
+        assert cols.get_by_name("B") is not col
+
 
 class TestMeasures:
     def test_append_and_len(self):
@@ -222,6 +273,13 @@ class TestMeasures:
         names = [m.name for m in ms]
         assert names == ["M1", "M2"]
 
+    def test_rename_updates_index(self):
+        ms = Measures()
+        m = Measure("M1", "1")
+        ms[0] = m
+        m.name = "M2"
+        assert ms.get_by_name("M2") is m
+
 
 class TestRelationships:
     def test_append_and_len(self):
@@ -235,6 +293,12 @@ class TestRelationships:
         del rs[0]
         assert len(rs) == 0
 
+    def test_get_by_name(self):
+        rs = Relationships()
+        r = Relationship("R1", "A", "B", "C", "D")
+        rs[0] = r
+        assert rs.get_by_name("R1") is r
+
 
 class TestTables:
     def test_append_and_len(self):
@@ -242,6 +306,14 @@ class TestTables:
         ts[0] = Table("T1")
         assert len(ts) == 1
 
+    def test_rename_updates_index(self):
+        ts = Tables()
+        t = Table("T1")
+        ts[0] = t
+        t.name = "T2"
+        assert ts.get_by_name("T2") is t
+        assert "T1" not in ts
+
 
 class TestDataSources:
     def test_append_and_len(self):
@@ -314,6 +386,28 @@ class TestTable:
         assert d["name"] == "T"
         assert len(d["columns"]) == 1
 
+    def test_to_dict_matches_json_round_trip(self):
+        t = Table("T")
+        t.add_column(Column("C1", "String"))
+        t.add_measure(Measure("M1", "SUM(T[C1])"))
+        t.add_row([{"C1": "a"}, {"C1": "b"}])
+
+        assert t.to_dict() == json.loads(json.dumps(t.table, cls=PowerBiEncoder))
+
+    def test_to_dict_copies_rows(self):
+        t = Table("T")
+        t.add_row({"a": 1})
+        d = t.to_dict()
+        d["rows"][0]["a"] = 2
+        assert t.get_row(0) == {"a": 1}
+
+    def test_schema_omits_rows_without_copying(self):
+        t = Table("T")
+        t.add_row({"a": 1})
+        schema = t.schema()
+        assert "rows" not in schema
+        assert schema["columns"] is t.columns
+
     def test_to_json(self):
         t = Table("T")
         parsed = json.loads(t.to_json())
@@ -400,6 +494,23 @@ class TestDataset:
         for tbl in prepped["tables"]:
             assert "rows" not in tbl
 
+    def test_prep_for_post_leaves_tables_intact(self):
+        tables = Tables()
+        tables[0] = self._make_table()
+        ds = Dataset("DS", tables)
+
+        ds.prep_for_post()
+        assert "rows" in ds.get_table(0).table
+
+    def test_to_dict_matches_json_round_trip(self):
+        tables = Tables()
+        tables[0] = self._make_table()
+        ds = Dataset("DS", tables)
+        ds.add_relationship(Relationship("R", "A", "B", "C", "D"))
+        ds.add_data_source(DataSource("Sql"))
+
+        assert ds.to_dict() == json.loads(json.dumps(ds.push_dataset, cls=PowerBiEncoder))
+
     def test_to_dict(self):
         ds = Dataset("DS", Tables())
         d = ds.to_dict()
@@ -541,3 +652,21 @@ class TestPowerBiEncoder:
         dss[0] = DataSource("Sql")
         result = json.loads(json.dumps(dss, cls=PowerBiEncoder))
         assert len(result) == 1
+
+
+# ---------------------------------------------------------------------------
+# to_plain_object
+# ---------------------------------------------------------------------------
+
+class TestToPlainObject:
+    def test_unwraps_models_and_enums(self):
+        columns = Columns()
+        columns[0] = Column("C1", "String")
+        result = to_plain_object({"columns": columns, "kind": _FakeEnum.FOO, "pair": (1, 2)})
+        assert result["columns"][0]["name"] == "C1"
+        assert result["kind"] == "foo_val"
+        assert result["pair"] == [1, 2]
+
+    def test_leaves_scalars_alone(self):
+        assert to_plain_object("x") == "x"
+        assert to_plain_object(None) is None